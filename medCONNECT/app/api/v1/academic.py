@@ -2,7 +2,7 @@
 Academic module API routes
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from uuid import UUID
 from app.models.academic import (
     SubjectCreate, SubjectResponse, SubjectUpdate,
@@ -22,6 +22,7 @@ from app.core.dependencies import (
 )
 from app.models.user import UserRole
 from app.core.exceptions import NotFoundError
+from app.core.pagination import PageParams, page_params, set_next_cursor
 
 router = APIRouter(prefix="/academic", tags=["Academic"])
 
@@ -35,7 +36,7 @@ async def create_subject(
 ):
     """Create a subject"""
     subject_data.college_id = college_id
-    subject = AcademicRepository.create_subject(subject_data)
+    subject = await AcademicRepository.create_subject(subject_data)
     return SubjectResponse(**subject)
 
 
@@ -45,14 +46,14 @@ async def get_subjects(
     college_id: UUID = Depends(get_current_user_college_id)
 ):
     """Get subjects for the college"""
-    subjects = AcademicRepository.get_subjects_by_college(college_id, year)
+    subjects = await AcademicRepository.get_subjects_by_college(college_id, year)
     return [SubjectResponse(**s) for s in subjects]
 
 
 @router.get("/subjects/{subject_id}", response_model=SubjectResponse)
 async def get_subject(subject_id: UUID):
     """Get subject by ID"""
-    subject = AcademicRepository.get_subject(subject_id)
+    subject = await AcademicRepository.get_subject(subject_id)
     if not subject:
         raise NotFoundError("Subject not found")
     return SubjectResponse(**subject)
@@ -66,7 +67,7 @@ async def update_subject(
 ):
     """Update subject"""
     try:
-        updated = AcademicRepository.update_subject(subject_id, subject_data)
+        updated = await AcademicRepository.update_subject(subject_id, subject_data)
         return SubjectResponse(**updated)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -81,21 +82,21 @@ async def create_module(
 ):
     """Create a curriculum module"""
     module_data.college_id = college_id
-    module = AcademicRepository.create_module(module_data)
+    module = await AcademicRepository.create_module(module_data)
     return CurriculumModuleResponse(**module)
 
 
 @router.get("/modules/subject/{subject_id}", response_model=List[CurriculumModuleResponse])
 async def get_modules_by_subject(subject_id: UUID):
     """Get modules for a subject"""
-    modules = AcademicRepository.get_modules_by_subject(subject_id)
+    modules = await AcademicRepository.get_modules_by_subject(subject_id)
     return [CurriculumModuleResponse(**m) for m in modules]
 
 
 @router.get("/modules/{module_id}", response_model=CurriculumModuleResponse)
 async def get_module(module_id: UUID):
     """Get module by ID"""
-    module = AcademicRepository.get_module(module_id)
+    module = await AcademicRepository.get_module(module_id)
     if not module:
         raise NotFoundError("Module not found")
     return CurriculumModuleResponse(**module)
@@ -109,7 +110,7 @@ async def update_module(
 ):
     """Update module"""
     try:
-        updated = AcademicRepository.update_module(module_id, module_data)
+        updated = await AcademicRepository.update_module(module_id, module_data)
         return CurriculumModuleResponse(**updated)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -124,21 +125,21 @@ async def create_resource(
 ):
     """Create a learning resource"""
     resource_data.college_id = college_id
-    resource = AcademicRepository.create_resource(resource_data)
+    resource = await AcademicRepository.create_resource(resource_data)
     return LearningResourceResponse(**resource)
 
 
 @router.get("/resources/module/{module_id}", response_model=List[LearningResourceResponse])
 async def get_resources_by_module(module_id: UUID):
     """Get resources for a module"""
-    resources = AcademicRepository.get_resources_by_module(module_id)
+    resources = await AcademicRepository.get_resources_by_module(module_id)
     return [LearningResourceResponse(**r) for r in resources]
 
 
 @router.get("/resources/{resource_id}", response_model=LearningResourceResponse)
 async def get_resource(resource_id: UUID):
     """Get resource by ID"""
-    resource = AcademicRepository.get_resource(resource_id)
+    resource = await AcademicRepository.get_resource(resource_id)
     if not resource:
         raise NotFoundError("Resource not found")
     return LearningResourceResponse(**resource)
@@ -152,7 +153,7 @@ async def update_resource(
 ):
     """Update resource"""
     try:
-        updated = AcademicRepository.update_resource(resource_id, resource_data)
+        updated = await AcademicRepository.update_resource(resource_id, resource_data)
         return LearningResourceResponse(**updated)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -170,24 +171,29 @@ async def create_progress(
     progress_data.college_id = college_id
     
     # Check if progress exists
-    existing = AcademicRepository.get_progress(user_id, progress_data.module_id)
+    existing = await AcademicRepository.get_progress(user_id, progress_data.module_id)
     if existing:
         # Update existing
-        updated = AcademicRepository.update_progress(
+        updated = await AcademicRepository.update_progress(
             UUID(existing["id"]),
             StudentModuleProgressUpdate(**progress_data.model_dump())
         )
         return StudentModuleProgressResponse(**updated)
     else:
         # Create new
-        progress = AcademicRepository.create_progress(progress_data)
+        progress = await AcademicRepository.create_progress(progress_data)
         return StudentModuleProgressResponse(**progress)
 
 
 @router.get("/progress/me", response_model=List[StudentModuleProgressResponse])
-async def get_my_progress(user_id: UUID = Depends(get_current_user_id)):
+async def get_my_progress(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    user_id: UUID = Depends(get_current_user_id)
+):
     """Get current student's progress"""
-    progress_list = AcademicRepository.get_student_progress(user_id)
+    progress_list, next_cursor = await AcademicRepository.get_student_progress(user_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [StudentModuleProgressResponse(**p) for p in progress_list]
 
 
@@ -197,7 +203,7 @@ async def get_progress(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Get progress for a specific module"""
-    progress = AcademicRepository.get_progress(user_id, module_id)
+    progress = await AcademicRepository.get_progress(user_id, module_id)
     if not progress:
         raise NotFoundError("Progress not found")
     return StudentModuleProgressResponse(**progress)
@@ -212,23 +218,26 @@ async def create_allocation(
 ):
     """Create topic allocation"""
     allocation_data.college_id = college_id
-    allocation = AcademicRepository.create_topic_allocation(allocation_data)
+    allocation = await AcademicRepository.create_topic_allocation(allocation_data)
     return TopicAllocationResponse(**allocation)
 
 
 @router.get("/allocations", response_model=List[TopicAllocationResponse])
 async def get_allocations(
+    response: Response,
     student_id: UUID = None,
     topic_id: UUID = None,
+    page: PageParams = Depends(page_params),
     college_id: UUID = Depends(get_current_user_college_id)
 ):
     """Get topic allocations - optionally filtered by student or topic"""
     if student_id:
-        allocations = AcademicRepository.get_allocations_by_student(student_id)
+        allocations, next_cursor = await AcademicRepository.get_allocations_by_student(student_id, page.cursor, page.limit)
     elif topic_id:
-        allocations = AcademicRepository.get_allocations_by_topic(topic_id)
+        allocations, next_cursor = await AcademicRepository.get_allocations_by_topic(topic_id, page.cursor, page.limit)
     else:
-        allocations = AcademicRepository.get_allocations_by_college(college_id)
+        allocations, next_cursor = await AcademicRepository.get_allocations_by_college(college_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [TopicAllocationResponse(**a) for a in allocations]
 
 
@@ -236,7 +245,7 @@ async def get_allocations(
 @router.post("/modules/{module_id}/validate-nmc")
 async def validate_module_nmc(module_id: UUID):
     """Validate module NMC alignment"""
-    module = AcademicRepository.get_module(module_id)
+    module = await AcademicRepository.get_module(module_id)
     if not module:
         raise NotFoundError("Module not found")
     
@@ -261,7 +270,7 @@ async def get_nmc_competencies():
 @router.post("/modules/{module_id}/suggest-competencies")
 async def suggest_competencies(module_id: UUID):
     """Suggest NMC competency codes for a module"""
-    module = AcademicRepository.get_module(module_id)
+    module = await AcademicRepository.get_module(module_id)
     if not module:
         raise NotFoundError("Module not found")
     
@@ -285,21 +294,26 @@ async def create_faculty_attendance(
 ):
     """Create faculty attendance record"""
     attendance_data.college_id = college_id
-    attendance = AcademicRepository.create_faculty_attendance(attendance_data)
+    attendance = await AcademicRepository.create_faculty_attendance(attendance_data)
     return FacultyAttendanceResponse(**attendance)
 
 
 @router.get("/faculty-attendance/me", response_model=List[FacultyAttendanceResponse])
-async def get_my_faculty_attendance(user_id: UUID = Depends(get_current_user_id)):
+async def get_my_faculty_attendance(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    user_id: UUID = Depends(get_current_user_id)
+):
     """Get current faculty member's attendance"""
-    records = AcademicRepository.get_attendance_by_faculty(user_id)
+    records, next_cursor = await AcademicRepository.get_attendance_by_faculty(user_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [FacultyAttendanceResponse(**r) for r in records]
 
 
 @router.get("/faculty-attendance/{attendance_id}", response_model=FacultyAttendanceResponse)
 async def get_faculty_attendance(attendance_id: UUID):
     """Get faculty attendance by ID"""
-    attendance = AcademicRepository.get_faculty_attendance(attendance_id)
+    attendance = await AcademicRepository.get_faculty_attendance(attendance_id)
     if not attendance:
         raise NotFoundError("Faculty attendance not found")
     return FacultyAttendanceResponse(**attendance)
@@ -313,7 +327,7 @@ async def update_faculty_attendance(
 ):
     """Update faculty attendance"""
     try:
-        updated = AcademicRepository.update_faculty_attendance(attendance_id, attendance_data)
+        updated = await AcademicRepository.update_faculty_attendance(attendance_id, attendance_data)
         return FacultyAttendanceResponse(**updated)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -327,6 +341,6 @@ async def get_faculty_attendance_by_department(
     _: UUID = Depends(require_any_role(UserRole.ADMIN, UserRole.HOD, UserRole.PRINCIPAL))
 ):
     """Get attendance records for all faculty in a department"""
-    records = AcademicRepository.get_attendance_by_department(department_id, start_date, end_date)
+    records = await AcademicRepository.get_attendance_by_department(department_id, start_date, end_date)
     return [FacultyAttendanceResponse(**r) for r in records]
 
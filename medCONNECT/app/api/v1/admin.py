@@ -2,7 +2,7 @@
 Admin module API routes
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from uuid import UUID
 from app.models.admin import (
     AttendanceCreate, AttendanceResponse, AttendanceUpdate,
@@ -21,6 +21,7 @@ from app.core.dependencies import (
 )
 from app.models.user import UserRole
 from app.core.exceptions import NotFoundError
+from app.core.pagination import PageParams, page_params, set_next_cursor
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -33,14 +34,19 @@ async def create_attendance(
 ):
     """Create attendance record"""
     attendance_data.college_id = college_id
-    attendance = AdminRepository.create_attendance(attendance_data)
+    attendance = await AdminRepository.create_attendance(attendance_data)
     return AttendanceResponse(**attendance)
 
 
 @router.get("/attendance/me", response_model=List[AttendanceResponse])
-async def get_my_attendance(user_id: UUID = Depends(get_current_user_id)):
+async def get_my_attendance(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    user_id: UUID = Depends(get_current_user_id)
+):
     """Get current student's attendance"""
-    records = AdminRepository.get_attendance_by_student(user_id)
+    records, next_cursor = await AdminRepository.get_attendance_by_student(user_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [AttendanceResponse(**r) for r in records]
 
 
@@ -55,7 +61,7 @@ async def create_attendance_session(
     """Create attendance session"""
     session_data.created_by = user_id
     session_data.college_id = college_id
-    session = AdminRepository.create_attendance_session(session_data)
+    session = await AdminRepository.create_attendance_session(session_data)
     return AttendanceSessionResponse(**session)
 
 
@@ -69,24 +75,32 @@ async def create_certificate_request(
     """Create certificate request"""
     cert_data.student_id = user_id
     cert_data.college_id = college_id
-    cert = AdminRepository.create_certificate_request(cert_data)
+    cert = await AdminRepository.create_certificate_request(cert_data)
     return CertificateRequestResponse(**cert)
 
 
 @router.get("/certificates", response_model=List[CertificateRequestResponse])
 async def get_certificates(
+    response: Response,
+    page: PageParams = Depends(page_params),
     college_id: UUID = Depends(get_current_user_college_id),
     _: UUID = Depends(require_any_role(UserRole.ADMIN, UserRole.HOD, UserRole.PRINCIPAL))
 ):
     """Get all certificate requests for the college (admin only)"""
-    certs = AdminRepository.get_certificates_by_college(college_id)
+    certs, next_cursor = await AdminRepository.get_certificates_by_college(college_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [CertificateRequestResponse(**c) for c in certs]
 
 
 @router.get("/certificates/me", response_model=List[CertificateRequestResponse])
-async def get_my_certificates(user_id: UUID = Depends(get_current_user_id)):
+async def get_my_certificates(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    user_id: UUID = Depends(get_current_user_id)
+):
     """Get current student's certificate requests"""
-    certs = AdminRepository.get_certificates_by_student(user_id)
+    certs, next_cursor = await AdminRepository.get_certificates_by_student(user_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [CertificateRequestResponse(**c) for c in certs]
 
 
@@ -101,14 +115,19 @@ async def create_notice(
     """Create notice"""
     notice_data.created_by = user_id
     notice_data.college_id = college_id
-    notice = AdminRepository.create_notice(notice_data)
+    notice = await AdminRepository.create_notice(notice_data)
     return NoticeResponse(**notice)
 
 
 @router.get("/notices", response_model=List[NoticeResponse])
-async def get_notices(college_id: UUID = Depends(get_current_user_college_id)):
+async def get_notices(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    college_id: UUID = Depends(get_current_user_college_id)
+):
     """Get notices for the college"""
-    notices = AdminRepository.get_notices_by_college(college_id)
+    notices, next_cursor = await AdminRepository.get_notices_by_college(college_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [NoticeResponse(**n) for n in notices]
 
 
@@ -123,14 +142,19 @@ async def create_event(
     """Create event"""
     event_data.created_by = user_id
     event_data.college_id = college_id
-    event = AdminRepository.create_event(event_data)
+    event = await AdminRepository.create_event(event_data)
     return EventResponse(**event)
 
 
 @router.get("/events", response_model=List[EventResponse])
-async def get_events(college_id: UUID = Depends(get_current_user_college_id)):
+async def get_events(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    college_id: UUID = Depends(get_current_user_college_id)
+):
     """Get events for the college"""
-    events = AdminRepository.get_events_by_college(college_id)
+    events, next_cursor = await AdminRepository.get_events_by_college(college_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [EventResponse(**e) for e in events]
 
 
@@ -148,15 +172,20 @@ async def register_for_event(
         registration_date=datetime.utcnow(),
         college_id=college_id
     )
-    registration = AdminRepository.create_event_registration(reg_data)
+    registration = await AdminRepository.create_event_registration(reg_data)
     return EventRegistrationResponse(**registration)
 
 
 # Fees
 @router.get("/fees/me", response_model=List[FeeResponse])
-async def get_my_fees(user_id: UUID = Depends(get_current_user_id)):
+async def get_my_fees(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    user_id: UUID = Depends(get_current_user_id)
+):
     """Get current student's fees"""
-    fees = AdminRepository.get_fees_by_student(user_id)
+    fees, next_cursor = await AdminRepository.get_fees_by_student(user_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [FeeResponse(**f) for f in fees]
 
 
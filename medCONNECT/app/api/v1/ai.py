@@ -76,7 +76,7 @@ async def academic_query(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Query AI academic assistant for explanations, mnemonics, and study tips"""
-    result = ai_service.academic_query(
+    result = await ai_service.academic_query(
         query=request.query,
         context=request.context,
         module_id=str(request.module_id) if request.module_id else None
@@ -90,11 +90,11 @@ async def generate_study_plan(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Generate personalized AI-powered study plan"""
-    weak_areas = ai_service.detect_weak_areas(str(user_id))
+    weak_areas = await ai_service.detect_weak_areas(str(user_id))
     if request.weak_areas:
         weak_areas.extend(request.weak_areas)
     
-    result = ai_service.generate_study_plan(
+    result = await ai_service.generate_study_plan(
         student_id=str(user_id),
         module_ids=[str(mid) for mid in request.module_ids],
         weak_areas=weak_areas if weak_areas else None
@@ -107,7 +107,7 @@ async def get_weak_areas(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Detect weak areas from student progress"""
-    weak_areas = ai_service.detect_weak_areas(str(user_id))
+    weak_areas = await ai_service.detect_weak_areas(str(user_id))
     return weak_areas
 
 
@@ -117,7 +117,7 @@ async def compare_concepts(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Compare two medical concepts using AI"""
-    result = ai_service.compare_concepts(
+    result = await ai_service.compare_concepts(
         concept1=request.concept1,
         concept2=request.concept2,
         subject=request.subject
@@ -134,7 +134,7 @@ async def governance_query(
     ))
 ):
     """Query AI governance assistant for insights and recommendations"""
-    result = ai_service.governance_query(
+    result = await ai_service.governance_query(
         query=request.query,
         metrics_type=request.metrics_type,
         college_id=str(college_id) if college_id else None
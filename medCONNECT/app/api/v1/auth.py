@@ -22,7 +22,7 @@ class LoginRequestWithCollege(LoginRequest):
 async def register(user_data: UserCreate):
     """Register a new user"""
     try:
-        user = AuthService.register_user(user_data)
+        user = await AuthService.register_user(user_data)
         return UserResponse(**user)
     except ConflictError as e:
         raise HTTPException(
@@ -45,7 +45,7 @@ async def register(user_data: UserCreate):
 async def login(login_data: LoginRequestWithCollege):
     """Login user"""
     try:
-        return AuthService.login(login_data, login_data.college_id)
+        return await AuthService.login(login_data, login_data.college_id)
     except UnauthorizedError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,7 +57,7 @@ async def login(login_data: LoginRequestWithCollege):
 async def refresh_token(token_data: RefreshTokenRequest):
     """Refresh access token"""
     try:
-        return AuthService.refresh_access_token(token_data.refresh_token)
+        return await AuthService.refresh_access_token(token_data.refresh_token)
     except UnauthorizedError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -69,5 +69,5 @@ async def refresh_token(token_data: RefreshTokenRequest):
 async def logout(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Logout user"""
     token = credentials.credentials
-    return AuthService.logout(token)
+    return await AuthService.logout(token)
 
@@ -2,7 +2,7 @@
 Clinical module API routes
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from uuid import UUID
 from app.models.clinical import (
     PostingCreate, PostingResponse, PostingUpdate,
@@ -19,6 +19,7 @@ from app.core.dependencies import (
 )
 from app.models.user import UserRole
 from app.core.exceptions import NotFoundError
+from app.core.pagination import PageParams, page_params, set_next_cursor
 
 router = APIRouter(prefix="/clinical", tags=["Clinical"])
 
@@ -32,21 +33,26 @@ async def create_posting(
 ):
     """Create a posting"""
     posting_data.college_id = college_id
-    posting = ClinicalRepository.create_posting(posting_data)
+    posting = await ClinicalRepository.create_posting(posting_data)
     return PostingResponse(**posting)
 
 
 @router.get("/postings/me", response_model=List[PostingResponse])
-async def get_my_postings(user_id: UUID = Depends(get_current_user_id)):
+async def get_my_postings(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    user_id: UUID = Depends(get_current_user_id)
+):
     """Get current student's postings"""
-    postings = ClinicalRepository.get_postings_by_student(user_id)
+    postings, next_cursor = await ClinicalRepository.get_postings_by_student(user_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [PostingResponse(**p) for p in postings]
 
 
 @router.get("/postings/{posting_id}", response_model=PostingResponse)
 async def get_posting(posting_id: UUID):
     """Get posting by ID"""
-    posting = ClinicalRepository.get_posting(posting_id)
+    posting = await ClinicalRepository.get_posting(posting_id)
     if not posting:
         raise NotFoundError("Posting not found")
     return PostingResponse(**posting)
@@ -62,29 +68,37 @@ async def create_logbook_entry(
     """Create a logbook entry"""
     entry_data.student_id = user_id
     entry_data.college_id = college_id
-    entry = ClinicalRepository.create_logbook_entry(entry_data)
+    entry = await ClinicalRepository.create_logbook_entry(entry_data)
     return ClinicalLogbookEntryResponse(**entry)
 
 
 @router.get("/logbooks/me", response_model=List[ClinicalLogbookEntryResponse])
-async def get_my_logbook_entries(user_id: UUID = Depends(get_current_user_id)):
+async def get_my_logbook_entries(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    user_id: UUID = Depends(get_current_user_id)
+):
     """Get current student's logbook entries"""
-    entries = ClinicalRepository.get_logbook_entries_by_student(user_id)
+    entries, next_cursor = await ClinicalRepository.get_logbook_entries_by_student(user_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [ClinicalLogbookEntryResponse(**e) for e in entries]
 
 
 @router.get("/logbooks", response_model=List[ClinicalLogbookEntryResponse])
 async def get_logbook_entries(
+    response: Response,
     student_id: UUID = None,
+    page: PageParams = Depends(page_params),
     college_id: UUID = Depends(get_current_user_college_id),
     _: UUID = Depends(require_any_role(UserRole.FACULTY, UserRole.HOD, UserRole.ADMIN))
 ):
     """Get logbook entries (faculty/admin only) - optionally filtered by student"""
     if student_id:
-        entries = ClinicalRepository.get_logbook_entries_by_student(student_id)
+        entries, next_cursor = await ClinicalRepository.get_logbook_entries_by_student(student_id, page.cursor, page.limit)
     else:
         # Get all logbook entries for the college
-        entries = ClinicalRepository.get_logbook_entries_by_college(college_id)
+        entries, next_cursor = await ClinicalRepository.get_logbook_entries_by_college(college_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [ClinicalLogbookEntryResponse(**e) for e in entries]
 
 
@@ -104,7 +118,7 @@ async def update_logbook_entry(
             entry_data.verified_at = datetime.utcnow()
             entry_data.verified_by = user_id
         
-        updated = ClinicalRepository.update_logbook_entry(entry_id, entry_data)
+        updated = await ClinicalRepository.update_logbook_entry(entry_id, entry_data)
         return ClinicalLogbookEntryResponse(**updated)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -119,14 +133,14 @@ async def create_opd_session(
 ):
     """Create an OPD session"""
     session_data.college_id = college_id
-    session = ClinicalRepository.create_opd_session(session_data)
+    session = await ClinicalRepository.create_opd_session(session_data)
     return OPDSessionResponse(**session)
 
 
 @router.get("/opd-sessions/{session_id}", response_model=OPDSessionResponse)
 async def get_opd_session(session_id: UUID):
     """Get OPD session by ID"""
-    session = ClinicalRepository.get_opd_session(session_id)
+    session = await ClinicalRepository.get_opd_session(session_id)
     if not session:
         raise NotFoundError("OPD session not found")
     return OPDSessionResponse(**session)
@@ -26,21 +26,21 @@ async def create_college(
     _: UUID = Depends(require_any_role(UserRole.DME, UserRole.ADMIN))
 ):
     """Create a college (DME/Admin only)"""
-    college = CollegeRepository.create_college(college_data)
+    college = await CollegeRepository.create_college(college_data)
     return CollegeResponse(**college)
 
 
 @router.get("", response_model=List[CollegeResponse])
 async def get_colleges():
     """Get all colleges"""
-    colleges = CollegeRepository.get_all_colleges()
+    colleges = await CollegeRepository.get_all_colleges()
     return [CollegeResponse(**c) for c in colleges]
 
 
 @router.get("/{college_id}", response_model=CollegeResponse)
 async def get_college(college_id: UUID):
     """Get college by ID"""
-    college = CollegeRepository.get_college(college_id)
+    college = await CollegeRepository.get_college(college_id)
     if not college:
         raise NotFoundError("College not found")
     return CollegeResponse(**college)
@@ -54,7 +54,7 @@ async def update_college(
 ):
     """Update college"""
     try:
-        updated = CollegeRepository.update_college(college_id, college_data)
+        updated = await CollegeRepository.update_college(college_id, college_data)
         return CollegeResponse(**updated)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -69,21 +69,21 @@ async def create_department(
 ):
     """Create a department"""
     department_data.college_id = college_id
-    department = CollegeRepository.create_department(department_data)
+    department = await CollegeRepository.create_department(department_data)
     return DepartmentResponse(**department)
 
 
 @router.get("/{college_id}/departments", response_model=List[DepartmentResponse])
 async def get_departments(college_id: UUID):
     """Get departments for a college"""
-    departments = CollegeRepository.get_departments_by_college(college_id)
+    departments = await CollegeRepository.get_departments_by_college(college_id)
     return [DepartmentResponse(**d) for d in departments]
 
 
 @router.get("/departments/{department_id}", response_model=DepartmentResponse)
 async def get_department(department_id: UUID):
     """Get department by ID"""
-    department = CollegeRepository.get_department(department_id)
+    department = await CollegeRepository.get_department(department_id)
     if not department:
         raise NotFoundError("Department not found")
     return DepartmentResponse(**department)
@@ -97,7 +97,7 @@ async def update_department(
 ):
     """Update department"""
     try:
-        updated = CollegeRepository.update_department(department_id, department_data)
+        updated = await CollegeRepository.update_department(department_id, department_data)
         return DepartmentResponse(**updated)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -1,67 +1,187 @@
 """
 Governance module API routes
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Dict, Any, Awaitable, Callable, Optional, Type, Union
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from pydantic import BaseModel, ValidationError
 from uuid import UUID
 from app.models.governance import (
     GovernanceSnapshotResponse,
     DashboardMetrics,
     AttendanceAnalytics,
     ClinicalExposureAnalytics,
-    AcademicPerformanceAnalytics
+    AcademicPerformanceAnalytics,
+    StateRollupAnalytics
 )
 from app.core.dependencies import (
     get_current_user_college_id,
+    get_current_user_role,
     require_any_role
 )
+from app.core.exceptions import ForbiddenError
 from app.models.user import UserRole
+from app.core.config import settings
+from app.db.cache import governance_cache
 from app.services.governance_service import GovernanceService
+from app.services.snapshot_service import SnapshotService
+from loguru import logger
 
 router = APIRouter(prefix="/governance", tags=["Governance"])
 
+# Roles that may bypass snapshots and the response cache
+LIVE_ROLES = (UserRole.ADMIN, UserRole.DME)
+
+
+async def live_requested(
+    live: bool = Query(False, description="Compute live instead of serving precomputed data (admin/DME only)"),
+    user_role: UserRole = Depends(get_current_user_role)
+) -> bool:
+    """The ``live`` query parameter, rejected for roles outside LIVE_ROLES"""
+    if live and user_role not in LIVE_ROLES:
+        raise ForbiddenError("Live governance data is restricted to admin and DME users")
+    return live
+
+
+def _stored(model: Type[BaseModel], data: Dict[str, Any], source: str) -> Optional[BaseModel]:
+    """Parse precomputed data; ``None`` if it was stored in an older response shape"""
+    try:
+        return model(**data)
+    except ValidationError as e:
+        logger.warning(f"Ignoring {source} data that no longer matches {model.__name__}: {e}")
+        return None
+
+
+async def _governance_response(
+    response: Response,
+    college_id: Union[UUID, str],
+    section: str,
+    model: Type[BaseModel],
+    compute: Callable[[], Awaitable[BaseModel]],
+    live: bool = False,
+    use_snapshot: bool = True,
+    **params: Any
+) -> BaseModel:
+    """Serve a governance view from the latest snapshot, the response cache, or live
+    
+    Sets ``X-Data-Source`` (snapshot / cache / live) and, for precomputed data,
+    ``Age`` in seconds.
+    """
+    if live:
+        response.headers["X-Data-Source"] = "live"
+        return await compute()
+    
+    if use_snapshot:
+        cached = await SnapshotService.get_fresh_snapshot(college_id)
+        if cached and cached[0].get(section):
+            snapshot, age = cached
+            result = _stored(model, snapshot[section], "snapshot")
+            if result is not None:
+                response.headers["X-Data-Source"] = "snapshot"
+                response.headers["X-Snapshot-Date"] = snapshot["snapshot_date"]
+                response.headers["Age"] = str(age)
+                return result
+    
+    async def compute_json() -> Dict[str, Any]:
+        return (await compute()).model_dump(mode="json")
+    
+    key = governance_cache.make_key(section, college_id, **params)
+    data, age = await governance_cache.get_or_compute(key, compute_json)
+    result = _stored(model, data, "cached")
+    if result is None:
+        response.headers["X-Data-Source"] = "live"
+        return await compute()
+    response.headers["X-Data-Source"] = "cache"
+    response.headers["Age"] = str(age)
+    return result
+
 
 @router.get("/dashboard", response_model=DashboardMetrics)
 async def get_dashboard_metrics(
+    response: Response,
+    live: bool = Depends(live_requested),
     college_id: UUID = Depends(get_current_user_college_id),
     _: UUID = Depends(require_any_role(
         UserRole.PRINCIPAL, UserRole.HOD, UserRole.ADMIN, UserRole.DME, UserRole.SUPERINTENDENT, UserRole.FACULTY
     ))
 ):
     """Get dashboard metrics for governance (accessible to faculty for admin dashboard)"""
-    return GovernanceService.get_dashboard_metrics(college_id)
+    return await _governance_response(
+        response, college_id, "metrics", DashboardMetrics,
+        lambda: GovernanceService.get_dashboard_metrics(college_id),
+        live=live
+    )
 
 
 @router.get("/attendance-analytics", response_model=AttendanceAnalytics)
 async def get_attendance_analytics(
+    response: Response,
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
+    student_offset: int = Query(0, ge=0, description="Offset into the per-student lists"),
+    student_limit: int = Query(100, ge=1, le=1000, description="Page size for the per-student lists"),
+    sort: str = Query("risk", pattern="^(risk|rate)$", description="risk: lowest attendance first; rate: highest first"),
+    live: bool = Depends(live_requested),
     college_id: UUID = Depends(get_current_user_college_id),
     _: UUID = Depends(require_any_role(
         UserRole.PRINCIPAL, UserRole.HOD, UserRole.ADMIN, UserRole.DME
     ))
 ):
-    """Get attendance analytics"""
-    return GovernanceService.get_attendance_analytics(college_id, days)
+    """Get attendance analytics; per-student lists are paginated"""
+    analytics = await _governance_response(
+        response, college_id, "attendance_summary", AttendanceAnalytics,
+        lambda: GovernanceService.get_attendance_analytics(college_id, days),
+        live=live,
+        # Snapshots only cover the default window
+        use_snapshot=days == settings.GOVERNANCE_SNAPSHOT_ATTENDANCE_DAYS,
+        days=days
+    )
+    # The full ranking is cached once per window; pages are sliced from it
+    return GovernanceService.page_student_attendance(analytics, student_offset, student_limit, sort)
 
 
 @router.get("/clinical-analytics", response_model=ClinicalExposureAnalytics)
 async def get_clinical_analytics(
+    response: Response,
+    live: bool = Depends(live_requested),
     college_id: UUID = Depends(get_current_user_college_id),
     _: UUID = Depends(require_any_role(
         UserRole.PRINCIPAL, UserRole.HOD, UserRole.ADMIN, UserRole.SUPERINTENDENT
     ))
 ):
     """Get clinical exposure analytics"""
-    return GovernanceService.get_clinical_analytics(college_id)
+    return await _governance_response(
+        response, college_id, "clinical_summary", ClinicalExposureAnalytics,
+        lambda: GovernanceService.get_clinical_analytics(college_id),
+        live=live
+    )
 
 
 @router.get("/academic-analytics", response_model=AcademicPerformanceAnalytics)
 async def get_academic_analytics(
+    response: Response,
+    live: bool = Depends(live_requested),
     college_id: UUID = Depends(get_current_user_college_id),
     _: UUID = Depends(require_any_role(
         UserRole.PRINCIPAL, UserRole.HOD, UserRole.ADMIN, UserRole.DME
     ))
 ):
     """Get academic performance analytics"""
-    return GovernanceService.get_academic_analytics(college_id)
+    return await _governance_response(
+        response, college_id, "academic_summary", AcademicPerformanceAnalytics,
+        lambda: GovernanceService.get_academic_analytics(college_id),
+        live=live
+    )
 
+
+@router.get("/state-rollup", response_model=StateRollupAnalytics)
+async def get_state_rollup(
+    response: Response,
+    live: bool = Depends(live_requested),
+    _: UUID = Depends(require_any_role(UserRole.DME))
+):
+    """Get state-wide analytics across all colleges (DME only)"""
+    return await _governance_response(
+        response, "state", "state_rollup", StateRollupAnalytics,
+        GovernanceService.get_state_rollup,
+        live=live,
+        use_snapshot=False
+    )
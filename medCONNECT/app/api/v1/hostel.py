@@ -2,7 +2,7 @@
 Hostel management API routes
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from uuid import UUID
 from app.models.hostel import (
     HostelCreate, HostelResponse, HostelUpdate,
@@ -20,6 +20,7 @@ from app.core.dependencies import (
 )
 from app.models.user import UserRole
 from app.core.exceptions import NotFoundError
+from app.core.pagination import PageParams, page_params, set_next_cursor
 
 router = APIRouter(prefix="/hostel", tags=["Hostel"])
 
@@ -33,14 +34,14 @@ async def create_hostel(
 ):
     """Create a hostel"""
     hostel_data.college_id = college_id
-    hostel = HostelRepository.create_hostel(hostel_data)
+    hostel = await HostelRepository.create_hostel(hostel_data)
     return HostelResponse(**hostel)
 
 
 @router.get("/hostels", response_model=List[HostelResponse])
 async def get_hostels(college_id: UUID = Depends(get_current_user_college_id)):
     """Get hostels for the college"""
-    hostels = HostelRepository.get_hostels_by_college(college_id)
+    hostels = await HostelRepository.get_hostels_by_college(college_id)
     return [HostelResponse(**h) for h in hostels]
 
 
@@ -53,14 +54,14 @@ async def create_room(
 ):
     """Create a room"""
     room_data.college_id = college_id
-    room = HostelRepository.create_room(room_data)
+    room = await HostelRepository.create_room(room_data)
     return RoomResponse(**room)
 
 
 @router.get("/rooms/hostel/{hostel_id}", response_model=List[RoomResponse])
 async def get_rooms_by_hostel(hostel_id: UUID):
     """Get rooms for a hostel"""
-    rooms = HostelRepository.get_rooms_by_hostel(hostel_id)
+    rooms = await HostelRepository.get_rooms_by_hostel(hostel_id)
     return [RoomResponse(**r) for r in rooms]
 
 
@@ -73,14 +74,14 @@ async def create_allocation(
 ):
     """Create hostel allocation"""
     allocation_data.college_id = college_id
-    allocation = HostelRepository.create_allocation(allocation_data)
+    allocation = await HostelRepository.create_allocation(allocation_data)
     return HostelAllocationResponse(**allocation)
 
 
 @router.get("/allocations/me", response_model=HostelAllocationResponse)
 async def get_my_allocation(user_id: UUID = Depends(get_current_user_id)):
     """Get current student's hostel allocation"""
-    allocation = HostelRepository.get_allocation_by_student(user_id)
+    allocation = await HostelRepository.get_allocation_by_student(user_id)
     if not allocation:
         raise NotFoundError("No active allocation found")
     return HostelAllocationResponse(**allocation)
@@ -96,13 +97,18 @@ async def create_visitor_log(
     """Create visitor log"""
     visitor_data.student_id = user_id
     visitor_data.college_id = college_id
-    visitor = HostelRepository.create_visitor_log(visitor_data)
+    visitor = await HostelRepository.create_visitor_log(visitor_data)
     return VisitorLogResponse(**visitor)
 
 
 @router.get("/visitors/me", response_model=List[VisitorLogResponse])
-async def get_my_visitor_logs(user_id: UUID = Depends(get_current_user_id)):
+async def get_my_visitor_logs(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    user_id: UUID = Depends(get_current_user_id)
+):
     """Get current student's visitor logs"""
-    logs = HostelRepository.get_visitor_logs_by_student(user_id)
+    logs, next_cursor = await HostelRepository.get_visitor_logs_by_student(user_id, page.cursor, page.limit)
+    set_next_cursor(response, next_cursor)
     return [VisitorLogResponse(**log) for log in logs]
 
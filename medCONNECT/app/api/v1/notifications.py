@@ -2,26 +2,37 @@
 Notifications module API routes
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from uuid import UUID
 from app.services.notification_service import NotificationService
 from app.core.dependencies import get_current_user_id
 from app.core.exceptions import NotFoundError
+from app.core.pagination import PageParams, page_params, set_next_cursor
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 
 @router.get("")
-async def get_notifications(user_id: UUID = Depends(get_current_user_id)):
+async def get_notifications(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    user_id: UUID = Depends(get_current_user_id)
+):
     """Get current user's notifications"""
-    notifications = NotificationService.get_user_notifications(user_id, unread_only=False)
+    notifications, next_cursor = await NotificationService.get_user_notifications(user_id, unread_only=False, cursor=page.cursor, limit=page.limit)
+    set_next_cursor(response, next_cursor)
     return notifications
 
 
 @router.get("/unread")
-async def get_unread_notifications(user_id: UUID = Depends(get_current_user_id)):
+async def get_unread_notifications(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    user_id: UUID = Depends(get_current_user_id)
+):
     """Get unread notifications for current user"""
-    notifications = NotificationService.get_user_notifications(user_id, unread_only=True)
+    notifications, next_cursor = await NotificationService.get_user_notifications(user_id, unread_only=True, cursor=page.cursor, limit=page.limit)
+    set_next_cursor(response, next_cursor)
     return notifications
 
 
@@ -33,13 +44,12 @@ async def mark_notification_as_read(
     """Mark notification as read"""
     try:
         # Verify the notification belongs to the user
-        notifications = NotificationService.get_user_notifications(user_id)
-        notification = next((n for n in notifications if n.get("id") == str(notification_id)), None)
+        notification = await NotificationService.get_user_notification(notification_id, user_id)
         
         if not notification:
             raise NotFoundError("Notification not found")
         
-        updated = NotificationService.mark_as_read(notification_id)
+        updated = await NotificationService.mark_as_read(notification_id)
         return updated
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -2,26 +2,24 @@
 User management API routes
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from uuid import UUID
 from app.models.user import UserResponse, UserUpdate
 from app.repositories.user_repo import UserRepository
-from app.core.dependencies import get_current_user_id, get_current_user_college_id, require_role, require_any_role
-from app.models.user import UserRole
+from app.core.dependencies import get_current_user_id, get_current_user_college_id, get_principal, require_role, require_any_role
+from app.models.user import UserRole, Principal
 from app.core.exceptions import NotFoundError
+from app.core.pagination import PageParams, page_params, set_next_cursor
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user(
-    user_id: UUID = Depends(get_current_user_id)
+    principal: Principal = Depends(get_principal)
 ):
     """Get current user profile"""
-    user = UserRepository.get_user_by_id(user_id)
-    if not user:
-        raise NotFoundError("User not found")
-    return UserResponse(**user)
+    return UserResponse(**principal.profile)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -31,7 +29,7 @@ async def get_user(
     current_college_id: UUID = Depends(get_current_user_college_id)
 ):
     """Get user by ID"""
-    user = UserRepository.get_user_by_id(user_id)
+    user = await UserRepository.get_user_by_id(user_id)
     if not user:
         raise NotFoundError("User not found")
     
@@ -52,7 +50,7 @@ async def update_current_user(
 ):
     """Update current user profile"""
     try:
-        updated = UserRepository.update_user(user_id, user_data)
+        updated = await UserRepository.update_user(user_id, user_data)
         return UserResponse(**updated)
     except NotFoundError as e:
         raise HTTPException(
@@ -63,19 +61,16 @@ async def update_current_user(
 
 @router.get("", response_model=List[UserResponse])
 async def get_users(
+    response: Response,
     role: str = None,
+    page: PageParams = Depends(page_params),
     current_college_id: UUID = Depends(get_current_user_college_id),
-    current_user_id: UUID = Depends(get_current_user_id)
+    principal: Principal = Depends(get_principal)
 ):
     """Get all users for the college (filtered by role if provided)"""
     # Allow students to see other students, faculty to see students, etc.
     # Full list only for admin/HOD/Principal
-    from app.repositories.user_repo import UserRepository
-    current_user = UserRepository.get_user_by_id(current_user_id)
-    if not current_user:
-        raise NotFoundError("Current user not found")
-    
-    current_user_role = current_user.get("role")
+    current_user_role = principal.role.value
     
     # If no role filter, only admins/HOD/Principal can see all users
     if not role:
@@ -85,6 +80,7 @@ async def get_users(
                 detail="Access denied. Role filter required."
             )
     
-    users = UserRepository.get_users_by_college(current_college_id, role)
+    users, next_cursor = await UserRepository.get_users_by_college(current_college_id, role, cursor=page.cursor, limit=page.limit)
+    set_next_cursor(response, next_cursor)
     return [UserResponse(**user) for user in users]
 
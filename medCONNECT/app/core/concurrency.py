@@ -0,0 +1,31 @@
+"""
+Helpers for running independent I/O-bound coroutines concurrently
+"""
+from typing import Any, Awaitable, List, Optional
+import asyncio
+from app.core.exceptions import ServiceTimeoutError
+from loguru import logger
+
+
+async def gather_bounded(
+    *aws: Awaitable[Any],
+    limit: int,
+    timeout: Optional[float] = None,
+    label: str = "queries"
+) -> List[Any]:
+    """Await ``aws`` concurrently with at most ``limit`` in flight
+    
+    Results come back in argument order. If ``timeout`` (seconds) elapses the
+    outstanding coroutines are cancelled and ``ServiceTimeoutError`` is raised.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+    
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+    
+    try:
+        return await asyncio.wait_for(asyncio.gather(*(run(aw) for aw in aws)), timeout)
+    except asyncio.TimeoutError:
+        logger.error(f"Timed out after {timeout}s waiting for {len(aws)} {label}")
+        raise ServiceTimeoutError(f"Timed out loading {label}")
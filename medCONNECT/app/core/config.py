@@ -1,7 +1,7 @@
 """
 Application configuration management
 """
-from typing import List
+from typing import List, Dict
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -19,11 +19,68 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     
+    # Per-request timing spans (Server-Timing header; log line for slow requests)
+    SERVER_TIMING_ENABLED: bool = True
+    SERVER_TIMING_LOG_THRESHOLD_MS: float = 1000.0
+    
+    # Prometheus metrics at /metrics (requires prometheus-client)
+    METRICS_ENABLED: bool = False
+    
+    # Per-request query recorder: N+1 detection and query budgets
+    QUERY_RECORDER_ENABLED: bool = False
+    QUERY_REPEAT_THRESHOLD: int = 5  # same (table, operation, filter shape) this often in one request
+    QUERY_REPEAT_EXEMPT_ROUTES: List[str] = ["/api/v1/governance/state-rollup"]  # per-college fan-out by design
+    QUERY_BUDGET_DEFAULT: int = 0  # max queries per request, 0 = unlimited
+    QUERY_BUDGETS: Dict[str, int] = {}  # route template -> max queries
+    QUERY_BUDGET_STRICT: bool = False  # raise instead of logging (tests)
+    
     # Supabase
     SUPABASE_URL: str = Field(default="", env="SUPABASE_URL")
     SUPABASE_KEY: str = Field(default="", env="SUPABASE_KEY")
     SUPABASE_SERVICE_ROLE_KEY: str = Field(default="", env="SUPABASE_SERVICE_ROLE_KEY")
-    
+
+    # Supabase HTTP connection pool (async PostgREST client)
+    SUPABASE_HTTP2: bool = True
+    SUPABASE_POOL_MAX_CONNECTIONS: int = 100
+    SUPABASE_POOL_MAX_KEEPALIVE: int = 20
+    SUPABASE_KEEPALIVE_EXPIRY: float = 30.0
+    SUPABASE_HTTP_TIMEOUT: float = 10.0
+
+    # Database backend for repositories: supabase | memory | sqlite
+    # (memory/sqlite need no network; RPC-backed aggregates use their client-side fallbacks)
+    DATABASE_BACKEND: str = "supabase"
+    DATABASE_SCHEMA_FILES: List[str] = ["supabase_schema.sql", "migration_add_nmc_and_3d_features.sql"]
+    SQLITE_DATABASE_PATH: str = "medconnect.sqlite3"
+    OPTIONAL_SCHEMA_RECHECK_INTERVAL: int = 300  # seconds before a missing migration table/function is probed again
+
+    # List endpoints (keyset pagination; next page cursor in X-Next-Cursor)
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 500
+
+    # Supabase Auth token verification
+    SUPABASE_JWT_SECRET: str = Field(default="", env="SUPABASE_JWT_SECRET")
+    SUPABASE_JWT_AUDIENCE: str = "authenticated"
+    SUPABASE_JWT_LEEWAY: int = 10  # seconds of clock skew tolerated on exp/nbf
+    SUPABASE_JWKS_CACHE_TTL: int = 600
+    SUPABASE_JWKS_MIN_REFRESH_INTERVAL: int = 30
+    SUPABASE_TOKEN_REVOCATION_CHECK: bool = False
+    SUPABASE_REVOCATION_CHECK_INTERVAL: int = 60
+
+    # Governance dashboards (concurrent query fan-out)
+    DASHBOARD_QUERY_CONCURRENCY: int = 8
+    DASHBOARD_TIMEOUT: float = 15.0
+
+    # State-wide (DME) rollup across colleges
+    STATE_ROLLUP_CONCURRENCY: int = 6  # colleges computed in parallel
+    STATE_ROLLUP_COLLEGE_TIMEOUT: float = 20.0  # slower colleges are reported in colleges_failed
+
+    # Governance snapshots (precomputed dashboards)
+    GOVERNANCE_SNAPSHOT_SCHEDULER_ENABLED: bool = False  # workers share a Redis lease; without Redis enable on one worker only
+    GOVERNANCE_SNAPSHOT_INTERVAL: int = 3600  # seconds between scheduled runs
+    GOVERNANCE_SNAPSHOT_MAX_AGE: int = 7200  # older snapshots are ignored and data is computed live
+    GOVERNANCE_SNAPSHOT_ATTENDANCE_DAYS: int = 30
+    GOVERNANCE_SNAPSHOT_CONCURRENCY: int = 2  # colleges processed in parallel
+
     # JWT
     SECRET_KEY: str = Field(default="dev-secret-key-change-in-production-min-32-characters", env="SECRET_KEY")
     ALGORITHM: str = "HS256"
@@ -35,6 +92,17 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
+
+    # User profile cache (in-process LRU in front of Redis)
+    USER_PROFILE_CACHE_SIZE: int = 10000
+    USER_PROFILE_CACHE_TTL: int = 60
+    USER_PROFILE_REDIS_TTL: int = 300
+
+    # Governance response cache (stale-while-revalidate in Redis)
+    GOVERNANCE_CACHE_TTL: int = 120  # seconds a cached response is fresh
+    GOVERNANCE_CACHE_STALE_TTL: int = 900  # further seconds it may be served while refreshing
+    GOVERNANCE_CACHE_LOCK_TIMEOUT: int = 60  # recompute lock expiry
+    GOVERNANCE_CACHE_WAIT: float = 5.0  # how long a cache miss waits for another worker's recompute
     
     # OpenAI
     OPENAI_API_KEY: str = Field(default="", env="OPENAI_API_KEY")
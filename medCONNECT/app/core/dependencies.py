@@ -1,12 +1,13 @@
 """
 FastAPI dependencies for authentication and authorization using Supabase Auth
 """
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+from typing import Optional, Dict, Any
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.exceptions import UnauthorizedError, ForbiddenError
-from app.models.user import UserRole
-from app.db.supabase import supabase_client
+from app.core.token_verifier import token_verifier
+from app.core.timing import span, AUTH
+from app.models.user import UserRole, Principal
 from app.repositories.user_repo import UserRepository
 from uuid import UUID
 from loguru import logger
@@ -15,25 +16,24 @@ from loguru import logger
 security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user_id(
+async def get_token_claims(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
-) -> str:
-    """Get current user ID from Supabase JWT token"""
+) -> Dict[str, Any]:
+    """Verify the bearer token once per request and cache its claims on request.state"""
+    cached = getattr(request.state, "token_claims", None)
+    if cached is not None:
+        return cached
+    
     if not credentials:
         raise UnauthorizedError("Authentication required. Please provide a valid token.")
     
-    token = credentials.credentials
-    
     try:
-        client = supabase_client.get_client()
-        # Verify token and get user
-        user_response = client.auth.get_user(token)
-        
-        if not user_response.user:
-            raise UnauthorizedError("Invalid authentication credentials")
-        
-        return user_response.user.id
-        
+        # Verify token locally (signature, exp, aud)
+        with span(AUTH, "verify token"):
+            claims = await token_verifier.verify(credentials.credentials)
+    except UnauthorizedError:
+        raise
     except ValueError as e:
         # Supabase client not initialized
         logger.error(f"Supabase client error: {e}")
@@ -41,81 +41,68 @@ async def get_current_user_id(
     except Exception as e:
         logger.error(f"Token verification error: {e}")
         raise UnauthorizedError("Invalid authentication credentials")
+    
+    request.state.token_claims = claims
+    return claims
 
 
-async def get_current_user_college_id(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
-) -> str:
-    """Get current user's college ID from user profile"""
-    if not credentials:
-        raise UnauthorizedError("Authentication required. Please provide a valid token.")
-    
-    token = credentials.credentials
+async def get_principal(
+    request: Request,
+    claims: Dict[str, Any] = Depends(get_token_claims)
+) -> Principal:
+    """Resolve the caller's profile, role and college once per request"""
+    cached = getattr(request.state, "principal", None)
+    if cached is not None:
+        return cached
     
     try:
-        client = supabase_client.get_client()
-        user_response = client.auth.get_user(token)
-        
-        if not user_response.user:
-            raise UnauthorizedError("Invalid authentication credentials")
-        
-        # Get user from database to get college_id
-        user = UserRepository.get_user_by_id(UUID(user_response.user.id))
-        if not user:
-            raise UnauthorizedError("User profile not found")
-        
-        college_id = str(user.get("college_id"))
-        if not college_id:
-            raise UnauthorizedError("College ID not found in user profile")
-        
-        return college_id
-        
-    except ValueError as e:
-        # Supabase client not initialized
-        logger.error(f"Supabase client error: {e}")
-        raise UnauthorizedError("Authentication service unavailable. Please check server configuration.")
+        user = await UserRepository.get_user_by_id(UUID(claims["sub"]))
     except Exception as e:
-        logger.error(f"College ID retrieval error: {e}")
+        logger.error(f"User profile lookup error: {e}")
         raise UnauthorizedError("Invalid authentication credentials")
+    
+    if not user:
+        raise UnauthorizedError("User profile not found")
+    if not user.get("college_id"):
+        raise UnauthorizedError("College ID not found in user profile")
+    
+    role_str = user.get("role")
+    if not role_str:
+        raise UnauthorizedError("Role not found in user profile")
+    try:
+        role = UserRole(role_str)
+    except ValueError:
+        raise UnauthorizedError(f"Invalid role in user profile: {role_str}")
+    
+    principal = Principal(
+        user_id=UUID(claims["sub"]),
+        college_id=UUID(str(user["college_id"])),
+        role=role,
+        profile=user
+    )
+    request.state.principal = principal
+    return principal
+
+
+async def get_current_user_id(
+    claims: Dict[str, Any] = Depends(get_token_claims)
+) -> str:
+    """Get current user ID from Supabase JWT token"""
+    return claims["sub"]
+
+
+async def get_current_user_college_id(
+    principal: Principal = Depends(get_principal)
+) -> str:
+    """Get current user's college ID from user profile"""
+    return str(principal.college_id)
 
 
 async def get_current_user_role(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    principal: Principal = Depends(get_principal)
 ) -> UserRole:
     """Get current user role from user profile"""
-    if not credentials:
-        raise UnauthorizedError("Authentication required. Please provide a valid token.")
-    
-    token = credentials.credentials
-    
-    try:
-        client = supabase_client.get_client()
-        user_response = client.auth.get_user(token)
-        
-        if not user_response.user:
-            raise UnauthorizedError("Invalid authentication credentials")
-        
-        # Get user from database to get role
-        user = UserRepository.get_user_by_id(UUID(user_response.user.id))
-        if not user:
-            raise UnauthorizedError("User profile not found")
-        
-        role_str = user.get("role")
-        if not role_str:
-            raise UnauthorizedError("Role not found in user profile")
-        
-        try:
-            return UserRole(role_str)
-        except ValueError:
-            raise UnauthorizedError(f"Invalid role in user profile: {role_str}")
-            
-    except ValueError as e:
-        # Supabase client not initialized
-        logger.error(f"Supabase client error: {e}")
-        raise UnauthorizedError("Authentication service unavailable. Please check server configuration.")
-    except Exception as e:
-        logger.error(f"Role retrieval error: {e}")
-        raise UnauthorizedError("Invalid authentication credentials")
+    return principal.role
 
 
 def require_role(*allowed_roles: UserRole):
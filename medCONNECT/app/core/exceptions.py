@@ -42,3 +42,9 @@ class ConflictError(MedConnectException):
 
 
 
+
+
+class ServiceTimeoutError(MedConnectException):
+    """Upstream queries did not finish in time"""
+    def __init__(self, detail: str = "Request timed out"):
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=detail)
@@ -0,0 +1,126 @@
+"""
+Prometheus metrics for HTTP requests, Supabase queries and Redis cache lookups
+"""
+from typing import Optional, Tuple
+from contextvars import ContextVar
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.routing import route_template
+from loguru import logger
+
+try:
+    from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    if settings.METRICS_ENABLED:
+        logger.warning("prometheus-client not installed. Metrics are disabled.")
+
+ROWS_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# ASGI scope of the request being handled; the matched route is read from it lazily
+_request_scope: ContextVar[Optional[Scope]] = ContextVar("metrics_request_scope", default=None)
+
+
+def current_route() -> str:
+    """Route template of the request being handled ("background" outside requests)"""
+    scope = _request_scope.get()
+    return route_template(scope) if scope is not None else "background"
+
+
+class Metrics:
+    """Prometheus collectors; every ``observe_*`` call is skipped when disabled
+    
+    Call sites check ``metrics.enabled`` first so disabled metrics cost one
+    attribute lookup per query.
+    """
+    
+    def __init__(self):
+        self.enabled = settings.METRICS_ENABLED and PROMETHEUS_AVAILABLE
+        if not self.enabled:
+            return
+        
+        labels = ("table", "operation", "route")
+        self.query_seconds = Histogram(
+            "medconnect_db_query_seconds", "Supabase query latency", labels
+        )
+        self.query_rows = Histogram(
+            "medconnect_db_query_rows", "Rows returned per Supabase query", labels, buckets=ROWS_BUCKETS
+        )
+        self.query_bytes = Histogram(
+            "medconnect_db_query_payload_bytes", "Response payload size per Supabase query", labels,
+            buckets=BYTES_BUCKETS
+        )
+        self.cache_lookups = Counter(
+            "medconnect_cache_lookups_total", "Redis cache lookups by result", ("result", "route")
+        )
+        self.request_seconds = Histogram(
+            "medconnect_http_request_seconds", "HTTP request latency", ("method", "route", "status")
+        )
+        self.rollup_failures = Counter(
+            "medconnect_attendance_rollup_failures_total", "Attendance rollup delta updates that failed"
+        )
+    
+    def observe_query(
+        self,
+        table: str,
+        operation: str,
+        seconds: float,
+        rows: Optional[int] = None,
+        payload_bytes: Optional[int] = None
+    ) -> None:
+        """Record one Supabase call"""
+        labels = (table, operation, current_route())
+        self.query_seconds.labels(*labels).observe(seconds)
+        if rows is not None:
+            self.query_rows.labels(*labels).observe(rows)
+        if payload_bytes is not None:
+            self.query_bytes.labels(*labels).observe(payload_bytes)
+    
+    def observe_cache(self, hit: bool) -> None:
+        """Record one Redis lookup"""
+        self.cache_lookups.labels("hit" if hit else "miss", current_route()).inc()
+    
+    def observe_rollup_failure(self) -> None:
+        """Record one failed attendance rollup update"""
+        self.rollup_failures.inc()
+    
+    def render(self) -> Tuple[bytes, str]:
+        """Exposition payload and content type for /metrics"""
+        return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """Track the current request for route labels and record request latency"""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_scope.reset(token)
+            metrics.request_seconds.labels(scope["method"], route_template(scope), str(status_code)).observe(
+                time.perf_counter() - start_time
+            )
+
+
+# Global instance
+metrics = Metrics()
@@ -1,35 +1,126 @@
 """
 Custom middleware
 """
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.timing import start_request, end_request, current_timings
+from app.core.query_recorder import record_queries, QueryBudgetExceeded
+from app.core.routing import route_template
+from loguru import logger
+import re
 import time
 import uuid
 
+REQUEST_ID_HEADER = "X-Request-ID"
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Add request ID to each request"""
+# Inbound request IDs are echoed back, so only accept short, header-safe values
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class RequestIDMiddleware:
+    """Add request ID to each request, continuing an inbound X-Request-ID when valid"""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        inbound = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        request_id = inbound if inbound and REQUEST_ID_PATTERN.match(inbound) else str(uuid.uuid4())
+        # request.state reads from scope["state"]
+        scope.setdefault("state", {})["request_id"] = request_id
+        
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+        
+        await self.app(scope, receive, send_with_request_id)
+
+
+class TimingMiddleware:
+    """Add timing information (seconds until the response starts) to responses
+    
+    Also collects request-scoped spans (auth, db, cache, ai, serialize) and
+    reports them as a Server-Timing header and, for slow requests, a log line.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
     
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
+        start_time = time.perf_counter()
+        token = start_request() if settings.SERVER_TIMING_ENABLED else None
+        status_code = 500
+        
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = time.perf_counter() - start_time
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(process_time)
+                if timings is not None:
+                    headers["Server-Timing"] = timings.server_timing(process_time)
+            await send(message)
+        
+        timings = current_timings()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if token is not None:
+                end_request(token)
+                total_ms = (time.perf_counter() - start_time) * 1000
+                if total_ms >= settings.SERVER_TIMING_LOG_THRESHOLD_MS:
+                    logger.bind(
+                        request_id=scope.get("state", {}).get("request_id"),
+                        timings=timings.summary(),
+                        spans=timings.spans
+                    ).info(
+                        f"{scope['method']} {scope['path']} {status_code} took {total_ms:.1f}ms: "
+                        f"{timings.server_timing(total_ms / 1000)}"
+                    )
 
 
-class TimingMiddleware(BaseHTTPMiddleware):
-    """Add timing information to responses"""
+class QueryBudgetMiddleware:
+    """Record Supabase calls per request and report N+1 patterns and budget overruns
+    
+    Violations are logged; with QUERY_BUDGET_STRICT they raise
+    QueryBudgetExceeded instead, which fails tests using TestClient.
+    """
     
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        with record_queries() as recorder:
+            await self.app(scope, receive, send)
+        
+        route = route_template(scope)
+        problems = recorder.problems(
+            budget=settings.QUERY_BUDGETS.get(route, settings.QUERY_BUDGET_DEFAULT),
+            repeat_threshold=0 if route in settings.QUERY_REPEAT_EXEMPT_ROUTES else settings.QUERY_REPEAT_THRESHOLD
+        )
+        if not problems:
+            return
+        message = f"{scope['method']} {route}: " + "; ".join(problems)
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
 
 
 def setup_cors(app):
@@ -40,9 +131,5 @@ def setup_cors(app):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
-
-
-
-
-
@@ -0,0 +1,37 @@
+"""
+Keyset (cursor) pagination for list endpoints
+"""
+from typing import Optional
+from fastapi import Query, Response
+from pydantic import BaseModel
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.db.backends.base import decode_cursor
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams(BaseModel):
+    """Requested page of a list endpoint"""
+    cursor: Optional[str] = None
+    limit: int = settings.PAGE_SIZE_DEFAULT
+
+
+async def page_params(
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="Page size")
+) -> PageParams:
+    """Pagination query parameters; rejects malformed cursors"""
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise ValidationError("Invalid pagination cursor")
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Advertise the next page, if there is one"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,103 @@
+"""
+Per-request Supabase query recorder: N+1 detection and query budgets
+"""
+from typing import Optional, List, Dict, Any, Tuple, Iterator
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Query-string keys that change which query runs (other values are just data)
+STRUCTURAL_PARAMS = ("select", "order")
+PAGINATION_PARAMS = ("limit", "offset")
+
+# RPC arguments naming tables/columns: different values mean a different query
+STRUCTURAL_RPC_ARGS = ("p_table", "p_group_by", "p_avg_column", "p_distinct_column", "p_sum_column")
+
+QueryKey = Tuple[str, str, tuple]
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request exceeded its query budget or repeated a query shape (strict mode)"""
+    pass
+
+
+def query_shape(params: Optional[List[Tuple[str, str]]] = None, rpc_args: Optional[Dict[str, Any]] = None) -> tuple:
+    """Filter shape of a PostgREST call: columns and operators, without values
+
+    ``[("college_id", "eq.1"), ("status", "in.(a,b)")]`` and
+    ``[("college_id", "eq.2"), ("status", "in.(c)")]`` share a shape.
+    """
+    shape = []
+    for key, value in params or []:
+        if key in STRUCTURAL_PARAMS:
+            shape.append((key, value))
+        elif key in PAGINATION_PARAMS:
+            shape.append((key, None))
+        else:
+            operator = value.split(".", 2)
+            shape.append((key, ".".join(operator[:2]) if operator[0] == "not" else operator[0]))
+    for key, value in (rpc_args or {}).items():
+        if key in STRUCTURAL_RPC_ARGS:
+            shape.append((key, value))
+        elif isinstance(value, dict):
+            shape.append((key, tuple(sorted(value))))
+        else:
+            shape.append((key, None))
+    return tuple(sorted(shape, key=repr))
+
+
+class QueryRecorder:
+    """Supabase calls made while handling one request, counted by (table, operation, shape)"""
+    
+    def __init__(self):
+        self.calls: Counter = Counter()
+    
+    def record(self, table: str, operation: str, shape: tuple) -> None:
+        """Count one call"""
+        self.calls[(table, operation, shape)] += 1
+    
+    @property
+    def total(self) -> int:
+        """Number of calls recorded"""
+        return sum(self.calls.values())
+    
+    def repeated(self, threshold: int) -> List[Tuple[QueryKey, int]]:
+        """Query shapes issued at least ``threshold`` times, most frequent first"""
+        return [(key, count) for key, count in self.calls.most_common() if count >= threshold]
+    
+    def problems(self, budget: int = 0, repeat_threshold: int = 0) -> List[str]:
+        """Human-readable budget and N+1 violations (0 disables a check)"""
+        found = []
+        if budget and self.total > budget:
+            found.append(f"{self.total} queries exceeds the budget of {budget}")
+        if repeat_threshold:
+            for (table, operation, shape), count in self.repeated(repeat_threshold):
+                columns = ", ".join(str(key) for key, _ in shape) or "no filters"
+                found.append(f"possible N+1: {operation} {table} ({columns}) ran {count} times")
+        return found
+
+
+_current: ContextVar[Optional[QueryRecorder]] = ContextVar("query_recorder", default=None)
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryRecorder]:
+    """Record Supabase calls made inside the block (including gathered tasks)"""
+    recorder = QueryRecorder()
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
+
+
+def record_query(
+    table: str,
+    operation: str,
+    params: Optional[List[Tuple[str, str]]] = None,
+    rpc_args: Optional[Dict[str, Any]] = None
+) -> None:
+    """Count a call in the active recorder; no-op when nothing is recording"""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.record(table, operation, query_shape(params, rpc_args))
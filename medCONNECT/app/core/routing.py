@@ -0,0 +1,9 @@
+"""
+Request routing helpers shared by the middleware and metrics
+"""
+from starlette.types import Scope
+
+
+def route_template(scope: Scope) -> str:
+    """Route template matched for ``scope``, e.g. "/api/v1/users/{user_id}" ("unmatched" if none)"""
+    return getattr(scope.get("route"), "path", None) or "unmatched"
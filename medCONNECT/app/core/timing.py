@@ -0,0 +1,92 @@
+"""
+Request-scoped timing spans, reported as a Server-Timing header and a log line
+"""
+from typing import Optional, List, Dict, Any, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+import time
+from starlette.responses import JSONResponse
+
+# Span categories (Server-Timing metric names)
+AUTH = "auth"
+DB = "db"
+CACHE_HIT = "cache-hit"
+CACHE_MISS = "cache-miss"
+AI = "ai"
+SERIALIZE = "serialize"
+
+
+class RequestTimings:
+    """Spans recorded while handling one request"""
+    
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+    
+    def add(self, category: str, description: str, duration: float) -> None:
+        """Record a finished span (duration in seconds)"""
+        self.spans.append({"category": category, "description": description, "ms": duration * 1000})
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Total milliseconds and span count per category"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            entry = totals.setdefault(span["category"], {"ms": 0.0, "count": 0})
+            entry["ms"] += span["ms"]
+            entry["count"] += 1
+        return totals
+    
+    def server_timing(self, total: float) -> str:
+        """Server-Timing header value; spans that ran concurrently can add up to more than ``total``"""
+        metrics = [
+            f'{category};dur={entry["ms"]:.1f};desc="{entry["count"]}x"'
+            for category, entry in self.summary().items()
+        ]
+        metrics.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request() -> Token:
+    """Begin collecting spans for the current request"""
+    return _current.set(RequestTimings())
+
+
+def end_request(token: Token) -> None:
+    """Stop collecting spans for the current request"""
+    _current.reset(token)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Spans for the request being handled, or ``None`` outside a request"""
+    return _current.get()
+
+
+def record(category: str, description: str, duration: float) -> None:
+    """Record a span measured by the caller; no-op outside a request"""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(category, description, duration)
+
+
+@contextmanager
+def span(category: str, description: str = "") -> Iterator[None]:
+    """Time the enclosed block as one span; no-op outside a request"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(category, description, time.perf_counter() - start)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse whose rendering is timed as a ``serialize`` span"""
+    
+    def render(self, content: Any) -> bytes:
+        with span(SERIALIZE, "json"):
+            return super().render(content)
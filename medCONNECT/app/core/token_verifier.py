@@ -0,0 +1,135 @@
+"""
+Local verification of Supabase Auth access tokens
+"""
+from typing import Optional, Dict, Any
+import hashlib
+import time
+import httpx
+from fastapi.concurrency import run_in_threadpool
+from jose import jwt, JWTError
+from app.core.config import settings
+from app.core.exceptions import UnauthorizedError
+from app.db.supabase import supabase_client
+from loguru import logger
+
+HMAC_ALGORITHMS = {"HS256", "HS384", "HS512"}
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512"}
+
+# Upper bound on remembered revocation checks before the oldest are dropped
+MAX_REVOCATION_ENTRIES = 10000
+
+
+class SupabaseTokenVerifier:
+    """Verify Supabase access tokens without a round trip to Supabase Auth
+
+    HS256 tokens are checked against ``SUPABASE_JWT_SECRET``; asymmetric tokens
+    against the project's JWKS, which is cached and refetched when it expires or
+    an unknown ``kid`` shows up (key rotation). When no key material is available
+    the verifier falls back to ``auth.get_user``.
+    """
+
+    def __init__(self):
+        self._jwks: Dict[str, Dict[str, Any]] = {}
+        self._jwks_fetched_at: float = 0.0
+        self._revocation_checked_at: Dict[str, float] = {}
+
+    @property
+    def _jwks_url(self) -> str:
+        return f"{settings.SUPABASE_URL.strip().rstrip('/')}/auth/v1/.well-known/jwks.json"
+
+    async def _refresh_jwks(self, force: bool = False) -> None:
+        """Fetch the JWKS if the cache is stale (or on rotation, rate limited)"""
+        age = time.monotonic() - self._jwks_fetched_at
+        if self._jwks and not force and age < settings.SUPABASE_JWKS_CACHE_TTL:
+            return
+        if force and age < settings.SUPABASE_JWKS_MIN_REFRESH_INTERVAL:
+            return
+        if not settings.SUPABASE_URL:
+            return
+
+        try:
+            async with httpx.AsyncClient(timeout=settings.SUPABASE_HTTP_TIMEOUT) as client:
+                response = await client.get(
+                    self._jwks_url,
+                    headers={"apikey": settings.SUPABASE_KEY or settings.SUPABASE_SERVICE_ROLE_KEY}
+                )
+                response.raise_for_status()
+                keys = response.json().get("keys", [])
+            self._jwks = {key.get("kid", ""): key for key in keys}
+            logger.info(f"Loaded {len(self._jwks)} signing key(s) from Supabase JWKS")
+        except Exception as e:
+            logger.error(f"Failed to fetch Supabase JWKS: {e}")
+        finally:
+            self._jwks_fetched_at = time.monotonic()
+
+    async def _get_signing_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the JWK for ``kid``, refetching once if it is unknown"""
+        await self._refresh_jwks()
+        key = self._jwks.get(kid or "")
+        if key is None:
+            await self._refresh_jwks(force=True)
+            key = self._jwks.get(kid or "")
+        return key
+
+    async def _verify_remote(self, token: str) -> Dict[str, Any]:
+        """Verify via Supabase Auth (used when no local key material exists)"""
+        client = supabase_client.get_client()
+        user_response = await run_in_threadpool(client.auth.get_user, token)
+        if not user_response.user:
+            raise UnauthorizedError("Invalid authentication credentials")
+        return {"sub": user_response.user.id}
+
+    async def _check_revocation(self, token: str) -> None:
+        """Confirm with Supabase Auth that the session is still live, at most once per interval"""
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        now = time.monotonic()
+        checked_at = self._revocation_checked_at.get(token_hash)
+        if checked_at is not None and now - checked_at < settings.SUPABASE_REVOCATION_CHECK_INTERVAL:
+            return
+
+        await self._verify_remote(token)
+
+        if len(self._revocation_checked_at) >= MAX_REVOCATION_ENTRIES:
+            self._revocation_checked_at.pop(next(iter(self._revocation_checked_at)))
+        self._revocation_checked_at.pop(token_hash, None)
+        self._revocation_checked_at[token_hash] = now
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """Verify signature, ``exp`` and ``aud`` and return the token claims"""
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError:
+            raise UnauthorizedError("Invalid authentication credentials")
+
+        algorithm = header.get("alg", "")
+        if algorithm in HMAC_ALGORITHMS:
+            key = settings.SUPABASE_JWT_SECRET or None
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            key = await self._get_signing_key(header.get("kid"))
+        else:
+            raise UnauthorizedError("Unsupported token algorithm")
+
+        if key is None:
+            # No secret/JWKS configured: fall back to asking Supabase Auth
+            return await self._verify_remote(token)
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=settings.SUPABASE_JWT_AUDIENCE,
+                options={"require_exp": True, "require_sub": True, "leeway": settings.SUPABASE_JWT_LEEWAY}
+            )
+        except JWTError as e:
+            logger.debug(f"Token rejected: {e}")
+            raise UnauthorizedError("Invalid authentication credentials")
+
+        if settings.SUPABASE_TOKEN_REVOCATION_CHECK:
+            await self._check_revocation(token)
+
+        return claims
+
+
+# Global instance
+token_verifier = SupabaseTokenVerifier()
@@ -0,0 +1,18 @@
+"""
+Database backends selectable with DATABASE_BACKEND
+"""
+from app.core.config import settings
+
+BACKENDS = ("supabase", "memory", "sqlite")
+
+
+def create_local_backend(name: str):
+    """Construct a network-free backend by name ("memory" or "sqlite")"""
+    # Imported lazily: the local backends import app.db.supabase, which imports this package
+    if name == "memory":
+        from app.db.backends.memory import MemoryBackend
+        return MemoryBackend()
+    if name == "sqlite":
+        from app.db.backends.sqlite import SQLiteBackend
+        return SQLiteBackend(settings.SQLITE_DATABASE_PATH)
+    raise ValueError(f"Unknown DATABASE_BACKEND {name!r}; expected one of {', '.join(BACKENDS)}")
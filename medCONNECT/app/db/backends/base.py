@@ -0,0 +1,285 @@
+"""
+Database backend interface shared by Supabase and the local backends
+"""
+from typing import Optional, Dict, Any, List, Tuple
+import base64
+import json
+import time
+from postgrest.exceptions import APIError
+from app.core.config import settings
+from loguru import logger
+
+# Postgres function installed by migration_add_governance_aggregates.sql
+AGGREGATE_FUNCTION = "medconnect_aggregate"
+
+# PostgREST error codes for a function that is not installed
+RPC_NOT_FOUND_CODES = ("PGRST202", "42883")
+
+# Keyset pagination order: newest first, id breaking created_at ties
+PAGE_ORDER = "created_at.desc,id.desc"
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past ``row`` in PAGE_ORDER"""
+    payload = json.dumps([str(row["created_at"]), str(row["id"])], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """(created_at, id) from a cursor; raises ValueError if it is malformed"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+    if not (isinstance(payload, list) and len(payload) == 2 and all(isinstance(v, str) for v in payload)):
+        raise ValueError("Invalid pagination cursor")
+    return payload[0], payload[1]
+
+
+class DatabaseBackend:
+    """Async table, RPC and storage API used by every repository
+    
+    Backends implement ``select``/``insert_many``/``update``/``delete``/``count``,
+    ``rpc`` and the storage methods; ``select_one``, ``insert``,
+    ``rpc_if_available`` and ``aggregate`` are built on top of them. Filters use
+    the dict syntax documented on ``_build_filter_params`` in app.db.supabase.
+    """
+    
+    def __init__(self):
+        self.missing_functions: Dict[str, float] = {}  # function -> monotonic time to probe again
+    
+    async def close(self) -> None:
+        """Release connections"""
+        pass
+    
+    # Generic CRUD operations
+    
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Select data from a table"""
+        raise NotImplementedError
+    
+    async def select_one(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Select a single record"""
+        results = await self.select(table, filters=filters, limit=1)
+        return results[0] if results else None
+    
+    async def insert(
+        self,
+        table: str,
+        data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Insert a record"""
+        rows = await self.insert_many(table, [data])
+        return rows[0] if rows else {}
+    
+    async def insert_many(
+        self,
+        table: str,
+        data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Insert multiple records"""
+        raise NotImplementedError
+    
+    async def update(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        filters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Update records; returns the first updated row"""
+        raise NotImplementedError
+    
+    async def delete(
+        self,
+        table: str,
+        filters: Dict[str, Any]
+    ) -> bool:
+        """Delete records"""
+        raise NotImplementedError
+    
+    async def count(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Count records"""
+        raise NotImplementedError
+    
+    async def select_page(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One keyset page, newest first by (created_at, id); returns (rows, next_cursor)
+        
+        The cursor becomes a ``(created_at, id) < cursor`` condition, so deep pages
+        cost the same as the first. ``next_cursor`` is ``None`` on the last page.
+        """
+        limit = min(limit or settings.PAGE_SIZE_DEFAULT, settings.PAGE_SIZE_MAX)
+        if columns != "*":
+            selected = [c.strip() for c in columns.split(",")]
+            columns = ",".join(dict.fromkeys(selected + ["created_at", "id"]))
+        page_filters = dict(filters or {})
+        if cursor:
+            created_at, row_id = decode_cursor(cursor)
+            page_filters["and"] = [*page_filters.get("and", []), {"or": [
+                {"created_at": {"lt": created_at}},
+                {"created_at": created_at, "id": {"lt": row_id}}
+            ]}]
+        
+        # One extra row tells whether another page exists
+        rows = await self.select(table, columns=columns, filters=page_filters, order_by=PAGE_ORDER, limit=limit + 1)
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
+    
+    async def rpc(
+        self,
+        function: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Call a database function; raises APIError (PGRST202) if it does not exist"""
+        raise NotImplementedError
+    
+    async def rpc_if_available(
+        self,
+        function: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Optional[Any]:
+        """Call an optional migration-provided function; ``None`` if it is not installed
+        
+        A missing function is remembered so later calls skip the round trip, and
+        probed again after OPTIONAL_SCHEMA_RECHECK_INTERVAL so a migration applied
+        after deploy is picked up without a restart.
+        """
+        if self.missing_functions.get(function, 0.0) > time.monotonic():
+            return None
+        try:
+            result = await self.rpc(function, params) or []
+        except APIError as e:
+            if e.code not in RPC_NOT_FOUND_CODES:
+                raise
+            self.missing_functions[function] = time.monotonic() + settings.OPTIONAL_SCHEMA_RECHECK_INTERVAL
+            logger.warning(
+                f"{function}() not found; computing client-side. "
+                "Apply migration_add_governance_aggregates.sql and migration_update_governance_aggregates.sql "
+                "to enable server-side aggregates."
+            )
+            return None
+        self.missing_functions.pop(function, None)
+        return result
+    
+    async def aggregate(
+        self,
+        table: str,
+        group_by: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        avg_column: Optional[str] = None,
+        distinct_column: Optional[str] = None,
+        sum_column: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Grouped COUNT/SUM/AVG/COUNT(DISTINCT) computed in Postgres
+        
+        Returns one ``{group_key, row_count, avg_value, distinct_count, sum_value, value_count}``
+        dict per group; ``value_count`` counts non-null ``sum_column`` values, so
+        ``sum_value / value_count`` matches AVG even when the column has NULLs. Filters support equality, ``None`` and ``{gt|gte|lt|lte|eq|neq: value}``.
+        Falls back to fetching only the needed columns when the
+        ``medconnect_aggregate`` function is not installed.
+        """
+        groups = await self.rpc_if_available(AGGREGATE_FUNCTION, {
+            "p_table": table,
+            "p_group_by": group_by,
+            "p_filters": filters or {},
+            "p_avg_column": avg_column,
+            "p_distinct_column": distinct_column,
+            "p_sum_column": sum_column
+        })
+        if groups is not None:
+            return groups
+        
+        columns = ",".join(dict.fromkeys(c for c in (group_by, avg_column, distinct_column, sum_column) if c)) or "id"
+        rows = await self.select(table, columns=columns, filters=filters)
+        return _aggregate_rows(rows, group_by, avg_column, distinct_column, sum_column)
+    
+    # Storage operations
+    
+    async def upload_file(
+        self,
+        bucket: str,
+        path: str,
+        file_data: bytes,
+        content_type: str = "application/octet-stream"
+    ) -> Any:
+        """Upload a file to storage"""
+        raise NotImplementedError
+    
+    async def get_file_url(
+        self,
+        bucket: str,
+        path: str,
+        expires_in: int = 3600
+    ) -> str:
+        """Get a signed URL for a file"""
+        raise NotImplementedError
+    
+    async def delete_file(
+        self,
+        bucket: str,
+        path: str
+    ) -> bool:
+        """Delete a file from storage"""
+        raise NotImplementedError
+
+
+def _aggregate_rows(
+    rows: List[Dict[str, Any]],
+    group_by: Optional[str],
+    avg_column: Optional[str],
+    distinct_column: Optional[str],
+    sum_column: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Client-side equivalent of the ``medconnect_aggregate`` SQL function"""
+    groups: Dict[Optional[str], Dict[str, Any]] = {}
+    for row in rows:
+        key = row.get(group_by) if group_by else None
+        key = None if key is None else str(key)
+        group = groups.setdefault(
+            key, {"count": 0, "sum": 0.0, "values": 0, "distinct": set(), "total": 0.0, "summed": 0}
+        )
+        group["count"] += 1
+        if sum_column and row.get(sum_column) is not None:
+            group["total"] += float(row[sum_column])
+            group["summed"] += 1
+        if avg_column and row.get(avg_column) is not None:
+            group["sum"] += float(row[avg_column])
+            group["values"] += 1
+        if distinct_column and row.get(distinct_column) is not None:
+            group["distinct"].add(row[distinct_column])
+
+    return [
+        {
+            "group_key": key,
+            "row_count": group["count"],
+            "avg_value": (group["sum"] / group["values"]) if avg_column and group["values"] else None,
+            "distinct_count": len(group["distinct"]) if distinct_column else None,
+            "sum_value": group["total"] if sum_column else None,
+            "value_count": group["summed"] if sum_column else None
+        }
+        for key, group in groups.items()
+    ]
@@ -0,0 +1,172 @@
+"""
+Behaviour shared by the network-free (memory / SQLite) backends
+"""
+from typing import Optional, Dict, Any, List, Tuple, Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, date, timezone
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+import inspect
+import json
+import time
+from postgrest.exceptions import APIError
+from app.core.config import settings
+from app.core.timing import span, DB
+from app.core.metrics import metrics
+from app.core.query_recorder import record_query
+from app.db.backends.base import DatabaseBackend
+from app.db.backends.schema import load_schema, ColumnDefault
+
+OrderTerm = Tuple[str, bool, bool]  # (column, descending, nulls_first)
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the non-JSON types repositories pass, the way the HTTP client would"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_json_value(value: Any) -> Any:
+    """Deep-copy ``value`` into plain JSON types, as a round trip to PostgREST would"""
+    return json.loads(json.dumps(value, default=_json_default))
+
+
+def api_error(code: str, message: str) -> APIError:
+    """APIError shaped like a PostgREST error response"""
+    return APIError({"code": code, "message": message, "details": None, "hint": None})
+
+
+def parse_order(order_by: Optional[str]) -> List[OrderTerm]:
+    """Parse PostgREST ``order`` ("col", "col.desc", "a.asc.nullsfirst,b")
+
+    Nulls sort last ascending and first descending, as in Postgres.
+    """
+    terms = []
+    for term in (order_by or "").split(","):
+        parts = term.strip().split(".")
+        if not parts[0]:
+            continue
+        descending = "desc" in parts[1:]
+        nulls_first = "nullsfirst" in parts[1:] or (descending and "nullslast" not in parts[1:])
+        terms.append((parts[0], descending, nulls_first))
+    return terms
+
+
+class LocalBackend(DatabaseBackend):
+    """Base for backends that run without a network
+    
+    Tables and column defaults come from DATABASE_SCHEMA_FILES; an undeclared
+    table or column raises the APIError PostgREST would (PGRST205 / 42703).
+    Database functions are Python callables added with ``register_function``;
+    any other function raises PGRST202, so repositories take their
+    client-side fallbacks exactly as against an unmigrated Supabase project.
+    """
+    
+    def __init__(self, schema_files: Optional[List[str]] = None):
+        super().__init__()
+        self.schema: Dict[str, Dict[str, ColumnDefault]] = load_schema(
+            settings.DATABASE_SCHEMA_FILES if schema_files is None else schema_files
+        )
+        self.functions: Dict[str, Callable[..., Any]] = {}
+    
+    def create_table(self, table: str, columns: Iterable[str] = ()) -> None:
+        """Declare a table not in the schema files (columns default to NULL)"""
+        declared = self.schema.setdefault(table, {})
+        for column in columns:
+            declared.setdefault(column, None)
+    
+    def register_function(self, name: str, function: Callable[..., Any]) -> None:
+        """Expose ``function(backend, **params)`` (sync or async) as an RPC"""
+        self.functions[name] = function
+        self.missing_functions.pop(name, None)
+    
+    def _columns(self, table: str) -> Dict[str, ColumnDefault]:
+        """Declared columns of ``table``; raises if the table does not exist"""
+        columns = self.schema.get(table)
+        if columns is None:
+            raise api_error("PGRST205", f"Could not find the table 'public.{table}' in the schema cache")
+        return columns
+    
+    def _check_columns(self, table: str, names: Iterable[str]) -> None:
+        """Raise for columns ``table`` does not declare"""
+        columns = self._columns(table)
+        if not columns:
+            return
+        for name in names:
+            if name not in columns:
+                raise api_error("42703", f"column {table}.{name} does not exist")
+    
+    def _filter_columns(self, filters: Optional[Dict[str, Any]]) -> Iterator[str]:
+        """Every column named in a filters dict, including inside or/and branches"""
+        for key, value in (filters or {}).items():
+            if key in ("or", "and"):
+                for branch in value:
+                    yield from self._filter_columns(branch)
+            else:
+                yield key
+    
+    def _projection(self, table: str, columns: str) -> Optional[List[str]]:
+        """Selected column names, ``None`` for ``*``"""
+        names = [c.strip() for c in columns.split(",") if c.strip()]
+        if not names or "*" in names:
+            return None
+        self._check_columns(table, names)
+        return names
+    
+    def _new_row(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Row with column defaults applied, as INSERT ... RETURNING * would produce"""
+        columns = self._columns(table)
+        row = to_json_value(data)
+        self._check_columns(table, row)
+        for column, default in columns.items():
+            if column not in row:
+                row[column] = default() if default else None
+        return row
+    
+    def _updated_values(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """SET values, touching updated_at like the schema's update triggers"""
+        values = to_json_value(data)
+        self._check_columns(table, values)
+        if "updated_at" in self._columns(table) and "updated_at" not in values:
+            values["updated_at"] = datetime.now(timezone.utc).isoformat()
+        return values
+    
+    @contextmanager
+    def _observe(self, table: str, operation: str, filters: Optional[Dict[str, Any]] = None) -> Iterator[None]:
+        """Record the call like AsyncSupabaseClient does (query recorder, span, metrics)"""
+        if filters:
+            # Imported here: app.db.supabase constructs the backend on import
+            from app.db.supabase import _build_filter_params
+            record_query(table, operation, _build_filter_params(filters))
+        else:
+            record_query(table, operation)
+        start = time.perf_counter()
+        with span(DB, f"{operation} {table}"):
+            yield
+        if metrics.enabled:
+            metrics.observe_query(table, operation, time.perf_counter() - start)
+    
+    async def rpc(
+        self,
+        function: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Call a registered Python function"""
+        handler = self.functions.get(function)
+        if handler is None:
+            raise api_error("PGRST202", f"Could not find the function public.{function} in the schema cache")
+        with self._observe(function, "rpc"):
+            result = handler(self, **(params or {}))
+            if inspect.isawaitable(result):
+                result = await result
+        return result
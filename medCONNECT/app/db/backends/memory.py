@@ -0,0 +1,270 @@
+"""
+In-memory database backend for tests, benchmarks and offline development
+"""
+from typing import Optional, Dict, Any, List, Tuple
+from functools import lru_cache
+import re
+from app.db.backends.local import LocalBackend, parse_order, api_error, to_json_value
+from app.db.supabase import FILTER_OPERATORS, LOGICAL_OPERATORS
+
+
+@lru_cache(maxsize=256)
+def _like_pattern(pattern: str, case_insensitive: bool) -> re.Pattern:
+    """Compile a LIKE pattern (``%``/``*`` any run, ``_`` one character)"""
+    regex = "".join(
+        ".*" if ch in "%*" else "." if ch == "_" else re.escape(ch)
+        for ch in pattern
+    )
+    return re.compile(f"^{regex}$", re.DOTALL | (re.IGNORECASE if case_insensitive else 0))
+
+
+def _coerce(operand: Any, stored: Any) -> Any:
+    """Cast a filter operand to the stored value's type, as Postgres casts literals"""
+    if operand is None or stored is None:
+        return operand
+    if isinstance(stored, bool):
+        return operand.lower() == "true" if isinstance(operand, str) else bool(operand)
+    if isinstance(stored, (int, float)) and isinstance(operand, str):
+        try:
+            return float(operand)
+        except ValueError:
+            return operand
+    if isinstance(stored, str) and not isinstance(operand, str):
+        operand = to_json_value(operand)
+        if isinstance(operand, bool):
+            return "true" if operand else "false"
+        return operand if isinstance(operand, str) else str(operand)
+    return operand
+
+
+def _compare(stored: Any, operator: str, operand: Any) -> Optional[bool]:
+    """Evaluate one condition with SQL three-valued logic (``None`` = unknown)"""
+    if operator == "is":
+        if operand is None or str(operand).lower() == "null":
+            return stored is None
+        target = operand if isinstance(operand, bool) else str(operand).lower() == "true"
+        return isinstance(stored, bool) and stored == target
+    if stored is None:
+        return None
+    if operator == "in":
+        return stored in [_coerce(value, stored) for value in operand if value is not None]
+    operand = _coerce(operand, stored)
+    if operand is None:
+        return None
+    if operator in ("like", "ilike"):
+        return _like_pattern(str(operand), operator == "ilike").match(str(stored)) is not None
+    try:
+        if operator == "eq":
+            return stored == operand
+        if operator == "neq":
+            return stored != operand
+        if operator == "gt":
+            return stored > operand
+        if operator == "gte":
+            return stored >= operand
+        if operator == "lt":
+            return stored < operand
+        if operator == "lte":
+            return stored <= operand
+    except TypeError:
+        return None
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+def _column_matches(stored: Any, value: Any) -> Optional[bool]:
+    """Evaluate one ``column: value`` filter entry (see ``_column_conditions``)"""
+    if isinstance(value, dict):
+        result: Optional[bool] = True
+        for operator, operand in value.items():
+            if operator == "not":
+                # Each negated condition is its own NOT (...) term, as PostgREST renders it
+                for negated_operator, negated_operand in operand.items():
+                    inner = _compare(stored, negated_operator, negated_operand)
+                    result = _and(result, None if inner is None else not inner)
+                continue
+            if operator not in FILTER_OPERATORS:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+            result = _and(result, _compare(stored, operator, operand))
+        return result
+    if isinstance(value, (list, tuple, set)):
+        return _compare(stored, "in", value)
+    if value is None:
+        return stored is None
+    return _compare(stored, "eq", value)
+
+
+def _and(left: Optional[bool], right: Optional[bool]) -> Optional[bool]:
+    """SQL AND"""
+    if left is False or right is False:
+        return False
+    if left is None or right is None:
+        return None
+    return True
+
+
+def _or(left: Optional[bool], right: Optional[bool]) -> Optional[bool]:
+    """SQL OR"""
+    if left is True or right is True:
+        return True
+    if left is None or right is None:
+        return None
+    return False
+
+
+def _evaluate(row: Dict[str, Any], filters: Dict[str, Any]) -> Optional[bool]:
+    """Evaluate a filters dict against a row; rows match only when this is True"""
+    result: Optional[bool] = True
+    for key, value in filters.items():
+        if key in LOGICAL_OPERATORS:
+            combine, branch_result = (_or, False) if key == "or" else (_and, True)
+            for branch in value:
+                branch_result = combine(branch_result, _evaluate(row, branch))
+            result = _and(result, branch_result)
+        else:
+            result = _and(result, _column_matches(row.get(key), value))
+        if result is False:
+            return False
+    return result
+
+
+def _sort(rows: List[Dict[str, Any]], order_by: Optional[str]) -> List[Dict[str, Any]]:
+    """Sort rows by a PostgREST order expression (stable, one pass per term)"""
+    for column, descending, nulls_first in reversed(parse_order(order_by)):
+        present = [row for row in rows if row.get(column) is not None]
+        missing = [row for row in rows if row.get(column) is None]
+        present.sort(key=lambda row: row[column], reverse=descending)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+class MemoryBackend(LocalBackend):
+    """Tables held in process memory; data lasts as long as the process
+    
+    Semantics follow PostgREST: schema defaults on insert, first row returned
+    from update, NULL-aware filters and ordering.
+    """
+    
+    def __init__(self, schema_files: Optional[List[str]] = None):
+        super().__init__(schema_files)
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.files: Dict[Tuple[str, str], Tuple[bytes, str]] = {}
+    
+    def _rows(self, table: str) -> List[Dict[str, Any]]:
+        """Stored rows of ``table`` (raises if the table does not exist)"""
+        self._columns(table)
+        return self.tables.setdefault(table, [])
+    
+    def _matching(self, table: str, filters: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Stored rows matching ``filters``"""
+        rows = self._rows(table)
+        if not filters:
+            return list(rows)
+        self._check_columns(table, self._filter_columns(filters))
+        return [row for row in rows if _evaluate(row, filters) is True]
+    
+    def load(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        """Bulk-load rows without instrumentation (seeding); returns the number loaded"""
+        self._rows(table).extend(self._new_row(table, row) for row in rows)
+        return len(rows)
+    
+    # Generic CRUD operations
+    
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Select data from a table"""
+        with self._observe(table, "select", filters):
+            projection = self._projection(table, columns)
+            rows = self._matching(table, filters)
+            if order_by:
+                self._check_columns(table, (term[0] for term in parse_order(order_by)))
+                rows = _sort(rows, order_by)
+            start = offset or 0
+            rows = rows[start:start + limit] if limit else rows[start:]
+            if projection is None:
+                return [dict(row) for row in rows]
+            return [{column: row.get(column) for column in projection} for row in rows]
+    
+    async def insert_many(
+        self,
+        table: str,
+        data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Insert multiple records"""
+        with self._observe(table, "insert"):
+            rows = [self._new_row(table, record) for record in data]
+            self._rows(table).extend(rows)
+            return [dict(row) for row in rows]
+    
+    async def update(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        filters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Update records"""
+        with self._observe(table, "update", filters):
+            values = self._updated_values(table, data)
+            rows = self._matching(table, filters)
+            for row in rows:
+                row.update(values)
+            return dict(rows[0]) if rows else {}
+    
+    async def delete(
+        self,
+        table: str,
+        filters: Dict[str, Any]
+    ) -> bool:
+        """Delete records"""
+        with self._observe(table, "delete", filters):
+            doomed = {id(row) for row in self._matching(table, filters)}
+            self.tables[table] = [row for row in self._rows(table) if id(row) not in doomed]
+            return True
+    
+    async def count(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Count records"""
+        with self._observe(table, "count", filters):
+            return len(self._matching(table, filters))
+    
+    # Storage operations
+    
+    async def upload_file(
+        self,
+        bucket: str,
+        path: str,
+        file_data: bytes,
+        content_type: str = "application/octet-stream"
+    ) -> Dict[str, Any]:
+        """Store a file in memory"""
+        self.files[(bucket, path)] = (bytes(file_data), content_type)
+        return {"path": path, "Key": f"{bucket}/{path}"}
+    
+    async def get_file_url(
+        self,
+        bucket: str,
+        path: str,
+        expires_in: int = 3600
+    ) -> str:
+        """URL identifying a stored file"""
+        if (bucket, path) not in self.files:
+            raise api_error("404", f"Object not found: {bucket}/{path}")
+        return f"memory://{bucket}/{path}"
+    
+    async def delete_file(
+        self,
+        bucket: str,
+        path: str
+    ) -> bool:
+        """Delete a stored file"""
+        self.files.pop((bucket, path), None)
+        return True
@@ -0,0 +1,100 @@
+"""
+Table definitions for the local backends, read from the project's SQL files
+"""
+from typing import Optional, Dict, Any, Callable, List
+from datetime import datetime, date, timezone
+from pathlib import Path
+import re
+import uuid
+
+# medCONNECT/ (schema file paths are relative to it)
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+CREATE_TABLE_PATTERN = re.compile(r"CREATE TABLE(?: IF NOT EXISTS)?\s+(\w+)\s*\((.*?)\n\);", re.DOTALL | re.IGNORECASE)
+ALTER_TABLE_PATTERN = re.compile(r"ALTER TABLE\s+(\w+)\s+(.*?);", re.DOTALL | re.IGNORECASE)
+ADD_COLUMN_PATTERN = re.compile(r"ADD COLUMN(?: IF NOT EXISTS)?\s+(\w+)\s+([^,]*)", re.IGNORECASE)
+DEFAULT_PATTERN = re.compile(r"\bDEFAULT\s+('(?:[^']|'')*'|\w+\(\)|[\w.+-]+)", re.IGNORECASE)
+
+# Body lines that declare constraints rather than columns
+CONSTRAINT_KEYWORDS = ("UNIQUE", "PRIMARY", "CHECK", "FOREIGN", "CONSTRAINT", "EXCLUDE")
+
+ColumnDefault = Optional[Callable[[], Any]]
+
+
+def _now() -> str:
+    """Current UTC timestamp as Postgres would return it"""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _default_factory(expression: str, column_type: str) -> ColumnDefault:
+    """Python factory for a column DEFAULT expression (``None`` when there is none)"""
+    expression = expression.split("::", 1)[0]
+    lowered = expression.lower()
+    if lowered in ("uuid_generate_v4()", "gen_random_uuid()"):
+        return lambda: str(uuid.uuid4())
+    if lowered in ("now()", "current_timestamp"):
+        return _now
+    if lowered == "current_date":
+        return lambda: date.today().isoformat()
+    if lowered in ("true", "false"):
+        value = lowered == "true"
+        return lambda: value
+    if lowered == "null":
+        return None
+    if expression.startswith("'"):
+        text = expression[1:-1].replace("''", "'")
+        if text == "{}":
+            # '{}' is an empty array for array types and an empty object for JSONB
+            return list if column_type.endswith("[]") else dict
+        return lambda: text
+    try:
+        number = int(expression)
+    except ValueError:
+        try:
+            number = float(expression)
+        except ValueError:
+            return None
+    return lambda: number
+
+
+def _parse_column(definition: str) -> Optional[tuple]:
+    """(name, default factory) for one column definition, ``None`` for constraints"""
+    definition = definition.split("--", 1)[0].strip().rstrip(",")
+    parts = definition.split()
+    if len(parts) < 2 or re.match(r"\w*", parts[0]).group().upper() in CONSTRAINT_KEYWORDS:
+        return None
+    name, column_type = parts[0], parts[1].upper()
+    default = DEFAULT_PATTERN.search(definition)
+    return name, _default_factory(default.group(1), column_type) if default else None
+
+
+def load_schema(files: List[str]) -> Dict[str, Dict[str, ColumnDefault]]:
+    """Map table -> column -> default factory from CREATE/ALTER TABLE statements
+
+    Only columns and simple defaults are read; constraints, triggers and
+    functions are ignored. Files missing on disk are skipped.
+    """
+    tables: Dict[str, Dict[str, ColumnDefault]] = {}
+    for file in files:
+        path = Path(file)
+        if not path.is_absolute():
+            path = PROJECT_ROOT / path
+        if not path.exists():
+            continue
+        sql = path.read_text(encoding="utf-8")
+
+        for table, body in CREATE_TABLE_PATTERN.findall(sql):
+            columns = tables.setdefault(table, {})
+            for line in body.split("\n"):
+                column = _parse_column(line)
+                if column:
+                    columns[column[0]] = column[1]
+
+        for table, body in ALTER_TABLE_PATTERN.findall(sql):
+            if table not in tables:
+                continue
+            for name, definition in ADD_COLUMN_PATTERN.findall(body):
+                column = _parse_column(f"{name} {definition}")
+                if column:
+                    tables[table][column[0]] = column[1]
+    return tables
@@ -0,0 +1,271 @@
+"""
+SQLite database backend: a persistent local file, no server required
+"""
+from typing import Optional, Dict, Any, List, Tuple
+import json
+import sqlite3
+from app.db.backends.local import LocalBackend, parse_order, api_error, to_json_value
+from app.db.supabase import FILTER_OPERATORS, LOGICAL_OPERATORS
+
+COMPARISON_SQL = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+STORAGE_TABLE = "_storage_objects"
+
+
+def _sql_value(value: Any) -> Any:
+    """Bind parameter for a filter operand (JSON booleans extract as 0/1)"""
+    value = to_json_value(value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _column(name: str) -> str:
+    """json_extract() expression for a column (names are validated against the schema first)"""
+    return f"json_extract(doc, '$.\"{name}\"')"
+
+
+def _like_operand(pattern: Any) -> str:
+    """PostgREST accepts ``*`` as a LIKE wildcard"""
+    return str(pattern).replace("*", "%")
+
+
+def _condition(name: str, operator: str, operand: Any, params: List[Any]) -> str:
+    """SQL for one ``column operator operand`` condition"""
+    column = _column(name)
+    if operator == "is":
+        if operand is None or str(operand).lower() == "null":
+            return f"{column} IS NULL"
+        target = operand if isinstance(operand, bool) else str(operand).lower() == "true"
+        return f"{column} IS {1 if target else 0}"
+    if operator == "in":
+        values = [v for v in operand if v is not None]
+        if not values:
+            return "0"
+        params.extend(_sql_value(v) for v in values)
+        return f"{column} IN ({', '.join('?' for _ in values)})"
+    if operator == "like":
+        params.append(_like_operand(operand))
+        return f"{column} LIKE ?"
+    if operator == "ilike":
+        params.append(_like_operand(operand))
+        return f"LOWER({column}) LIKE LOWER(?)"
+    if operator in COMPARISON_SQL:
+        params.append(_sql_value(operand))
+        return f"{column} {COMPARISON_SQL[operator]} ?"
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+def _column_sql(name: str, value: Any, params: List[Any]) -> List[str]:
+    """SQL conditions for one ``column: value`` filter entry (see ``_column_conditions``)"""
+    if isinstance(value, dict):
+        conditions = []
+        for operator, operand in value.items():
+            if operator == "not":
+                conditions.extend(f"NOT ({c})" for c in _column_sql(name, operand, params))
+                continue
+            if operator not in FILTER_OPERATORS:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+            conditions.append(_condition(name, operator, operand, params))
+        return conditions
+    if isinstance(value, (list, tuple, set)):
+        return [_condition(name, "in", value, params)]
+    if value is None:
+        return [_condition(name, "is", None, params)]
+    return [_condition(name, "eq", value, params)]
+
+
+def _where(filters: Optional[Dict[str, Any]], params: List[Any]) -> str:
+    """SQL boolean expression for a filters dict"""
+    conditions = []
+    for key, value in (filters or {}).items():
+        if key in LOGICAL_OPERATORS:
+            joiner = " OR " if key == "or" else " AND "
+            branches = [f"({_where(branch, params)})" for branch in value]
+            conditions.append(f"({joiner.join(branches) or ('0' if key == 'or' else '1')})")
+        else:
+            conditions.extend(_column_sql(key, value, params))
+    return " AND ".join(conditions) or "1"
+
+
+def _order(order_by: Optional[str]) -> str:
+    """ORDER BY clause for a PostgREST order expression"""
+    terms = [
+        f"{_column(column)} {'DESC' if descending else 'ASC'} NULLS {'FIRST' if nulls_first else 'LAST'}"
+        for column, descending, nulls_first in parse_order(order_by)
+    ]
+    return f" ORDER BY {', '.join(terms)}" if terms else ""
+
+
+class SQLiteBackend(LocalBackend):
+    """Rows stored as JSON documents in a SQLite file, filtered and sorted in SQL
+    
+    Each table is ``(rowid, doc)``; filters compile to ``json_extract``
+    conditions. Calls run synchronously on the event loop, which is fine
+    for a local file. Use ``":memory:"`` for a throwaway database.
+    """
+    
+    def __init__(self, path: str, schema_files: Optional[List[str]] = None):
+        super().__init__(schema_files)
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA case_sensitive_like=ON")
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {STORAGE_TABLE} "
+            "(bucket TEXT, path TEXT, content_type TEXT, data BLOB, PRIMARY KEY (bucket, path))"
+        )
+        self._created: set = set()
+    
+    async def close(self) -> None:
+        """Close the database file"""
+        self.connection.close()
+    
+    def _table(self, table: str) -> str:
+        """Quoted SQLite table name, creating the table on first use"""
+        self._columns(table)
+        if table not in self._created:
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (doc TEXT NOT NULL)')
+            self._created.add(table)
+        return f'"{table}"'
+    
+    def _query(self, table: str, filters: Optional[Dict[str, Any]]) -> Tuple[str, str, List[Any]]:
+        """(quoted table, WHERE expression, parameters) for a filtered statement"""
+        quoted = self._table(table)
+        self._check_columns(table, self._filter_columns(filters))
+        params: List[Any] = []
+        return quoted, _where(filters, params), params
+    
+    def load(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        """Bulk-load rows without instrumentation (seeding); returns the number loaded"""
+        quoted = self._table(table)
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO {quoted} (doc) VALUES (?)",
+                ((json.dumps(self._new_row(table, row)),) for row in rows)
+            )
+        return len(rows)
+    
+    # Generic CRUD operations
+    
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Select data from a table"""
+        with self._observe(table, "select", filters):
+            projection = self._projection(table, columns)
+            quoted, where, params = self._query(table, filters)
+            if order_by:
+                self._check_columns(table, (term[0] for term in parse_order(order_by)))
+            sql = f"SELECT doc FROM {quoted} WHERE {where}{_order(order_by)}"
+            if limit or offset:
+                sql += " LIMIT ? OFFSET ?"
+                params += [limit if limit else -1, offset or 0]
+            rows = [json.loads(doc) for (doc,) in self.connection.execute(sql, params)]
+            if projection is None:
+                return rows
+            return [{column: row.get(column) for column in projection} for row in rows]
+    
+    async def insert_many(
+        self,
+        table: str,
+        data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Insert multiple records"""
+        with self._observe(table, "insert"):
+            quoted = self._table(table)
+            rows = [self._new_row(table, record) for record in data]
+            with self.connection:
+                self.connection.executemany(
+                    f"INSERT INTO {quoted} (doc) VALUES (?)",
+                    ((json.dumps(row),) for row in rows)
+                )
+            return rows
+    
+    async def update(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        filters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Update records"""
+        with self._observe(table, "update", filters):
+            values = self._updated_values(table, data)
+            quoted, where, params = self._query(table, filters)
+            matches = self.connection.execute(f"SELECT rowid, doc FROM {quoted} WHERE {where}", params).fetchall()
+            updated = []
+            for rowid, doc in matches:
+                row = {**json.loads(doc), **values}
+                updated.append((json.dumps(row), rowid))
+            with self.connection:
+                self.connection.executemany(f"UPDATE {quoted} SET doc = ? WHERE rowid = ?", updated)
+            return json.loads(updated[0][0]) if updated else {}
+    
+    async def delete(
+        self,
+        table: str,
+        filters: Dict[str, Any]
+    ) -> bool:
+        """Delete records"""
+        with self._observe(table, "delete", filters):
+            quoted, where, params = self._query(table, filters)
+            with self.connection:
+                self.connection.execute(f"DELETE FROM {quoted} WHERE {where}", params)
+            return True
+    
+    async def count(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Count records"""
+        with self._observe(table, "count", filters):
+            quoted, where, params = self._query(table, filters)
+            return self.connection.execute(f"SELECT COUNT(*) FROM {quoted} WHERE {where}", params).fetchone()[0]
+    
+    # Storage operations
+    
+    async def upload_file(
+        self,
+        bucket: str,
+        path: str,
+        file_data: bytes,
+        content_type: str = "application/octet-stream"
+    ) -> Dict[str, Any]:
+        """Store a file in the database"""
+        with self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO {STORAGE_TABLE} (bucket, path, content_type, data) VALUES (?, ?, ?, ?)",
+                (bucket, path, content_type, bytes(file_data))
+            )
+        return {"path": path, "Key": f"{bucket}/{path}"}
+    
+    async def get_file_url(
+        self,
+        bucket: str,
+        path: str,
+        expires_in: int = 3600
+    ) -> str:
+        """URL identifying a stored file"""
+        found = self.connection.execute(
+            f"SELECT 1 FROM {STORAGE_TABLE} WHERE bucket = ? AND path = ?", (bucket, path)
+        ).fetchone()
+        if not found:
+            raise api_error("404", f"Object not found: {bucket}/{path}")
+        return f"sqlite://{bucket}/{path}"
+    
+    async def delete_file(
+        self,
+        bucket: str,
+        path: str
+    ) -> bool:
+        """Delete a stored file"""
+        with self.connection:
+            self.connection.execute(f"DELETE FROM {STORAGE_TABLE} WHERE bucket = ? AND path = ?", (bucket, path))
+        return True
@@ -0,0 +1,237 @@
+"""
+In-process and Redis-backed caches
+"""
+from typing import Optional, Any, Awaitable, Callable, Dict, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import uuid
+from app.core.config import settings
+from app.db.redis_client import redis_client, async_redis_client
+from loguru import logger
+
+
+class LocalTTLCache:
+    """Bounded, thread-safe LRU cache whose entries expire after ``ttl`` seconds"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a live entry, refreshing its LRU position"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Drop an entry if present"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class UserProfileCache:
+    """Two-tier cache for ``users`` rows keyed by user id
+
+    Reads hit the in-process tier first, then Redis. Invalidations are
+    broadcast over Redis pub/sub so every worker drops its local copy.
+    Only ``FIELDS`` are cached, so credentials never reach Redis.
+    """
+
+    KEY_PREFIX = "user_profile:"
+    CHANNEL = "medconnect:invalidate:user_profile"
+    FIELDS = ("id", "email", "full_name", "phone", "role", "college_id", "is_active", "created_at", "updated_at")
+
+    def __init__(self):
+        self.local = LocalTTLCache(settings.USER_PROFILE_CACHE_SIZE, settings.USER_PROFILE_CACHE_TTL)
+        self._pubsub = None
+        self._listener = None
+
+    async def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a cached profile (a copy, so callers may mutate it)"""
+        user_id = str(user_id)
+        profile = self.local.get(user_id)
+        if profile is None:
+            profile = await async_redis_client.get(f"{self.KEY_PREFIX}{user_id}")
+            if profile is None:
+                return None
+            self.local.set(user_id, profile)
+        return dict(profile)
+
+    async def set(self, user_id: str, profile: Dict[str, Any]) -> None:
+        """Cache a profile (projected to ``FIELDS``) in both tiers"""
+        user_id = str(user_id)
+        profile = {field: profile[field] for field in self.FIELDS if field in profile}
+        self.local.set(user_id, profile)
+        await async_redis_client.set(f"{self.KEY_PREFIX}{user_id}", profile, expire=settings.USER_PROFILE_REDIS_TTL)
+
+    async def invalidate(self, user_id: str) -> None:
+        """Drop a profile everywhere and tell other workers to do the same"""
+        user_id = str(user_id)
+        self.local.delete(user_id)
+        await async_redis_client.delete(f"{self.KEY_PREFIX}{user_id}")
+        await async_redis_client.publish(self.CHANNEL, user_id)
+
+    def _on_invalidate(self, message: Dict[str, Any]) -> None:
+        """Pub/sub handler: drop the local copy named in the message"""
+        try:
+            self.local.delete(str(json.loads(message["data"])))
+        except Exception as e:
+            logger.error(f"Invalid profile invalidation message: {e}")
+
+    def start_listener(self) -> None:
+        """Subscribe to invalidations from other workers (no-op without Redis)"""
+        client = redis_client.client
+        if client is None or self._listener is not None:
+            return
+        try:
+            self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{self.CHANNEL: self._on_invalidate})
+            self._listener = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            logger.info("User profile cache invalidation listener started")
+        except Exception as e:
+            logger.warning(f"Could not subscribe to profile invalidations: {e}")
+            self._pubsub = None
+            self._listener = None
+
+    def stop_listener(self) -> None:
+        """Stop the pub/sub listener thread"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+
+async def acquire_lock(key: str, timeout: int) -> Optional[str]:
+    """Take a Redis ``SET NX`` lock; returns the token that releases it, or None if it is held"""
+    token = uuid.uuid4().hex
+    return token if await async_redis_client.set_nx(key, token, timeout) else None
+
+
+async def release_lock(key: str, token: str) -> None:
+    """Release a lock only if ``token`` still holds it (it may have expired and been retaken)"""
+    await async_redis_client.delete_if_equals(key, token)
+
+
+class StaleWhileRevalidateCache:
+    """Redis response cache that serves stale entries while one worker refreshes
+    
+    Entries are fresh for ``ttl`` seconds and may be served for a further
+    ``stale_ttl`` seconds while a background task recomputes them. A Redis
+    ``SET NX`` lock ensures only one worker recomputes a key at a time; on a
+    cold miss other workers wait briefly for that result instead of piling on.
+    Without Redis every call simply computes.
+    """
+    
+    def __init__(self, namespace: str, ttl: int, stale_ttl: int, lock_timeout: int, wait: float):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.wait = wait
+        self._refreshing: Dict[str, asyncio.Task] = {}
+    
+    def make_key(self, *parts: Any, **params: Any) -> str:
+        """Build a cache key from positional parts and (sorted) parameters"""
+        key = ":".join(str(p) for p in (self.namespace,) + parts)
+        if params:
+            digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+            key = f"{key}:{digest}"
+        return key
+    
+    async def _store(self, key: str, value: Any) -> None:
+        await async_redis_client.set(key, {"value": value, "stored_at": time.time()}, expire=self.ttl + self.stale_ttl)
+    
+    async def _compute_and_store(self, key: str, compute: Callable[[], Awaitable[Any]], token: str) -> Any:
+        try:
+            value = await compute()
+            await self._store(key, value)
+            return value
+        finally:
+            await release_lock(f"{key}:lock", token)
+    
+    def _refresh_in_background(self, key: str, compute: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return  # this worker is already refreshing it
+        
+        async def refresh():
+            token = await acquire_lock(f"{key}:lock", self.lock_timeout)
+            if token is None:
+                return  # another worker is already refreshing
+            try:
+                await self._compute_and_store(key, compute, token)
+            except Exception as e:
+                logger.error(f"Background refresh of {key} failed: {e}")
+        
+        task = asyncio.create_task(refresh())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+    
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, int]:
+        """Return ``(value, age_seconds)``; ``compute`` must return JSON-serializable data"""
+        if async_redis_client.client is None:
+            return await compute(), 0
+        
+        entry = await async_redis_client.get(key)
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            if age >= self.ttl:
+                self._refresh_in_background(key, compute)
+            return entry["value"], int(age)
+        
+        # Cold miss: compute under the lock, or wait for the worker holding it
+        token = await acquire_lock(f"{key}:lock", self.lock_timeout)
+        if token is None:
+            deadline = time.monotonic() + self.wait
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+                entry = await async_redis_client.get(key)
+                if entry is not None:
+                    return entry["value"], int(time.time() - entry["stored_at"])
+            return await compute(), 0
+        return await self._compute_and_store(key, compute, token), 0
+
+
+# Global instances
+profile_cache = UserProfileCache()
+governance_cache = StaleWhileRevalidateCache(
+    "governance",
+    ttl=settings.GOVERNANCE_CACHE_TTL,
+    stale_ttl=settings.GOVERNANCE_CACHE_STALE_TTL,
+    lock_timeout=settings.GOVERNANCE_CACHE_LOCK_TIMEOUT,
+    wait=settings.GOVERNANCE_CACHE_WAIT
+)
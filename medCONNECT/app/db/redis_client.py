@@ -3,10 +3,22 @@ Redis client for caching and session management
 """
 from typing import Optional, Any
 import json
+import time
 import redis
+import redis.asyncio
 from app.core.config import settings
+from app.core.timing import record, CACHE_HIT, CACHE_MISS
+from app.core.metrics import metrics
 from loguru import logger
 
+# Compare-and-delete so a worker never releases a lock another worker now holds
+DELETE_IF_EQUALS_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 
 class RedisClient:
     """Redis client wrapper"""
@@ -44,7 +56,11 @@ class RedisClient:
             return None
         
         try:
+            start = time.perf_counter()
             value = self.client.get(key)
+            record(CACHE_HIT if value else CACHE_MISS, key, time.perf_counter() - start)
+            if metrics.enabled:
+                metrics.observe_cache(bool(value))
             if value:
                 return json.loads(value)
             return None
@@ -116,8 +132,115 @@ class RedisClient:
             return False
 
 
-# Global instance
+class AsyncRedisClient:
+    """Non-blocking Redis wrapper (redis.asyncio) for use inside request handlers
+    
+    Mirrors ``RedisClient``; disabled (every call a no-op) when Redis was
+    unreachable at startup, so a missing Redis never adds connect timeouts.
+    """
+    
+    def __init__(self, enabled: bool):
+        self.client: Optional[redis.asyncio.Redis] = None
+        if enabled:
+            self.client = redis.asyncio.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+                decode_responses=True
+            )
+    
+    async def close(self) -> None:
+        """Close pooled connections"""
+        if self.client is not None:
+            await self.client.close()
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from cache"""
+        if not self.client:
+            return None
+        
+        try:
+            start = time.perf_counter()
+            value = await self.client.get(key)
+            record(CACHE_HIT if value else CACHE_MISS, key, time.perf_counter() - start)
+            if metrics.enabled:
+                metrics.observe_cache(bool(value))
+            if value:
+                return json.loads(value)
+            return None
+        except Exception as e:
+            logger.error(f"Redis get error: {e}")
+            return None
+    
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        expire: Optional[int] = None
+    ) -> bool:
+        """Set value in cache"""
+        if not self.client:
+            return False
+        
+        try:
+            serialized = json.dumps(value)
+            if expire:
+                return bool(await self.client.setex(key, expire, serialized))
+            return bool(await self.client.set(key, serialized))
+        except Exception as e:
+            logger.error(f"Redis set error: {e}")
+            return False
+    
+    async def delete(self, key: str) -> bool:
+        """Delete key from cache"""
+        if not self.client:
+            return False
+        
+        try:
+            return bool(await self.client.delete(key))
+        except Exception as e:
+            logger.error(f"Redis delete error: {e}")
+            return False
+    
+    async def publish(self, channel: str, message: Any) -> bool:
+        """Publish a message to a pub/sub channel"""
+        if not self.client:
+            return False
+        
+        try:
+            await self.client.publish(channel, json.dumps(message))
+            return True
+        except Exception as e:
+            logger.error(f"Redis publish error: {e}")
+            return False
+    
+    async def set_nx(self, key: str, value: Any, expire: int) -> bool:
+        """Set a key only if it does not exist (used for locks)"""
+        if not self.client:
+            return False
+        
+        try:
+            return bool(await self.client.set(key, json.dumps(value), nx=True, ex=expire))
+        except Exception as e:
+            logger.error(f"Redis set_nx error: {e}")
+            return False
+    
+    async def delete_if_equals(self, key: str, value: Any) -> bool:
+        """Atomically delete a key only if it still holds ``value`` (lock release)"""
+        if not self.client:
+            return False
+        
+        try:
+            return bool(await self.client.eval(DELETE_IF_EQUALS_SCRIPT, 1, key, json.dumps(value)))
+        except Exception as e:
+            logger.error(f"Redis delete_if_equals error: {e}")
+            return False
+
+
+# Global instances
 redis_client = RedisClient()
+async_redis_client = AsyncRedisClient(enabled=redis_client.client is not None)
 
 
 
@@ -1,11 +1,36 @@
 """
 Supabase client integration
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from supabase import create_client, Client
+from postgrest.exceptions import APIError
+from postgrest.utils import sanitize_param
 from app.core.config import settings
+from app.core.timing import span, DB
+from app.core.metrics import metrics
+from app.core.query_recorder import record_query
+from app.db.backends.base import DatabaseBackend, AGGREGATE_FUNCTION, RPC_NOT_FOUND_CODES
+from fastapi.concurrency import run_in_threadpool
 from loguru import logger
 import httpx
+import functools
+import time
+
+
+def _instrumented(operation: str):
+    """Time ``method(self, table, ...)`` as a db span and, when enabled, a query metric"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, table, *args, **kwargs):
+            start = time.perf_counter()
+            with span(DB, f"{operation} {table}"):
+                result = func(self, table, *args, **kwargs)
+            if metrics.enabled:
+                rows = len(result) if isinstance(result, list) else None
+                metrics.observe_query(table, operation, time.perf_counter() - start, rows=rows)
+            return result
+        return wrapper
+    return decorator
 
 
 class SupabaseClient:
@@ -76,6 +101,7 @@ class SupabaseClient:
     
     # Generic CRUD operations
     
+    @_instrumented("select")
     def select(
         self,
         table: str,
@@ -90,12 +116,7 @@ class SupabaseClient:
             client = self.get_client()
             query = client.table(table).select(columns)
             
-            if filters:
-                for key, value in filters.items():
-                    if isinstance(value, list):
-                        query = query.in_(key, value)
-                    else:
-                        query = query.eq(key, value)
+            query = _apply_filters(query, filters)
             
             if order_by:
                 query = query.order(order_by)
@@ -121,6 +142,7 @@ class SupabaseClient:
         results = self.select(table, filters=filters, limit=1)
         return results[0] if results else None
     
+    @_instrumented("insert")
     def insert(
         self,
         table: str,
@@ -131,6 +153,7 @@ class SupabaseClient:
         response = client.table(table).insert(data).execute()
         return response.data[0] if response.data else {}
     
+    @_instrumented("insert")
     def insert_many(
         self,
         table: str,
@@ -141,6 +164,7 @@ class SupabaseClient:
         response = client.table(table).insert(data).execute()
         return response.data if response.data else []
     
+    @_instrumented("update")
     def update(
         self,
         table: str,
@@ -149,14 +173,12 @@ class SupabaseClient:
     ) -> Dict[str, Any]:
         """Update records"""
         client = self.get_client()
-        query = client.table(table).update(data)
-        
-        for key, value in filters.items():
-            query = query.eq(key, value)
+        query = _apply_filters(client.table(table).update(data), filters)
         
         response = query.execute()
         return response.data[0] if response.data else {}
     
+    @_instrumented("delete")
     def delete(
         self,
         table: str,
@@ -164,14 +186,12 @@ class SupabaseClient:
     ) -> bool:
         """Delete records"""
         client = self.get_client()
-        query = client.table(table).delete()
-        
-        for key, value in filters.items():
-            query = query.eq(key, value)
+        query = _apply_filters(client.table(table).delete(), filters)
         
         response = query.execute()
         return True
     
+    @_instrumented("count")
     def count(
         self,
         table: str,
@@ -179,15 +199,22 @@ class SupabaseClient:
     ) -> int:
         """Count records"""
         client = self.get_client()
-        query = client.table(table).select("*", count="exact")
-        
-        if filters:
-            for key, value in filters.items():
-                query = query.eq(key, value)
+        query = _apply_filters(client.table(table).select("*", count="exact"), filters)
         
         response = query.execute()
         return response.count if response.count else 0
     
+    @_instrumented("rpc")
+    def rpc(
+        self,
+        function: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Call a Postgres function exposed by PostgREST"""
+        client = self.get_client()
+        response = client.rpc(function, params or {}).execute()
+        return response.data
+    
     # Storage operations
     
     def upload_file(
@@ -231,8 +258,364 @@ class SupabaseClient:
         return True
 
 
-# Global instance
-supabase_client = SupabaseClient()
+def _format_filter_value(value: Any) -> str:
+    """Format a Python value as a PostgREST filter operand"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    return str(value)
+
+
+# Operators accepted in {"column": {"op": value}} filters
+FILTER_OPERATORS = ("eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "in", "is")
+
+# Keys that combine nested filter dicts instead of naming a column
+LOGICAL_OPERATORS = ("or", "and")
+
+
+def _format_operand(operator: str, value: Any, quote: bool = False) -> str:
+    """Render ``operator.value`` (quoting reserved characters inside groups)"""
+    if operator == "in":
+        values = ",".join(sanitize_param(_format_filter_value(v)) for v in value)
+        return f"in.({values})"
+    operand = _format_filter_value(value)
+    if quote and operator != "is":
+        operand = sanitize_param(operand)
+    return f"{operator}.{operand}"
+
+
+def _column_conditions(column: str, value: Any, quote: bool = False) -> List[Tuple[str, str]]:
+    """Expand one ``column: value`` filter entry into (column, "op.value") pairs
+    
+    Values may be a scalar (``eq``), a list (``in``), ``None`` (``is.null``) or
+    a dict of ``{operator: operand}``; ``{"not": {operator: operand}}`` negates.
+    """
+    if isinstance(value, dict):
+        conditions = []
+        for operator, operand in value.items():
+            if operator == "not":
+                conditions.extend(
+                    (column, f"not.{expression}")
+                    for _, expression in _column_conditions(column, operand, quote)
+                )
+                continue
+            if operator not in FILTER_OPERATORS:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+            conditions.append((column, _format_operand(operator, operand, quote)))
+        return conditions
+    if isinstance(value, (list, tuple, set)):
+        return [(column, _format_operand("in", value))]
+    if value is None:
+        return [(column, "is.null")]
+    return [(column, _format_operand("eq", value, quote))]
+
+
+def _render_group(filters: Dict[str, Any]) -> List[str]:
+    """Render a filters dict as PostgREST logic-tree terms (``col.op.value``)"""
+    terms = []
+    for key, value in filters.items():
+        if key in LOGICAL_OPERATORS:
+            terms.append(f"{key}({','.join(_render_branches(value))})")
+        else:
+            terms.extend(f"{column}.{expression}" for column, expression in _column_conditions(key, value, quote=True))
+    return terms
+
+
+def _render_branches(branches: List[Dict[str, Any]]) -> List[str]:
+    """Render each branch of an or/and group, wrapping multi-term branches in and()"""
+    rendered = []
+    for branch in branches:
+        terms = _render_group(branch)
+        rendered.append(terms[0] if len(terms) == 1 else f"and({','.join(terms)})")
+    return rendered
+
+
+def _build_filter_params(filters: Optional[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """Translate a filters dict into PostgREST query parameters
+    
+    ``{"or": [{...}, {...}]}`` matches rows satisfying any branch; conditions
+    within a branch are ANDed, e.g.
+    ``{"or": [{"status": "late"}, {"status": "absent", "remarks": None}]}``.
+    """
+    params: List[Tuple[str, str]] = []
+    if not filters:
+        return params
+    
+    for key, value in filters.items():
+        if key in LOGICAL_OPERATORS:
+            params.append((key, f"({','.join(_render_branches(value))})"))
+        else:
+            params.extend(_column_conditions(key, value))
+    return params
+
+
+def _apply_filters(query, filters: Optional[Dict[str, Any]]):
+    """Apply a filters dict to a postgrest-py request builder"""
+    for key, value in _build_filter_params(filters):
+        query.params = query.params.add(key, value)
+    return query
+
+
+# HTTP method -> operation name for timing spans and metrics
+REQUEST_OPERATIONS = {"GET": "select", "HEAD": "count", "POST": "insert", "PATCH": "update", "DELETE": "delete"}
+
+def _content_range_rows(content_range: Optional[str]) -> Optional[int]:
+    """Rows in a PostgREST read from its Content-Range ("0-24/*"; "*/*" when empty)"""
+    if not content_range:
+        return None
+    span_part = content_range.split("/", 1)[0]
+    if span_part == "*":
+        return 0
+    first, _, last = span_part.partition("-")
+    return int(last) - int(first) + 1 if first.isdigit() and last.isdigit() else None
+
+
+class AsyncSupabaseClient(DatabaseBackend):
+    """Async Supabase (PostgREST) client sharing one pooled httpx.AsyncClient
+    
+    Mirrors the CRUD API of ``SupabaseClient`` so repositories can ``await``
+    database I/O instead of blocking the event loop.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.client: Optional[httpx.AsyncClient] = None
+    
+    def _initialize(self):
+        """Create the pooled HTTP client"""
+        if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_ROLE_KEY:
+            return
+        
+        url = settings.SUPABASE_URL.strip().rstrip("/")
+        if not url.startswith(("http://", "https://")):
+            logger.error(f"Invalid SUPABASE_URL format. Must start with http:// or https://. Current value: {url[:50]}...")
+            if settings.APP_ENV == "production":
+                raise ValueError("Invalid SUPABASE_URL format")
+            return
+        
+        http2 = settings.SUPABASE_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 requested but 'h2' is not installed. Falling back to HTTP/1.1.")
+                http2 = False
+        
+        key = settings.SUPABASE_SERVICE_ROLE_KEY
+        self.client = httpx.AsyncClient(
+            base_url=f"{url}/rest/v1",
+            headers={
+                "apikey": key,
+                "Authorization": f"Bearer {key}",
+                "Accept": "application/json",
+            },
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.SUPABASE_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPABASE_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=settings.SUPABASE_KEEPALIVE_EXPIRY,
+            ),
+            timeout=settings.SUPABASE_HTTP_TIMEOUT,
+        )
+        logger.info(f"Async Supabase client initialized (http2={http2}, max_connections={settings.SUPABASE_POOL_MAX_CONNECTIONS})")
+    
+    def get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use"""
+        if self.client is None:
+            self._initialize()
+        if self.client is None:
+            error_msg = (
+                "Supabase client not initialized. Please configure SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY in .env file. "
+                f"Current SUPABASE_URL: {'Set' if settings.SUPABASE_URL else 'Not set'}"
+            )
+            raise ValueError(error_msg)
+        return self.client
+    
+    async def close(self) -> None:
+        """Close pooled connections"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+    
+    async def _request(
+        self,
+        method: str,
+        table: str,
+        params: Optional[List[Tuple[str, str]]] = None,
+        json: Any = None,
+        prefer: Optional[str] = None
+    ) -> httpx.Response:
+        """Send a request to PostgREST and raise APIError on failure"""
+        client = self.get_client()
+        headers = {"Prefer": prefer} if prefer else None
+        if table.startswith("rpc/"):
+            operation, target = "rpc", table[len("rpc/"):]
+        else:
+            operation, target = REQUEST_OPERATIONS[method], table
+        record_query(target, operation, params, json if operation == "rpc" else None)
+        start = time.perf_counter()
+        with span(DB, f"{operation} {target}"):
+            response = await client.request(method, f"/{table}", params=params, json=json, headers=headers)
+        if metrics.enabled:
+            metrics.observe_query(
+                target,
+                operation,
+                time.perf_counter() - start,
+                rows=_content_range_rows(response.headers.get("content-range")) if method == "GET" else None,
+                payload_bytes=len(response.content)
+            )
+        if response.status_code >= 400:
+            try:
+                error = response.json()
+            except ValueError:
+                error = {"message": response.text, "code": str(response.status_code)}
+            raise APIError(error)
+        return response
+    
+    # Generic CRUD operations
+    
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Select data from a table"""
+        params = [("select", columns)] + _build_filter_params(filters)
+        if order_by:
+            params.append(("order", order_by))
+        if limit:
+            params.append(("limit", str(limit)))
+        if offset:
+            params.append(("offset", str(offset)))
+        
+        try:
+            response = await self._request("GET", table, params=params)
+            return response.json() or []
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.NetworkError) as e:
+            supabase_client._handle_connection_error(e, "select operation")
+            return []
+    
+    async def select_one(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Select a single record"""
+        results = await self.select(table, filters=filters, limit=1)
+        return results[0] if results else None
+    
+    async def insert(
+        self,
+        table: str,
+        data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Insert a record"""
+        response = await self._request("POST", table, json=data, prefer="return=representation")
+        rows = response.json()
+        return rows[0] if rows else {}
+    
+    async def insert_many(
+        self,
+        table: str,
+        data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Insert multiple records"""
+        response = await self._request("POST", table, json=data, prefer="return=representation")
+        return response.json() or []
+    
+    async def update(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        filters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Update records"""
+        response = await self._request(
+            "PATCH",
+            table,
+            params=_build_filter_params(filters),
+            json=data,
+            prefer="return=representation"
+        )
+        rows = response.json()
+        return rows[0] if rows else {}
+    
+    async def delete(
+        self,
+        table: str,
+        filters: Dict[str, Any]
+    ) -> bool:
+        """Delete records"""
+        await self._request("DELETE", table, params=_build_filter_params(filters))
+        return True
+    
+    async def count(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Count records without transferring rows"""
+        params = [("select", "*")] + _build_filter_params(filters)
+        response = await self._request("HEAD", table, params=params, prefer="count=exact")
+        # Content-Range looks like "0-24/3573" or "*/0"
+        content_range = response.headers.get("content-range", "")
+        total = content_range.rsplit("/", 1)[-1]
+        return int(total) if total.isdigit() else 0
+    
+    async def rpc(
+        self,
+        function: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Call a Postgres function exposed by PostgREST"""
+        response = await self._request("POST", f"rpc/{function}", json=params or {})
+        return response.json() if response.content else None
+    
+    # Storage operations
+    
+    async def upload_file(
+        self,
+        bucket: str,
+        path: str,
+        file_data: bytes,
+        content_type: str = "application/octet-stream"
+    ) -> Any:
+        """Upload a file to Supabase storage"""
+        return await run_in_threadpool(supabase_client.upload_file, bucket, path, file_data, content_type)
+    
+    async def get_file_url(
+        self,
+        bucket: str,
+        path: str,
+        expires_in: int = 3600
+    ) -> str:
+        """Get a signed URL for a file"""
+        return await run_in_threadpool(supabase_client.get_file_url, bucket, path, expires_in)
+    
+    async def delete_file(
+        self,
+        bucket: str,
+        path: str
+    ) -> bool:
+        """Delete a file from storage"""
+        return await run_in_threadpool(supabase_client.delete_file, bucket, path)
 
 
+def _create_async_client() -> DatabaseBackend:
+    """The async database client selected by DATABASE_BACKEND"""
+    if settings.DATABASE_BACKEND == "supabase":
+        return AsyncSupabaseClient()
+    # Imported here: the local backends reuse this module's filter helpers
+    from app.db.backends import create_local_backend
+    backend = create_local_backend(settings.DATABASE_BACKEND)
+    logger.info(f"Using the {settings.DATABASE_BACKEND} database backend")
+    return backend
 
+# Global instances
+supabase_client = SupabaseClient()
+async_supabase_client = _create_async_client()
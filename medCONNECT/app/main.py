@@ -1,11 +1,17 @@
 """
 Main FastAPI application
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.middleware import setup_cors, RequestIDMiddleware, TimingMiddleware
+from app.core.middleware import setup_cors, RequestIDMiddleware, TimingMiddleware, QueryBudgetMiddleware
+from app.core.timing import TimedJSONResponse
+from app.core.metrics import metrics, MetricsMiddleware
 from app.api.v1 import auth, users, academic, clinical, hostel, admin, governance, ai, colleges, notifications
+from app.db.supabase import async_supabase_client
+from app.db.redis_client import async_redis_client
+from app.db.cache import profile_cache
+from app.services.snapshot_service import snapshot_scheduler
 from loguru import logger
 import sys
 
@@ -23,15 +29,20 @@ app = FastAPI(
     description="Digital Medical Education Workflow System",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=TimedJSONResponse
 )
 
 # Setup CORS
 setup_cors(app)
 
 # Add middleware
+if settings.QUERY_RECORDER_ENABLED:
+    app.add_middleware(QueryBudgetMiddleware)
 app.add_middleware(RequestIDMiddleware)
 app.add_middleware(TimingMiddleware)
+if metrics.enabled:
+    app.add_middleware(MetricsMiddleware)
 
 # Include routers
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
@@ -52,6 +63,8 @@ async def startup_event():
     logger.info(f"Starting {settings.APP_NAME} in {settings.APP_ENV} mode")
     logger.info("Initializing database connections...")
     # Database connections are initialized on import
+    profile_cache.start_listener()
+    snapshot_scheduler.start()
     logger.info("Application startup complete")
 
 
@@ -59,6 +72,10 @@ async def startup_event():
 async def shutdown_event():
     """Shutdown event handler"""
     logger.info("Application shutdown initiated")
+    await snapshot_scheduler.stop()
+    profile_cache.stop_listener()
+    await async_supabase_client.close()
+    await async_redis_client.close()
 
 
 @app.get("/")
@@ -77,6 +94,14 @@ async def health_check():
     return {"status": "healthy"}
 
 
+if metrics.enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        """Prometheus scrape endpoint"""
+        payload, content_type = metrics.render()
+        return Response(content=payload, media_type=content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
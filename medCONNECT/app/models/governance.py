@@ -46,6 +46,7 @@ class DashboardMetrics(BaseModel):
     certificate_requests_pending: int
     upcoming_events: int
     department_wise_stats: Dict[str, Any] = Field(default_factory=dict)
+    college_totals: Dict[str, Any] = Field(default_factory=dict)  # additive counts merged by the state rollup
 
 
 class AttendanceAnalytics(BaseModel):
@@ -55,6 +56,8 @@ class AttendanceAnalytics(BaseModel):
     student_wise_attendance: Dict[str, float] = Field(default_factory=dict)
     attendance_trends: list = Field(default_factory=list)
     low_attendance_flags: list = Field(default_factory=list)
+    students_tracked: int = 0
+    students_flagged: int = 0
 
 
 class ClinicalExposureAnalytics(BaseModel):
@@ -68,12 +71,23 @@ class ClinicalExposureAnalytics(BaseModel):
 
 class AcademicPerformanceAnalytics(BaseModel):
     """Academic performance analytics model"""
-    module_completion_rates: Dict[str, float] = Field(default_factory=dict)
+    module_completion_rates: Dict[str, Dict[str, Any]] = Field(default_factory=dict)  # module_id -> {module, average_completion}
     student_progress_summary: Dict[str, Any] = Field(default_factory=dict)
     resource_engagement: Dict[str, Any] = Field(default_factory=dict)
     weak_areas_identified: list = Field(default_factory=list)
 
 
-
-
-
+class StateRollupAnalytics(BaseModel):
+    """State-wide (DME) rollup across colleges"""
+    total_colleges: int
+    colleges_included: int
+    total_students: int
+    total_faculty: int
+    overall_attendance_rate: float
+    total_cases_logged: int
+    verified_cases: int
+    posting_completion_rate: float
+    average_module_completion: float
+    students_with_progress: int
+    college_wise: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    colleges_failed: list = Field(default_factory=list)
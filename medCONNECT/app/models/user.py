@@ -1,7 +1,7 @@
 """
 User models and schemas
 """
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 from pydantic import BaseModel, EmailStr, Field
@@ -95,6 +95,9 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 
-
-
-
+class Principal(BaseModel):
+    """Authenticated caller, resolved once per request"""
+    user_id: UUID
+    college_id: UUID
+    role: UserRole
+    profile: Dict[str, Any] = Field(default_factory=dict)
@@ -1,9 +1,9 @@
 """
 Academic repository for database operations
 """
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
-from app.db.supabase import supabase_client
+from app.db.supabase import async_supabase_client
 from app.models.academic import (
     SubjectCreate, SubjectUpdate,
     CurriculumModuleCreate, CurriculumModuleUpdate,
@@ -20,40 +20,40 @@ class AcademicRepository:
     
     # Subjects
     @staticmethod
-    def create_subject(subject_data: SubjectCreate) -> dict:
+    async def create_subject(subject_data: SubjectCreate) -> dict:
         """Create a subject"""
         subject_dict = subject_data.model_dump()
         subject_dict["college_id"] = str(subject_dict["college_id"])
-        return supabase_client.insert("subjects", subject_dict)
+        return await async_supabase_client.insert("subjects", subject_dict)
     
     @staticmethod
-    def get_subject(subject_id: UUID) -> Optional[dict]:
+    async def get_subject(subject_id: UUID) -> Optional[dict]:
         """Get subject by ID"""
-        return supabase_client.select_one("subjects", filters={"id": str(subject_id)})
+        return await async_supabase_client.select_one("subjects", filters={"id": str(subject_id)})
     
     @staticmethod
-    def get_subjects_by_college(college_id: UUID, year: Optional[int] = None) -> List[dict]:
+    async def get_subjects_by_college(college_id: UUID, year: Optional[int] = None) -> List[dict]:
         """Get subjects for a college"""
         filters = {"college_id": str(college_id)}
         if year:
             filters["year"] = year
-        return supabase_client.select("subjects", filters=filters, order_by="name")
+        return await async_supabase_client.select("subjects", filters=filters, order_by="name")
     
     @staticmethod
-    def update_subject(subject_id: UUID, subject_data: SubjectUpdate) -> dict:
+    async def update_subject(subject_id: UUID, subject_data: SubjectUpdate) -> dict:
         """Update subject"""
         update_dict = subject_data.model_dump(exclude_unset=True)
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update("subjects", update_dict, filters={"id": str(subject_id)})
+        result = await async_supabase_client.update("subjects", update_dict, filters={"id": str(subject_id)})
         if not result:
             raise NotFoundError("Subject not found")
         return result
     
     # Curriculum Modules
     @staticmethod
-    def create_module(module_data: CurriculumModuleCreate) -> dict:
+    async def create_module(module_data: CurriculumModuleCreate) -> dict:
         """Create a curriculum module"""
         module_dict = module_data.model_dump()
         module_dict["subject_id"] = str(module_dict["subject_id"])
@@ -61,30 +61,30 @@ class AcademicRepository:
         # Ensure NMC fields are properly set
         if "nmc_competency_codes" in module_dict:
             module_dict["nmc_competency_codes"] = module_dict["nmc_competency_codes"] or []
-        return supabase_client.insert("curriculum_modules", module_dict)
+        return await async_supabase_client.insert("curriculum_modules", module_dict)
     
     @staticmethod
-    def get_module(module_id: UUID) -> Optional[dict]:
+    async def get_module(module_id: UUID) -> Optional[dict]:
         """Get module by ID"""
-        return supabase_client.select_one("curriculum_modules", filters={"id": str(module_id)})
+        return await async_supabase_client.select_one("curriculum_modules", filters={"id": str(module_id)})
     
     @staticmethod
-    def get_modules_by_subject(subject_id: UUID) -> List[dict]:
+    async def get_modules_by_subject(subject_id: UUID) -> List[dict]:
         """Get modules for a subject"""
-        return supabase_client.select(
+        return await async_supabase_client.select(
             "curriculum_modules",
             filters={"subject_id": str(subject_id)},
             order_by="module_number"
         )
     
     @staticmethod
-    def update_module(module_id: UUID, module_data: CurriculumModuleUpdate) -> dict:
+    async def update_module(module_id: UUID, module_data: CurriculumModuleUpdate) -> dict:
         """Update module"""
         update_dict = module_data.model_dump(exclude_unset=True)
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update(
+        result = await async_supabase_client.update(
             "curriculum_modules",
             update_dict,
             filters={"id": str(module_id)}
@@ -95,7 +95,7 @@ class AcademicRepository:
     
     # Learning Resources
     @staticmethod
-    def create_resource(resource_data: LearningResourceCreate) -> dict:
+    async def create_resource(resource_data: LearningResourceCreate) -> dict:
         """Create a learning resource"""
         resource_dict = resource_data.model_dump()
         resource_dict["module_id"] = str(resource_dict["module_id"])
@@ -105,24 +105,24 @@ class AcademicRepository:
         if resource_dict.get("viewer_type") is None and resource_dict["resource_type"] == "3d":
             # Default viewer type for 3D resources
             resource_dict["viewer_type"] = "anatomy"
-        return supabase_client.insert("learning_resources", resource_dict)
+        return await async_supabase_client.insert("learning_resources", resource_dict)
     
     @staticmethod
-    def get_resource(resource_id: UUID) -> Optional[dict]:
+    async def get_resource(resource_id: UUID) -> Optional[dict]:
         """Get resource by ID"""
-        return supabase_client.select_one("learning_resources", filters={"id": str(resource_id)})
+        return await async_supabase_client.select_one("learning_resources", filters={"id": str(resource_id)})
     
     @staticmethod
-    def get_resources_by_module(module_id: UUID) -> List[dict]:
+    async def get_resources_by_module(module_id: UUID) -> List[dict]:
         """Get resources for a module"""
-        return supabase_client.select(
+        return await async_supabase_client.select(
             "learning_resources",
             filters={"module_id": str(module_id)},
             order_by="order_index"
         )
     
     @staticmethod
-    def update_resource(resource_id: UUID, resource_data: LearningResourceUpdate) -> dict:
+    async def update_resource(resource_id: UUID, resource_data: LearningResourceUpdate) -> dict:
         """Update resource"""
         update_dict = resource_data.model_dump(exclude_unset=True)
         if update_dict.get("resource_type"):
@@ -130,7 +130,7 @@ class AcademicRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update(
+        result = await async_supabase_client.update(
             "learning_resources",
             update_dict,
             filters={"id": str(resource_id)}
@@ -141,33 +141,39 @@ class AcademicRepository:
     
     # Student Progress
     @staticmethod
-    def create_progress(progress_data: StudentModuleProgressCreate) -> dict:
+    async def create_progress(progress_data: StudentModuleProgressCreate) -> dict:
         """Create student progress"""
         progress_dict = progress_data.model_dump()
         progress_dict["student_id"] = str(progress_dict["student_id"])
         progress_dict["module_id"] = str(progress_dict["module_id"])
         progress_dict["resources_completed"] = [str(r) for r in progress_dict["resources_completed"]]
         progress_dict["college_id"] = str(progress_dict["college_id"])
-        return supabase_client.insert("student_module_progress", progress_dict)
+        return await async_supabase_client.insert("student_module_progress", progress_dict)
     
     @staticmethod
-    def get_progress(student_id: UUID, module_id: UUID) -> Optional[dict]:
+    async def get_progress(student_id: UUID, module_id: UUID) -> Optional[dict]:
         """Get student progress for a module"""
-        return supabase_client.select_one(
+        return await async_supabase_client.select_one(
             "student_module_progress",
             filters={"student_id": str(student_id), "module_id": str(module_id)}
         )
     
     @staticmethod
-    def get_student_progress(student_id: UUID) -> List[dict]:
-        """Get all progress for a student"""
-        return supabase_client.select(
+    async def get_student_progress(
+        student_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get all progress for a student (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "student_module_progress",
-            filters={"student_id": str(student_id)}
+            filters={"student_id": str(student_id)},
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def update_progress(progress_id: UUID, progress_data: StudentModuleProgressUpdate) -> dict:
+    async def update_progress(progress_id: UUID, progress_data: StudentModuleProgressUpdate) -> dict:
         """Update progress"""
         update_dict = progress_data.model_dump(exclude_unset=True)
         if update_dict.get("resources_completed"):
@@ -175,7 +181,7 @@ class AcademicRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update(
+        result = await async_supabase_client.update(
             "student_module_progress",
             update_dict,
             filters={"id": str(progress_id)}
@@ -186,58 +192,75 @@ class AcademicRepository:
     
     # Topic Allocations
     @staticmethod
-    def create_topic_allocation(allocation_data: TopicAllocationCreate) -> dict:
+    async def create_topic_allocation(allocation_data: TopicAllocationCreate) -> dict:
         """Create topic allocation"""
         allocation_dict = allocation_data.model_dump()
         allocation_dict["module_id"] = str(allocation_dict["module_id"])
         allocation_dict["batch_id"] = str(allocation_dict["batch_id"])
         allocation_dict["faculty_id"] = str(allocation_dict["faculty_id"])
         allocation_dict["college_id"] = str(allocation_dict["college_id"])
-        return supabase_client.insert("topic_allocations", allocation_dict)
+        return await async_supabase_client.insert("topic_allocations", allocation_dict)
     
     @staticmethod
-    def get_allocations_by_faculty(faculty_id: UUID) -> List[dict]:
+    async def get_allocations_by_faculty(faculty_id: UUID) -> List[dict]:
         """Get allocations for a faculty"""
-        return supabase_client.select(
+        return await async_supabase_client.select(
             "topic_allocations",
             filters={"faculty_id": str(faculty_id)}
         )
     
     @staticmethod
-    def get_allocations_by_student(student_id: UUID) -> List[dict]:
-        """Get allocations for a student (via batch)"""
+    async def get_allocations_by_student(
+        student_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get allocations for a student (via batch) (one page, newest first)"""
         # First get student's batch_id from student_profiles
         from app.repositories.user_repo import UserRepository
-        student_profile = UserRepository.get_student_profile(student_id)
+        student_profile = await UserRepository.get_student_profile(student_id)
         if not student_profile or not student_profile.get("batch_id"):
-            return []
+            return [], None
         
         batch_id = student_profile["batch_id"]
-        return supabase_client.select(
+        return await async_supabase_client.select_page(
             "topic_allocations",
-            filters={"batch_id": str(batch_id)}
+            filters={"batch_id": str(batch_id)},
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def get_allocations_by_topic(topic_id: UUID) -> List[dict]:
-        """Get allocations for a topic/module"""
-        return supabase_client.select(
+    async def get_allocations_by_topic(
+        topic_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get allocations for a topic/module (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "topic_allocations",
-            filters={"module_id": str(topic_id)}
+            filters={"module_id": str(topic_id)},
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def get_allocations_by_college(college_id: UUID) -> List[dict]:
-        """Get all allocations for a college"""
-        return supabase_client.select(
+    async def get_allocations_by_college(
+        college_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get all allocations for a college (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "topic_allocations",
             filters={"college_id": str(college_id)},
-            order_by="created_at"
+            cursor=cursor,
+            limit=limit
         )
     
     # Faculty Attendance
     @staticmethod
-    def create_faculty_attendance(attendance_data: FacultyAttendanceCreate) -> dict:
+    async def create_faculty_attendance(attendance_data: FacultyAttendanceCreate) -> dict:
         """Create faculty attendance record"""
         attendance_dict = attendance_data.model_dump()
         attendance_dict["faculty_id"] = str(attendance_dict["faculty_id"])
@@ -246,27 +269,32 @@ class AcademicRepository:
             attendance_dict["verified_by"] = str(attendance_dict["verified_by"])
         attendance_dict["status"] = attendance_dict["status"].value
         attendance_dict["college_id"] = str(attendance_dict["college_id"])
-        return supabase_client.insert("faculty_attendance", attendance_dict)
+        return await async_supabase_client.insert("faculty_attendance", attendance_dict)
     
     @staticmethod
-    def get_faculty_attendance(attendance_id: UUID) -> Optional[dict]:
+    async def get_faculty_attendance(attendance_id: UUID) -> Optional[dict]:
         """Get faculty attendance by ID"""
-        return supabase_client.select_one("faculty_attendance", filters={"id": str(attendance_id)})
+        return await async_supabase_client.select_one("faculty_attendance", filters={"id": str(attendance_id)})
     
     @staticmethod
-    def get_attendance_by_faculty(faculty_id: UUID) -> List[dict]:
-        """Get attendance records for a faculty member"""
-        return supabase_client.select(
+    async def get_attendance_by_faculty(
+        faculty_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get attendance records for a faculty member (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "faculty_attendance",
             filters={"faculty_id": str(faculty_id)},
-            order_by="attendance_date"
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def get_attendance_by_department(department_id: UUID, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[dict]:
+    async def get_attendance_by_department(department_id: UUID, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[dict]:
         """Get attendance records for all faculty in a department"""
         # Get all faculty profiles in the department
-        faculty_profiles = supabase_client.select(
+        faculty_profiles = await async_supabase_client.select(
             "faculty_profiles",
             filters={"department_id": str(department_id)}
         )
@@ -275,33 +303,24 @@ class AcademicRepository:
         if not faculty_ids:
             return []
         
-        # Get attendance for these faculty
-        # Note: supabase_client.select with list filter needs special handling
-        attendance_records = []
-        for faculty_id in faculty_ids:
-            records = supabase_client.select(
-                "faculty_attendance",
-                filters={"faculty_id": str(faculty_id)},
-                order_by="attendance_date"
-            )
-            attendance_records.extend(records)
-        
-        # Filter by date range if provided
-        if start_date or end_date:
-            filtered = []
-            for record in attendance_records:
-                record_date = record.get("attendance_date", "")
-                if start_date and record_date < start_date:
-                    continue
-                if end_date and record_date > end_date:
-                    continue
-                filtered.append(record)
-            return filtered
+        # One query for every faculty member, with the date window applied server-side
+        filters: Dict[str, Any] = {"faculty_id": {"in": [str(f) for f in faculty_ids]}}
+        date_range = {}
+        if start_date:
+            date_range["gte"] = start_date
+        if end_date:
+            date_range["lte"] = end_date
+        if date_range:
+            filters["attendance_date"] = date_range
         
-        return attendance_records
+        return await async_supabase_client.select(
+            "faculty_attendance",
+            filters=filters,
+            order_by="attendance_date"
+        )
     
     @staticmethod
-    def update_faculty_attendance(attendance_id: UUID, attendance_data: FacultyAttendanceUpdate) -> dict:
+    async def update_faculty_attendance(attendance_id: UUID, attendance_data: FacultyAttendanceUpdate) -> dict:
         """Update faculty attendance"""
         update_dict = attendance_data.model_dump(exclude_unset=True)
         if update_dict.get("status"):
@@ -311,7 +330,7 @@ class AcademicRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update("faculty_attendance", update_dict, filters={"id": str(attendance_id)})
+        result = await async_supabase_client.update("faculty_attendance", update_dict, filters={"id": str(attendance_id)})
         if not result:
             raise NotFoundError("Faculty attendance not found")
         return result
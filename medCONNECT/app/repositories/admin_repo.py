@@ -1,9 +1,10 @@
 """
 Admin repository for database operations
 """
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from uuid import UUID
-from app.db.supabase import supabase_client
+from app.db.supabase import async_supabase_client
+from app.repositories.attendance_rollup_repo import AttendanceRollupRepository
 from app.models.admin import (
     AttendanceCreate, AttendanceUpdate,
     AttendanceSessionCreate,
@@ -21,7 +22,7 @@ class AdminRepository:
     
     # Attendance
     @staticmethod
-    def create_attendance(attendance_data: AttendanceCreate) -> dict:
+    async def create_attendance(attendance_data: AttendanceCreate) -> dict:
         """Create attendance record"""
         attendance_dict = attendance_data.model_dump()
         attendance_dict["student_id"] = str(attendance_dict["student_id"])
@@ -30,24 +31,31 @@ class AdminRepository:
             attendance_dict["verified_by"] = str(attendance_dict["verified_by"])
         attendance_dict["status"] = attendance_dict["status"].value
         attendance_dict["college_id"] = str(attendance_dict["college_id"])
-        return supabase_client.insert("attendance", attendance_dict)
+        created = await async_supabase_client.insert("attendance", attendance_dict)
+        await AttendanceRollupRepository.record_change(None, created)
+        return created
     
     @staticmethod
-    def get_attendance(attendance_id: UUID) -> Optional[dict]:
+    async def get_attendance(attendance_id: UUID) -> Optional[dict]:
         """Get attendance by ID"""
-        return supabase_client.select_one("attendance", filters={"id": str(attendance_id)})
+        return await async_supabase_client.select_one("attendance", filters={"id": str(attendance_id)})
     
     @staticmethod
-    def get_attendance_by_student(student_id: UUID) -> List[dict]:
-        """Get attendance records for a student"""
-        return supabase_client.select(
+    async def get_attendance_by_student(
+        student_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get attendance records for a student (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "attendance",
             filters={"student_id": str(student_id)},
-            order_by="attendance_date"
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def update_attendance(attendance_id: UUID, attendance_data: AttendanceUpdate) -> dict:
+    async def update_attendance(attendance_id: UUID, attendance_data: AttendanceUpdate) -> dict:
         """Update attendance"""
         update_dict = attendance_data.model_dump(exclude_unset=True)
         if update_dict.get("status"):
@@ -57,28 +65,35 @@ class AdminRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update("attendance", update_dict, filters={"id": str(attendance_id)})
+        # Previous status is needed to move the record between rollup buckets
+        previous = None
+        if "status" in update_dict:
+            previous = await AdminRepository.get_attendance(attendance_id)
+        
+        result = await async_supabase_client.update("attendance", update_dict, filters={"id": str(attendance_id)})
         if not result:
             raise NotFoundError("Attendance not found")
+        if previous:
+            await AttendanceRollupRepository.record_change(previous, result)
         return result
     
     # Attendance Sessions
     @staticmethod
-    def create_attendance_session(session_data: AttendanceSessionCreate) -> dict:
+    async def create_attendance_session(session_data: AttendanceSessionCreate) -> dict:
         """Create attendance session"""
         session_dict = session_data.model_dump()
         session_dict["created_by"] = str(session_dict["created_by"])
         session_dict["college_id"] = str(session_dict["college_id"])
-        return supabase_client.insert("attendance_sessions", session_dict)
+        return await async_supabase_client.insert("attendance_sessions", session_dict)
     
     @staticmethod
-    def get_attendance_session(session_id: UUID) -> Optional[dict]:
+    async def get_attendance_session(session_id: UUID) -> Optional[dict]:
         """Get attendance session by ID"""
-        return supabase_client.select_one("attendance_sessions", filters={"id": str(session_id)})
+        return await async_supabase_client.select_one("attendance_sessions", filters={"id": str(session_id)})
     
     # Certificates
     @staticmethod
-    def create_certificate_request(cert_data: CertificateRequestCreate) -> dict:
+    async def create_certificate_request(cert_data: CertificateRequestCreate) -> dict:
         """Create certificate request"""
         cert_dict = cert_data.model_dump()
         cert_dict["student_id"] = str(cert_dict["student_id"])
@@ -87,33 +102,43 @@ class AdminRepository:
         cert_dict["certificate_type"] = cert_dict["certificate_type"].value
         cert_dict["status"] = cert_dict["status"].value
         cert_dict["college_id"] = str(cert_dict["college_id"])
-        return supabase_client.insert("certificates", cert_dict)
+        return await async_supabase_client.insert("certificates", cert_dict)
     
     @staticmethod
-    def get_certificate_request(cert_id: UUID) -> Optional[dict]:
+    async def get_certificate_request(cert_id: UUID) -> Optional[dict]:
         """Get certificate request by ID"""
-        return supabase_client.select_one("certificates", filters={"id": str(cert_id)})
+        return await async_supabase_client.select_one("certificates", filters={"id": str(cert_id)})
     
     @staticmethod
-    def get_certificates_by_student(student_id: UUID) -> List[dict]:
-        """Get certificate requests for a student"""
-        return supabase_client.select(
+    async def get_certificates_by_student(
+        student_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get certificate requests for a student (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "certificates",
             filters={"student_id": str(student_id)},
-            order_by="created_at"
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def get_certificates_by_college(college_id: UUID) -> List[dict]:
-        """Get all certificate requests for a college"""
-        return supabase_client.select(
+    async def get_certificates_by_college(
+        college_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get all certificate requests for a college (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "certificates",
             filters={"college_id": str(college_id)},
-            order_by="created_at"
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def update_certificate_request(cert_id: UUID, cert_data: CertificateRequestUpdate) -> dict:
+    async def update_certificate_request(cert_id: UUID, cert_data: CertificateRequestUpdate) -> dict:
         """Update certificate request"""
         update_dict = cert_data.model_dump(exclude_unset=True)
         if update_dict.get("certificate_type"):
@@ -125,125 +150,140 @@ class AdminRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update("certificates", update_dict, filters={"id": str(cert_id)})
+        result = await async_supabase_client.update("certificates", update_dict, filters={"id": str(cert_id)})
         if not result:
             raise NotFoundError("Certificate request not found")
         return result
     
     # Notices
     @staticmethod
-    def create_notice(notice_data: NoticeCreate) -> dict:
+    async def create_notice(notice_data: NoticeCreate) -> dict:
         """Create notice"""
         notice_dict = notice_data.model_dump()
         notice_dict["created_by"] = str(notice_dict["created_by"])
         notice_dict["college_id"] = str(notice_dict["college_id"])
-        return supabase_client.insert("notices", notice_dict)
+        return await async_supabase_client.insert("notices", notice_dict)
     
     @staticmethod
-    def get_notice(notice_id: UUID) -> Optional[dict]:
+    async def get_notice(notice_id: UUID) -> Optional[dict]:
         """Get notice by ID"""
-        return supabase_client.select_one("notices", filters={"id": str(notice_id)})
+        return await async_supabase_client.select_one("notices", filters={"id": str(notice_id)})
     
     @staticmethod
-    def get_notices_by_college(college_id: UUID) -> List[dict]:
-        """Get notices for a college"""
-        return supabase_client.select(
+    async def get_notices_by_college(
+        college_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get notices for a college (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "notices",
             filters={"college_id": str(college_id)},
-            order_by="created_at"
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def update_notice(notice_id: UUID, notice_data: NoticeUpdate) -> dict:
+    async def update_notice(notice_id: UUID, notice_data: NoticeUpdate) -> dict:
         """Update notice"""
         update_dict = notice_data.model_dump(exclude_unset=True)
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update("notices", update_dict, filters={"id": str(notice_id)})
+        result = await async_supabase_client.update("notices", update_dict, filters={"id": str(notice_id)})
         if not result:
             raise NotFoundError("Notice not found")
         return result
     
     # Events
     @staticmethod
-    def create_event(event_data: EventCreate) -> dict:
+    async def create_event(event_data: EventCreate) -> dict:
         """Create event"""
         event_dict = event_data.model_dump()
         event_dict["created_by"] = str(event_dict["created_by"])
         event_dict["college_id"] = str(event_dict["college_id"])
-        return supabase_client.insert("events", event_dict)
+        return await async_supabase_client.insert("events", event_dict)
     
     @staticmethod
-    def get_event(event_id: UUID) -> Optional[dict]:
+    async def get_event(event_id: UUID) -> Optional[dict]:
         """Get event by ID"""
-        return supabase_client.select_one("events", filters={"id": str(event_id)})
+        return await async_supabase_client.select_one("events", filters={"id": str(event_id)})
     
     @staticmethod
-    def get_events_by_college(college_id: UUID) -> List[dict]:
-        """Get events for a college"""
-        return supabase_client.select(
+    async def get_events_by_college(
+        college_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get events for a college (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "events",
             filters={"college_id": str(college_id)},
-            order_by="start_date"
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def update_event(event_id: UUID, event_data: EventUpdate) -> dict:
+    async def update_event(event_id: UUID, event_data: EventUpdate) -> dict:
         """Update event"""
         update_dict = event_data.model_dump(exclude_unset=True)
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update("events", update_dict, filters={"id": str(event_id)})
+        result = await async_supabase_client.update("events", update_dict, filters={"id": str(event_id)})
         if not result:
             raise NotFoundError("Event not found")
         return result
     
     # Event Registrations
     @staticmethod
-    def create_event_registration(reg_data: EventRegistrationCreate) -> dict:
+    async def create_event_registration(reg_data: EventRegistrationCreate) -> dict:
         """Create event registration"""
         reg_dict = reg_data.model_dump()
         reg_dict["event_id"] = str(reg_dict["event_id"])
         reg_dict["user_id"] = str(reg_dict["user_id"])
         reg_dict["college_id"] = str(reg_dict["college_id"])
-        return supabase_client.insert("event_registrations", reg_dict)
+        return await async_supabase_client.insert("event_registrations", reg_dict)
     
     @staticmethod
-    def get_registrations_by_event(event_id: UUID) -> List[dict]:
+    async def get_registrations_by_event(event_id: UUID) -> List[dict]:
         """Get registrations for an event"""
-        return supabase_client.select(
+        return await async_supabase_client.select(
             "event_registrations",
             filters={"event_id": str(event_id)}
         )
     
     # Fees
     @staticmethod
-    def create_fee(fee_data: FeeCreate) -> dict:
+    async def create_fee(fee_data: FeeCreate) -> dict:
         """Create fee record"""
         fee_dict = fee_data.model_dump()
         fee_dict["student_id"] = str(fee_dict["student_id"])
         fee_dict["payment_status"] = fee_dict["payment_status"].value
         fee_dict["college_id"] = str(fee_dict["college_id"])
-        return supabase_client.insert("fees", fee_dict)
+        return await async_supabase_client.insert("fees", fee_dict)
     
     @staticmethod
-    def get_fee(fee_id: UUID) -> Optional[dict]:
+    async def get_fee(fee_id: UUID) -> Optional[dict]:
         """Get fee by ID"""
-        return supabase_client.select_one("fees", filters={"id": str(fee_id)})
+        return await async_supabase_client.select_one("fees", filters={"id": str(fee_id)})
     
     @staticmethod
-    def get_fees_by_student(student_id: UUID) -> List[dict]:
-        """Get fees for a student"""
-        return supabase_client.select(
+    async def get_fees_by_student(
+        student_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get fees for a student (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "fees",
             filters={"student_id": str(student_id)},
-            order_by="due_date"
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def update_fee(fee_id: UUID, fee_data: FeeUpdate) -> dict:
+    async def update_fee(fee_id: UUID, fee_data: FeeUpdate) -> dict:
         """Update fee"""
         update_dict = fee_data.model_dump(exclude_unset=True)
         if update_dict.get("payment_status"):
@@ -251,7 +291,7 @@ class AdminRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update("fees", update_dict, filters={"id": str(fee_id)})
+        result = await async_supabase_client.update("fees", update_dict, filters={"id": str(fee_id)})
         if not result:
             raise NotFoundError("Fee not found")
         return result
@@ -0,0 +1,182 @@
+"""
+Attendance daily rollup repository
+"""
+from typing import Optional, List, Dict, Any
+from uuid import UUID
+from datetime import datetime
+import time
+from postgrest.exceptions import APIError
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.supabase import async_supabase_client, RPC_NOT_FOUND_CODES
+from loguru import logger
+
+ROLLUP_TABLE = "attendance_daily_rollup"
+APPLY_FUNCTION = "medconnect_apply_attendance_rollup"
+REBUILD_FUNCTION = "medconnect_rebuild_attendance_rollup"
+
+# PostgREST error codes for a table that does not exist
+TABLE_NOT_FOUND_CODES = ("PGRST205", "42P01")
+
+
+class AttendanceRollupRepository:
+    """Repository for the per-day attendance rollup
+    
+    Rows are keyed by (college, department, date, status) and hold a record
+    count. Until migration_add_attendance_rollup.sql is applied every method
+    degrades to a no-op / ``None`` so callers can use raw attendance instead;
+    the rollup is probed again every OPTIONAL_SCHEMA_RECHECK_INTERVAL seconds.
+    """
+    
+    unavailable_until: float = 0.0  # monotonic time before which the rollup is assumed missing
+    failed_updates: int = 0
+    
+    @staticmethod
+    def _unavailable() -> bool:
+        """True while a recently detected missing rollup is still assumed missing"""
+        return AttendanceRollupRepository.unavailable_until > time.monotonic()
+    
+    @staticmethod
+    def _mark_available() -> None:
+        """The rollup answered; stop skipping it"""
+        if AttendanceRollupRepository.unavailable_until:
+            logger.info("Attendance rollup detected; analytics read from it again")
+            AttendanceRollupRepository.unavailable_until = 0.0
+    
+    @staticmethod
+    def _mark_unavailable(e: APIError) -> bool:
+        """Remember a missing rollup table/function for a while; True if that was the error"""
+        if e.code not in TABLE_NOT_FOUND_CODES + RPC_NOT_FOUND_CODES:
+            return False
+        logger.warning("Attendance rollup not installed; apply migration_add_attendance_rollup.sql")
+        AttendanceRollupRepository.unavailable_until = time.monotonic() + settings.OPTIONAL_SCHEMA_RECHECK_INTERVAL
+        return True
+    
+    @staticmethod
+    def _record_failure(e: Exception) -> None:
+        """Count a lost delta; the rollup now drifts until the next backfill"""
+        AttendanceRollupRepository.failed_updates += 1
+        if metrics.enabled:
+            metrics.observe_rollup_failure()
+        logger.warning(
+            f"Failed to update attendance rollup ({AttendanceRollupRepository.failed_updates} since start): {e}. "
+            "Run backfill_attendance_rollup.py to repair drift."
+        )
+    
+    @staticmethod
+    async def _get_department_id(student_id: str) -> Optional[str]:
+        """Look up a student's department"""
+        profile = await async_supabase_client.select(
+            "student_profiles",
+            columns="department_id",
+            filters={"user_id": str(student_id)},
+            limit=1
+        )
+        return profile[0].get("department_id") if profile else None
+    
+    @staticmethod
+    async def record_change(old: Optional[dict], new: Optional[dict]) -> None:
+        """Move one attendance record between rollup buckets (insert: old=None)
+        
+        Failures are logged and counted (medconnect_attendance_rollup_failures_total)
+        rather than raised so attendance writes never fail because of the rollup;
+        the backfill job repairs any drift.
+        """
+        if AttendanceRollupRepository._unavailable():
+            return
+        
+        changes = [(row, delta) for row, delta in ((old, -1), (new, 1)) if row]
+        if not changes:
+            return
+        if old and new and old["status"] == new["status"] and str(old["attendance_date"])[:10] == str(new["attendance_date"])[:10]:
+            return
+        
+        try:
+            department_id = await AttendanceRollupRepository._get_department_id(changes[0][0]["student_id"])
+            deltas = [
+                {
+                    "college_id": str(row["college_id"]),
+                    "department_id": department_id or "",
+                    "rollup_date": str(row["attendance_date"])[:10],
+                    "status": row["status"],
+                    "delta": delta
+                }
+                for row, delta in changes
+            ]
+            await async_supabase_client.rpc(APPLY_FUNCTION, {"p_deltas": deltas})
+            AttendanceRollupRepository._mark_available()
+        except APIError as e:
+            if not AttendanceRollupRepository._mark_unavailable(e):
+                AttendanceRollupRepository._record_failure(e)
+        except Exception as e:
+            AttendanceRollupRepository._record_failure(e)
+    
+    @staticmethod
+    def _window_filters(
+        college_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Build rollup filters for a college and optional date window"""
+        filters: Dict[str, Any] = {"college_id": str(college_id)}
+        date_range = {}
+        if start_date:
+            date_range["gte"] = start_date.date().isoformat()
+        if end_date:
+            date_range["lte"] = end_date.date().isoformat()
+        if date_range:
+            filters["rollup_date"] = date_range
+        return filters
+    
+    @staticmethod
+    async def get_daily_rollup(
+        college_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Optional[List[dict]]:
+        """Rollup rows for a college and window, or ``None`` if the rollup is not installed"""
+        if AttendanceRollupRepository._unavailable():
+            return None
+        
+        try:
+            rows = await async_supabase_client.select(
+                ROLLUP_TABLE,
+                columns="department_id,rollup_date,status,record_count",
+                filters=AttendanceRollupRepository._window_filters(college_id, start_date, end_date)
+            )
+        except APIError as e:
+            if AttendanceRollupRepository._mark_unavailable(e):
+                return None
+            raise
+        AttendanceRollupRepository._mark_available()
+        return rows
+    
+    @staticmethod
+    async def get_status_totals(
+        college_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Optional[Dict[str, int]]:
+        """Attendance record counts per status, or ``None`` if the rollup is not installed"""
+        if AttendanceRollupRepository._unavailable():
+            return None
+        
+        try:
+            groups = await async_supabase_client.aggregate(
+                ROLLUP_TABLE,
+                group_by="status",
+                filters=AttendanceRollupRepository._window_filters(college_id, start_date, end_date),
+                sum_column="record_count"
+            )
+        except APIError as e:
+            if AttendanceRollupRepository._mark_unavailable(e):
+                return None
+            raise
+        AttendanceRollupRepository._mark_available()
+        return {g["group_key"]: int(g["sum_value"] or 0) for g in groups}
+    
+    @staticmethod
+    async def rebuild(college_id: Optional[UUID] = None) -> int:
+        """Recompute the rollup from raw attendance; returns the number of rollup rows"""
+        params = {"p_college_id": str(college_id) if college_id else None}
+        return await async_supabase_client.rpc(REBUILD_FUNCTION, params) or 0
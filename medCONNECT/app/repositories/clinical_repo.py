@@ -1,9 +1,9 @@
 """
 Clinical repository for database operations
 """
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from uuid import UUID
-from app.db.supabase import supabase_client
+from app.db.supabase import async_supabase_client
 from app.models.clinical import (
     PostingCreate, PostingUpdate,
     ClinicalLogbookEntryCreate, ClinicalLogbookEntryUpdate,
@@ -18,7 +18,7 @@ class ClinicalRepository:
     
     # Postings
     @staticmethod
-    def create_posting(posting_data: PostingCreate) -> dict:
+    async def create_posting(posting_data: PostingCreate) -> dict:
         """Create a posting"""
         posting_dict = posting_data.model_dump()
         posting_dict["student_id"] = str(posting_dict["student_id"])
@@ -27,33 +27,38 @@ class ClinicalRepository:
             posting_dict["supervisor_id"] = str(posting_dict["supervisor_id"])
         posting_dict["status"] = posting_dict["status"].value
         posting_dict["college_id"] = str(posting_dict["college_id"])
-        return supabase_client.insert("postings", posting_dict)
+        return await async_supabase_client.insert("postings", posting_dict)
     
     @staticmethod
-    def get_posting(posting_id: UUID) -> Optional[dict]:
+    async def get_posting(posting_id: UUID) -> Optional[dict]:
         """Get posting by ID"""
-        return supabase_client.select_one("postings", filters={"id": str(posting_id)})
+        return await async_supabase_client.select_one("postings", filters={"id": str(posting_id)})
     
     @staticmethod
-    def get_postings_by_student(student_id: UUID) -> List[dict]:
-        """Get postings for a student"""
-        return supabase_client.select(
+    async def get_postings_by_student(
+        student_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get postings for a student (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "postings",
             filters={"student_id": str(student_id)},
-            order_by="start_date"
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def get_postings_by_department(department_id: UUID) -> List[dict]:
+    async def get_postings_by_department(department_id: UUID) -> List[dict]:
         """Get postings for a department"""
-        return supabase_client.select(
+        return await async_supabase_client.select(
             "postings",
             filters={"department_id": str(department_id)},
             order_by="start_date"
         )
     
     @staticmethod
-    def update_posting(posting_id: UUID, posting_data: PostingUpdate) -> dict:
+    async def update_posting(posting_id: UUID, posting_data: PostingUpdate) -> dict:
         """Update posting"""
         update_dict = posting_data.model_dump(exclude_unset=True)
         if update_dict.get("status"):
@@ -65,14 +70,14 @@ class ClinicalRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update("postings", update_dict, filters={"id": str(posting_id)})
+        result = await async_supabase_client.update("postings", update_dict, filters={"id": str(posting_id)})
         if not result:
             raise NotFoundError("Posting not found")
         return result
     
     # Clinical Logbooks
     @staticmethod
-    def create_logbook_entry(entry_data: ClinicalLogbookEntryCreate) -> dict:
+    async def create_logbook_entry(entry_data: ClinicalLogbookEntryCreate) -> dict:
         """Create a logbook entry"""
         entry_dict = entry_data.model_dump()
         entry_dict["student_id"] = str(entry_dict["student_id"])
@@ -81,41 +86,51 @@ class ClinicalRepository:
             entry_dict["verified_by"] = str(entry_dict["verified_by"])
         entry_dict["status"] = entry_dict["status"].value
         entry_dict["college_id"] = str(entry_dict["college_id"])
-        return supabase_client.insert("clinical_logbooks", entry_dict)
+        return await async_supabase_client.insert("clinical_logbooks", entry_dict)
     
     @staticmethod
-    def get_logbook_entry(entry_id: UUID) -> Optional[dict]:
+    async def get_logbook_entry(entry_id: UUID) -> Optional[dict]:
         """Get logbook entry by ID"""
-        return supabase_client.select_one("clinical_logbooks", filters={"id": str(entry_id)})
+        return await async_supabase_client.select_one("clinical_logbooks", filters={"id": str(entry_id)})
     
     @staticmethod
-    def get_logbook_entries_by_student(student_id: UUID) -> List[dict]:
-        """Get logbook entries for a student"""
-        return supabase_client.select(
+    async def get_logbook_entries_by_student(
+        student_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get logbook entries for a student (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "clinical_logbooks",
             filters={"student_id": str(student_id)},
-            order_by="created_at"
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def get_logbook_entries_by_college(college_id: UUID) -> List[dict]:
-        """Get all logbook entries for a college"""
-        return supabase_client.select(
+    async def get_logbook_entries_by_college(
+        college_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get all logbook entries for a college (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "clinical_logbooks",
             filters={"college_id": str(college_id)},
-            order_by="created_at"
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def get_logbook_entries_by_posting(posting_id: UUID) -> List[dict]:
+    async def get_logbook_entries_by_posting(posting_id: UUID) -> List[dict]:
         """Get logbook entries for a posting"""
-        return supabase_client.select(
+        return await async_supabase_client.select(
             "clinical_logbooks",
             filters={"posting_id": str(posting_id)}
         )
     
     @staticmethod
-    def update_logbook_entry(entry_id: UUID, entry_data: ClinicalLogbookEntryUpdate) -> dict:
+    async def update_logbook_entry(entry_id: UUID, entry_data: ClinicalLogbookEntryUpdate) -> dict:
         """Update logbook entry"""
         from datetime import datetime
         
@@ -131,7 +146,7 @@ class ClinicalRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update(
+        result = await async_supabase_client.update(
             "clinical_logbooks",
             update_dict,
             filters={"id": str(entry_id)}
@@ -142,31 +157,31 @@ class ClinicalRepository:
     
     # OPD Sessions
     @staticmethod
-    def create_opd_session(session_data: OPDSessionCreate) -> dict:
+    async def create_opd_session(session_data: OPDSessionCreate) -> dict:
         """Create an OPD session"""
         session_dict = session_data.model_dump()
         session_dict["department_id"] = str(session_dict["department_id"])
         session_dict["faculty_id"] = str(session_dict["faculty_id"])
         session_dict["students_present"] = [str(s) for s in session_dict["students_present"]]
         session_dict["college_id"] = str(session_dict["college_id"])
-        return supabase_client.insert("opd_sessions", session_dict)
+        return await async_supabase_client.insert("opd_sessions", session_dict)
     
     @staticmethod
-    def get_opd_session(session_id: UUID) -> Optional[dict]:
+    async def get_opd_session(session_id: UUID) -> Optional[dict]:
         """Get OPD session by ID"""
-        return supabase_client.select_one("opd_sessions", filters={"id": str(session_id)})
+        return await async_supabase_client.select_one("opd_sessions", filters={"id": str(session_id)})
     
     @staticmethod
-    def get_opd_sessions_by_department(department_id: UUID) -> List[dict]:
+    async def get_opd_sessions_by_department(department_id: UUID) -> List[dict]:
         """Get OPD sessions for a department"""
-        return supabase_client.select(
+        return await async_supabase_client.select(
             "opd_sessions",
             filters={"department_id": str(department_id)},
             order_by="session_date"
         )
     
     @staticmethod
-    def update_opd_session(session_id: UUID, session_data: OPDSessionUpdate) -> dict:
+    async def update_opd_session(session_id: UUID, session_data: OPDSessionUpdate) -> dict:
         """Update OPD session"""
         update_dict = session_data.model_dump(exclude_unset=True)
         if update_dict.get("students_present"):
@@ -176,7 +191,7 @@ class ClinicalRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update(
+        result = await async_supabase_client.update(
             "opd_sessions",
             update_dict,
             filters={"id": str(session_id)}
@@ -187,18 +202,18 @@ class ClinicalRepository:
     
     # OPD Student Involvement
     @staticmethod
-    def create_opd_involvement(involvement_data: OPDSessionStudentInvolvementCreate) -> dict:
+    async def create_opd_involvement(involvement_data: OPDSessionStudentInvolvementCreate) -> dict:
         """Create OPD student involvement"""
         involvement_dict = involvement_data.model_dump()
         involvement_dict["session_id"] = str(involvement_dict["session_id"])
         involvement_dict["student_id"] = str(involvement_dict["student_id"])
         involvement_dict["college_id"] = str(involvement_dict["college_id"])
-        return supabase_client.insert("opd_student_involvement", involvement_dict)
+        return await async_supabase_client.insert("opd_student_involvement", involvement_dict)
     
     @staticmethod
-    def get_involvement_by_session(session_id: UUID) -> List[dict]:
+    async def get_involvement_by_session(session_id: UUID) -> List[dict]:
         """Get involvement records for a session"""
-        return supabase_client.select(
+        return await async_supabase_client.select(
             "opd_student_involvement",
             filters={"session_id": str(session_id)}
         )
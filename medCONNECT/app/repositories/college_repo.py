@@ -3,7 +3,7 @@ College and department repository
 """
 from typing import Optional, List
 from uuid import UUID
-from app.db.supabase import supabase_client
+from app.db.supabase import async_supabase_client
 from app.models.college import CollegeCreate, CollegeUpdate, DepartmentCreate, DepartmentUpdate
 from app.core.exceptions import NotFoundError
 
@@ -13,25 +13,25 @@ class CollegeRepository:
     
     # Colleges
     @staticmethod
-    def create_college(college_data: CollegeCreate) -> dict:
+    async def create_college(college_data: CollegeCreate) -> dict:
         """Create a college"""
         college_dict = college_data.model_dump()
         if college_dict.get("principal_id"):
             college_dict["principal_id"] = str(college_dict["principal_id"])
-        return supabase_client.insert("colleges", college_dict)
+        return await async_supabase_client.insert("colleges", college_dict)
     
     @staticmethod
-    def get_college(college_id: UUID) -> Optional[dict]:
+    async def get_college(college_id: UUID) -> Optional[dict]:
         """Get college by ID"""
-        return supabase_client.select_one("colleges", filters={"id": str(college_id)})
+        return await async_supabase_client.select_one("colleges", filters={"id": str(college_id)})
     
     @staticmethod
-    def get_all_colleges() -> List[dict]:
+    async def get_all_colleges() -> List[dict]:
         """Get all colleges"""
-        return supabase_client.select("colleges", order_by="name")
+        return await async_supabase_client.select("colleges", order_by="name")
     
     @staticmethod
-    def update_college(college_id: UUID, college_data: CollegeUpdate) -> dict:
+    async def update_college(college_id: UUID, college_data: CollegeUpdate) -> dict:
         """Update college"""
         update_dict = college_data.model_dump(exclude_unset=True)
         if update_dict.get("principal_id"):
@@ -39,37 +39,37 @@ class CollegeRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update("colleges", update_dict, filters={"id": str(college_id)})
+        result = await async_supabase_client.update("colleges", update_dict, filters={"id": str(college_id)})
         if not result:
             raise NotFoundError("College not found")
         return result
     
     # Departments
     @staticmethod
-    def create_department(department_data: DepartmentCreate) -> dict:
+    async def create_department(department_data: DepartmentCreate) -> dict:
         """Create a department"""
         department_dict = department_data.model_dump()
         department_dict["college_id"] = str(department_dict["college_id"])
         if department_dict.get("hod_id"):
             department_dict["hod_id"] = str(department_dict["hod_id"])
-        return supabase_client.insert("departments", department_dict)
+        return await async_supabase_client.insert("departments", department_dict)
     
     @staticmethod
-    def get_department(department_id: UUID) -> Optional[dict]:
+    async def get_department(department_id: UUID) -> Optional[dict]:
         """Get department by ID"""
-        return supabase_client.select_one("departments", filters={"id": str(department_id)})
+        return await async_supabase_client.select_one("departments", filters={"id": str(department_id)})
     
     @staticmethod
-    def get_departments_by_college(college_id: UUID) -> List[dict]:
+    async def get_departments_by_college(college_id: UUID) -> List[dict]:
         """Get departments for a college"""
-        return supabase_client.select(
+        return await async_supabase_client.select(
             "departments",
             filters={"college_id": str(college_id)},
             order_by="name"
         )
     
     @staticmethod
-    def update_department(department_id: UUID, department_data: DepartmentUpdate) -> dict:
+    async def update_department(department_id: UUID, department_data: DepartmentUpdate) -> dict:
         """Update department"""
         update_dict = department_data.model_dump(exclude_unset=True)
         if update_dict.get("hod_id"):
@@ -77,7 +77,7 @@ class CollegeRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update("departments", update_dict, filters={"id": str(department_id)})
+        result = await async_supabase_client.update("departments", update_dict, filters={"id": str(department_id)})
         if not result:
             raise NotFoundError("Department not found")
         return result
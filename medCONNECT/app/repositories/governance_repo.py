@@ -1,10 +1,13 @@
 """
 Governance repository for database operations
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime
-from app.db.supabase import supabase_client
+from app.core.config import settings
+from app.core.concurrency import gather_bounded
+from app.db.supabase import async_supabase_client
+from app.repositories.attendance_rollup_repo import AttendanceRollupRepository
 from app.models.governance import GovernanceSnapshotCreate
 from app.core.exceptions import NotFoundError
 
@@ -13,170 +16,334 @@ class GovernanceRepository:
     """Repository for governance operations"""
     
     @staticmethod
-    def create_snapshot(snapshot_data: GovernanceSnapshotCreate) -> dict:
+    async def create_snapshot(snapshot_data: GovernanceSnapshotCreate) -> dict:
         """Create governance snapshot"""
         snapshot_dict = snapshot_data.model_dump()
         snapshot_dict["college_id"] = str(snapshot_dict["college_id"])
+        snapshot_dict["snapshot_date"] = snapshot_dict["snapshot_date"].isoformat()
         if snapshot_dict.get("created_by"):
             snapshot_dict["created_by"] = str(snapshot_dict["created_by"])
-        return supabase_client.insert("governance_snapshots", snapshot_dict)
+        return await async_supabase_client.insert("governance_snapshots", snapshot_dict)
     
     @staticmethod
-    def get_snapshot(snapshot_id: UUID) -> Optional[dict]:
+    async def get_snapshot(snapshot_id: UUID) -> Optional[dict]:
         """Get snapshot by ID"""
-        return supabase_client.select_one("governance_snapshots", filters={"id": str(snapshot_id)})
+        return await async_supabase_client.select_one("governance_snapshots", filters={"id": str(snapshot_id)})
     
     @staticmethod
-    def get_snapshots_by_college(college_id: UUID, snapshot_type: Optional[str] = None) -> List[dict]:
+    async def get_snapshots_by_college(college_id: UUID, snapshot_type: Optional[str] = None) -> List[dict]:
         """Get snapshots for a college"""
         filters = {"college_id": str(college_id)}
         if snapshot_type:
             filters["snapshot_type"] = snapshot_type
-        return supabase_client.select(
+        return await async_supabase_client.select(
             "governance_snapshots",
             filters=filters,
             order_by="snapshot_date"
         )
     
     @staticmethod
-    def get_user_count_by_college(college_id: UUID, role: Optional[str] = None) -> int:
+    async def get_latest_snapshot(college_id: UUID, snapshot_type: Optional[str] = None) -> Optional[dict]:
+        """Get the most recent snapshot for a college"""
+        filters = {"college_id": str(college_id)}
+        if snapshot_type:
+            filters["snapshot_type"] = snapshot_type
+        snapshots = await async_supabase_client.select(
+            "governance_snapshots",
+            filters=filters,
+            order_by="snapshot_date.desc",
+            limit=1
+        )
+        return snapshots[0] if snapshots else None
+    
+    @staticmethod
+    async def get_user_count_by_college(college_id: UUID, role: Optional[str] = None) -> int:
         """Get user count for a college"""
         filters = {"college_id": str(college_id), "is_active": True}
         if role:
             filters["role"] = role
-        return supabase_client.count("users", filters=filters)
+        return await async_supabase_client.count("users", filters=filters)
     
     @staticmethod
-    def get_active_postings_count(college_id: UUID) -> int:
+    async def get_active_postings_count(college_id: UUID) -> int:
         """Get count of active postings"""
-        return supabase_client.count(
+        return await async_supabase_client.count(
             "postings",
             filters={"college_id": str(college_id), "status": "active"}
         )
     
     @staticmethod
-    def get_pending_logbooks_count(college_id: UUID) -> int:
+    async def get_pending_logbooks_count(college_id: UUID) -> int:
         """Get count of pending logbook entries"""
-        return supabase_client.count(
+        return await async_supabase_client.count(
             "clinical_logbooks",
             filters={"college_id": str(college_id), "status": "submitted"}
         )
     
     @staticmethod
-    def get_attendance_rate(college_id: UUID, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> float:
+    async def get_attendance_rate(college_id: UUID, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> float:
         """Calculate overall attendance rate"""
-        # Get all attendance records
-        filters = {"college_id": str(college_id)}
+        status_counts = await GovernanceRepository.get_attendance_status_counts(college_id, start_date, end_date)
+        total = sum(status_counts.values())
+        return (status_counts.get("present", 0) / total * 100) if total > 0 else 0.0
+    
+    @staticmethod
+    async def get_attendance_status_counts(
+        college_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """Attendance record counts per status, from the rollup when installed"""
+        status_counts = await AttendanceRollupRepository.get_status_totals(college_id, start_date, end_date)
+        if status_counts is None:
+            filters = GovernanceRepository._attendance_window_filters(college_id, start_date, end_date)
+            status_counts = await GovernanceRepository._count_by("attendance", "status", filters)
+        return status_counts
+    
+    @staticmethod
+    async def _count_by(table: str, column: str, filters: Dict[str, Any]) -> Dict[str, int]:
+        """Row counts per value of ``column``, aggregated server-side"""
+        groups = await async_supabase_client.aggregate(table, group_by=column, filters=filters)
+        return {g["group_key"]: g["row_count"] for g in groups}
+    
+    @staticmethod
+    def _attendance_window_filters(
+        college_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Build attendance filters for a college and optional date window"""
+        filters: Dict[str, Any] = {"college_id": str(college_id)}
+        date_range = {}
         if start_date:
-            filters["attendance_date"] = {"gte": start_date.isoformat()}
+            date_range["gte"] = start_date.isoformat()
         if end_date:
-            filters["attendance_date"] = {"lte": end_date.isoformat()}
-        
-        attendance_records = supabase_client.select("attendance", filters=filters)
-        
-        if not attendance_records:
-            return 0.0
-        
-        total = len(attendance_records)
-        present = len([r for r in attendance_records if r.get("status") == "present"])
-        
-        return (present / total * 100) if total > 0 else 0.0
+            date_range["lte"] = end_date.isoformat()
+        if date_range:
+            filters["attendance_date"] = date_range
+        return filters
+    
+    @staticmethod
+    async def get_attendance_records(
+        college_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[dict]:
+        """Get attendance rows (student, status, date) for a college within a window"""
+        filters = GovernanceRepository._attendance_window_filters(college_id, start_date, end_date)
+        return await async_supabase_client.select(
+            "attendance",
+            columns="student_id,status,attendance_date",
+            filters=filters
+        )
+    
+    @staticmethod
+    async def get_student_attendance_counts(
+        college_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Per-student (total, present) attendance counts within a window, grouped server-side"""
+        filters = GovernanceRepository._attendance_window_filters(college_id, start_date, end_date)
+        return tuple(await gather_bounded(
+            GovernanceRepository._count_by("attendance", "student_id", filters),
+            GovernanceRepository._count_by("attendance", "student_id", {**filters, "status": "present"}),
+            limit=2
+        ))
+    
+    @staticmethod
+    async def get_student_department_map(college_id: UUID) -> Dict[str, str]:
+        """Map student user IDs to department IDs for a college"""
+        profiles = await async_supabase_client.select(
+            "student_profiles",
+            columns="user_id,department_id",
+            filters={"college_id": str(college_id)}
+        )
+        return {p["user_id"]: p["department_id"] for p in profiles if p.get("department_id")}
     
     @staticmethod
-    def get_pending_certificates_count(college_id: UUID) -> int:
+    async def get_pending_certificates_count(college_id: UUID) -> int:
         """Get count of pending certificate requests"""
-        return supabase_client.count(
+        return await async_supabase_client.count(
             "certificates",
             filters={"college_id": str(college_id), "status": "pending"}
         )
     
     @staticmethod
-    def get_upcoming_events_count(college_id: UUID) -> int:
+    async def get_upcoming_events_count(college_id: UUID) -> int:
         """Get count of upcoming events"""
-        from datetime import datetime
         now = datetime.utcnow().isoformat()
-        events = supabase_client.select(
+        return await async_supabase_client.count(
             "events",
-            filters={"college_id": str(college_id)},
-            order_by="start_date"
+            filters={"college_id": str(college_id), "start_date": {"gt": now}}
         )
-        # Filter events where start_date > now
-        upcoming = [e for e in events if e.get("start_date") and e["start_date"] > now]
-        return len(upcoming)
     
     @staticmethod
-    def get_department_stats(college_id: UUID) -> Dict[str, Any]:
+    async def get_departments(college_id: UUID) -> List[dict]:
+        """Get department IDs and names for a college"""
+        return await async_supabase_client.select(
+            "departments",
+            columns="id,name",
+            filters={"college_id": str(college_id)}
+        )
+    
+    @staticmethod
+    async def get_modules(college_id: UUID) -> List[dict]:
+        """Get curriculum module IDs and titles for a college"""
+        return await async_supabase_client.select(
+            "curriculum_modules",
+            columns="id,title",
+            filters={"college_id": str(college_id)}
+        )
+    
+    @staticmethod
+    async def get_department_stats(college_id: UUID) -> Dict[str, Any]:
         """Get department-wise statistics"""
-        departments = supabase_client.select("departments", filters={"college_id": str(college_id)})
+        departments = await GovernanceRepository.get_departments(college_id)
+        
+        # One grouped count per metric instead of three counts per department
+        college_filter = {"college_id": str(college_id)}
+        students, faculty, postings = await gather_bounded(
+            GovernanceRepository._count_by("student_profiles", "department_id", college_filter),
+            GovernanceRepository._count_by("faculty_profiles", "department_id", college_filter),
+            GovernanceRepository._count_by("postings", "department_id", {**college_filter, "status": "active"}),
+            limit=settings.DASHBOARD_QUERY_CONCURRENCY,
+            label="department statistics"
+        )
         
         stats = {}
         for dept in departments:
-            dept_id = dept["id"]
+            dept_id = str(dept["id"])
             stats[dept["name"]] = {
-                "total_students": supabase_client.count(
-                    "student_profiles",
-                    filters={"department_id": str(dept_id)}
-                ),
-                "total_faculty": supabase_client.count(
-                    "faculty_profiles",
-                    filters={"department_id": str(dept_id)}
-                ),
-                "active_postings": supabase_client.count(
-                    "postings",
-                    filters={"department_id": str(dept_id), "status": "active"}
-                )
+                "total_students": students.get(dept_id, 0),
+                "total_faculty": faculty.get(dept_id, 0),
+                "active_postings": postings.get(dept_id, 0)
             }
         
         return stats
     
     @staticmethod
-    def get_clinical_exposure_stats(college_id: UUID) -> Dict[str, Any]:
+    async def get_clinical_exposure_stats(college_id: UUID) -> Dict[str, Any]:
         """Get clinical exposure statistics"""
-        logbooks = supabase_client.select(
-            "clinical_logbooks",
-            filters={"college_id": str(college_id)}
-        )
-        
-        total_cases = len(logbooks)
-        verified_cases = len([l for l in logbooks if l.get("status") == "verified"])
+        college_filter = {"college_id": str(college_id)}
+        logbook_counts = await GovernanceRepository._count_by("clinical_logbooks", "status", college_filter)
+        total_cases = sum(logbook_counts.values())
+        verified_cases = logbook_counts.get("verified", 0)
         
         # Get posting completion rate
-        postings = supabase_client.select(
-            "postings",
-            filters={"college_id": str(college_id)}
-        )
-        total_postings = len(postings)
-        completed_postings = len([p for p in postings if p.get("status") == "completed"])
+        posting_counts = await GovernanceRepository._count_by("postings", "status", college_filter)
+        total_postings = sum(posting_counts.values())
+        completed_postings = posting_counts.get("completed", 0)
         completion_rate = (completed_postings / total_postings * 100) if total_postings > 0 else 0.0
         
         return {
             "total_cases_logged": total_cases,
             "verified_cases": verified_cases,
+            "submitted_cases": logbook_counts.get("submitted", 0),
+            "total_postings": total_postings,
+            "active_postings": posting_counts.get("active", 0),
+            "completed_postings": completed_postings,
             "posting_completion_rate": completion_rate
         }
     
     @staticmethod
-    def get_academic_performance_stats(college_id: UUID) -> Dict[str, Any]:
-        """Get academic performance statistics"""
-        progress_records = supabase_client.select(
+    async def get_clinical_exposure_by_department(college_id: UUID) -> Dict[str, Dict[str, int]]:
+        """Logbook totals and verified counts keyed by posting department ID"""
+        groups = await async_supabase_client.rpc_if_available(
+            "medconnect_clinical_exposure_by_department",
+            {"p_college_id": str(college_id)}
+        )
+        if groups is not None:
+            return {
+                g["department_id"]: {"total_cases": g["total_cases"], "verified_cases": g["verified_cases"]}
+                for g in groups
+            }
+        
+        # Fallback: fetch both tables once and hash-join logbooks to posting departments
+        college_filter = {"college_id": str(college_id)}
+        postings, logbooks = await gather_bounded(
+            async_supabase_client.select("postings", columns="id,department_id", filters=college_filter),
+            async_supabase_client.select("clinical_logbooks", columns="posting_id,status", filters=college_filter),
+            limit=2
+        )
+        posting_departments = {p["id"]: p["department_id"] for p in postings}
+        
+        exposure: Dict[str, Dict[str, int]] = {}
+        for logbook in logbooks:
+            dept_id = posting_departments.get(logbook.get("posting_id"))
+            if dept_id is None:
+                continue
+            counts = exposure.setdefault(dept_id, {"total_cases": 0, "verified_cases": 0})
+            counts["total_cases"] += 1
+            if logbook.get("status") == "verified":
+                counts["verified_cases"] += 1
+        return exposure
+    
+    @staticmethod
+    async def get_progress_totals(college_id: UUID) -> Dict[str, Any]:
+        """Progress row count, summed completion and distinct students for a college
+        
+        ``completion_count`` counts rows with a completion value (AVG skips NULLs),
+        so ``completion_sum / completion_count`` is the average completion.
+        """
+        groups = await async_supabase_client.aggregate(
+            "student_module_progress",
+            filters={"college_id": str(college_id)},
+            distinct_column="student_id",
+            sum_column="completion_percentage"
+        )
+        group = groups[0] if groups else {}
+        return {
+            "progress_records": group.get("row_count") or 0,
+            "completion_sum": group.get("sum_value") or 0.0,
+            "completion_count": group.get("value_count") or 0,
+            "students_with_progress": group.get("distinct_count") or 0
+        }
+    
+    @staticmethod
+    async def get_module_progress_records(college_id: UUID) -> List[dict]:
+        """Get progress rows (student, module, completion, time) for a college"""
+        return await async_supabase_client.select(
             "student_module_progress",
+            columns="student_id,module_id,completion_percentage,time_spent_minutes",
             filters={"college_id": str(college_id)}
         )
+    
+    @staticmethod
+    async def get_academic_performance_stats(college_id: UUID) -> Dict[str, Any]:
+        """Get academic performance statistics"""
+        college_filter = {"college_id": str(college_id)}
+        module_groups = await async_supabase_client.aggregate(
+            "student_module_progress",
+            group_by="module_id",
+            filters=college_filter,
+            sum_column="completion_percentage"
+        )
         
-        if not progress_records:
+        if not module_groups:
             return {
                 "module_completion_rates": {},
                 "average_completion": 0.0
             }
         
-        # Calculate average completion
-        total_completion = sum(p.get("completion_percentage", 0) for p in progress_records)
-        avg_completion = total_completion / len(progress_records) if progress_records else 0.0
+        # Overall average from per-module SUM and COUNT of non-null completions
+        total_values = sum(g["value_count"] or 0 for g in module_groups)
+        total_completion = sum(g["sum_value"] or 0.0 for g in module_groups)
+        avg_completion = total_completion / total_values if total_values else 0.0
+        
+        students = await async_supabase_client.aggregate(
+            "student_module_progress",
+            filters=college_filter,
+            distinct_column="student_id"
+        )
         
         return {
-            "module_completion_rates": {},
+            "module_completion_rates": {
+                g["group_key"]: (g["sum_value"] / g["value_count"]) if g["value_count"] else 0.0
+                for g in module_groups
+            },
             "average_completion": avg_completion,
-            "total_students_with_progress": len(set(p["student_id"] for p in progress_records))
+            "total_students_with_progress": students[0]["distinct_count"] if students else 0
         }
 
 
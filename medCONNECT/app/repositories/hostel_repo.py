@@ -1,9 +1,9 @@
 """
 Hostel repository for database operations
 """
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from uuid import UUID
-from app.db.supabase import supabase_client
+from app.db.supabase import async_supabase_client
 from app.models.hostel import (
     HostelCreate, HostelUpdate,
     RoomCreate, RoomUpdate,
@@ -20,26 +20,26 @@ class HostelRepository:
     
     # Hostels
     @staticmethod
-    def create_hostel(hostel_data: HostelCreate) -> dict:
+    async def create_hostel(hostel_data: HostelCreate) -> dict:
         """Create a hostel"""
         hostel_dict = hostel_data.model_dump()
         if hostel_dict.get("warden_id"):
             hostel_dict["warden_id"] = str(hostel_dict["warden_id"])
         hostel_dict["college_id"] = str(hostel_dict["college_id"])
-        return supabase_client.insert("hostels", hostel_dict)
+        return await async_supabase_client.insert("hostels", hostel_dict)
     
     @staticmethod
-    def get_hostel(hostel_id: UUID) -> Optional[dict]:
+    async def get_hostel(hostel_id: UUID) -> Optional[dict]:
         """Get hostel by ID"""
-        return supabase_client.select_one("hostels", filters={"id": str(hostel_id)})
+        return await async_supabase_client.select_one("hostels", filters={"id": str(hostel_id)})
     
     @staticmethod
-    def get_hostels_by_college(college_id: UUID) -> List[dict]:
+    async def get_hostels_by_college(college_id: UUID) -> List[dict]:
         """Get hostels for a college"""
-        return supabase_client.select("hostels", filters={"college_id": str(college_id)})
+        return await async_supabase_client.select("hostels", filters={"college_id": str(college_id)})
     
     @staticmethod
-    def update_hostel(hostel_id: UUID, hostel_data: HostelUpdate) -> dict:
+    async def update_hostel(hostel_id: UUID, hostel_data: HostelUpdate) -> dict:
         """Update hostel"""
         update_dict = hostel_data.model_dump(exclude_unset=True)
         if update_dict.get("warden_id"):
@@ -47,33 +47,33 @@ class HostelRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update("hostels", update_dict, filters={"id": str(hostel_id)})
+        result = await async_supabase_client.update("hostels", update_dict, filters={"id": str(hostel_id)})
         if not result:
             raise NotFoundError("Hostel not found")
         return result
     
     # Rooms
     @staticmethod
-    def create_room(room_data: RoomCreate) -> dict:
+    async def create_room(room_data: RoomCreate) -> dict:
         """Create a room"""
         room_dict = room_data.model_dump()
         room_dict["hostel_id"] = str(room_dict["hostel_id"])
         room_dict["status"] = room_dict["status"].value
         room_dict["college_id"] = str(room_dict["college_id"])
-        return supabase_client.insert("rooms", room_dict)
+        return await async_supabase_client.insert("rooms", room_dict)
     
     @staticmethod
-    def get_room(room_id: UUID) -> Optional[dict]:
+    async def get_room(room_id: UUID) -> Optional[dict]:
         """Get room by ID"""
-        return supabase_client.select_one("rooms", filters={"id": str(room_id)})
+        return await async_supabase_client.select_one("rooms", filters={"id": str(room_id)})
     
     @staticmethod
-    def get_rooms_by_hostel(hostel_id: UUID) -> List[dict]:
+    async def get_rooms_by_hostel(hostel_id: UUID) -> List[dict]:
         """Get rooms for a hostel"""
-        return supabase_client.select("rooms", filters={"hostel_id": str(hostel_id)})
+        return await async_supabase_client.select("rooms", filters={"hostel_id": str(hostel_id)})
     
     @staticmethod
-    def update_room(room_id: UUID, room_data: RoomUpdate) -> dict:
+    async def update_room(room_id: UUID, room_data: RoomUpdate) -> dict:
         """Update room"""
         update_dict = room_data.model_dump(exclude_unset=True)
         if update_dict.get("status"):
@@ -81,33 +81,33 @@ class HostelRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update("rooms", update_dict, filters={"id": str(room_id)})
+        result = await async_supabase_client.update("rooms", update_dict, filters={"id": str(room_id)})
         if not result:
             raise NotFoundError("Room not found")
         return result
     
     # Allocations
     @staticmethod
-    def create_allocation(allocation_data: HostelAllocationCreate) -> dict:
+    async def create_allocation(allocation_data: HostelAllocationCreate) -> dict:
         """Create hostel allocation"""
         allocation_dict = allocation_data.model_dump()
         allocation_dict["student_id"] = str(allocation_dict["student_id"])
         allocation_dict["room_id"] = str(allocation_dict["room_id"])
         allocation_dict["hostel_id"] = str(allocation_dict["hostel_id"])
         allocation_dict["college_id"] = str(allocation_dict["college_id"])
-        return supabase_client.insert("hostel_allocations", allocation_dict)
+        return await async_supabase_client.insert("hostel_allocations", allocation_dict)
     
     @staticmethod
-    def get_allocation_by_student(student_id: UUID) -> Optional[dict]:
+    async def get_allocation_by_student(student_id: UUID) -> Optional[dict]:
         """Get active allocation for a student"""
-        allocations = supabase_client.select(
+        allocations = await async_supabase_client.select(
             "hostel_allocations",
             filters={"student_id": str(student_id), "is_active": True}
         )
         return allocations[0] if allocations else None
     
     @staticmethod
-    def update_allocation(allocation_id: UUID, allocation_data: HostelAllocationUpdate) -> dict:
+    async def update_allocation(allocation_id: UUID, allocation_data: HostelAllocationUpdate) -> dict:
         """Update allocation"""
         update_dict = allocation_data.model_dump(exclude_unset=True)
         if update_dict.get("room_id"):
@@ -115,7 +115,7 @@ class HostelRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update(
+        result = await async_supabase_client.update(
             "hostel_allocations",
             update_dict,
             filters={"id": str(allocation_id)}
@@ -126,7 +126,7 @@ class HostelRepository:
     
     # Visitor Logs
     @staticmethod
-    def create_visitor_log(visitor_data: VisitorLogCreate) -> dict:
+    async def create_visitor_log(visitor_data: VisitorLogCreate) -> dict:
         """Create visitor log"""
         visitor_dict = visitor_data.model_dump()
         visitor_dict["student_id"] = str(visitor_dict["student_id"])
@@ -134,24 +134,29 @@ class HostelRepository:
             visitor_dict["approved_by"] = str(visitor_dict["approved_by"])
         visitor_dict["status"] = visitor_dict["status"].value
         visitor_dict["college_id"] = str(visitor_dict["college_id"])
-        return supabase_client.insert("visitor_logs", visitor_dict)
+        return await async_supabase_client.insert("visitor_logs", visitor_dict)
     
     @staticmethod
-    def get_visitor_log(visitor_id: UUID) -> Optional[dict]:
+    async def get_visitor_log(visitor_id: UUID) -> Optional[dict]:
         """Get visitor log by ID"""
-        return supabase_client.select_one("visitor_logs", filters={"id": str(visitor_id)})
+        return await async_supabase_client.select_one("visitor_logs", filters={"id": str(visitor_id)})
     
     @staticmethod
-    def get_visitor_logs_by_student(student_id: UUID) -> List[dict]:
-        """Get visitor logs for a student"""
-        return supabase_client.select(
+    async def get_visitor_logs_by_student(
+        student_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get visitor logs for a student (one page, newest first)"""
+        return await async_supabase_client.select_page(
             "visitor_logs",
             filters={"student_id": str(student_id)},
-            order_by="visit_date"
+            cursor=cursor,
+            limit=limit
         )
     
     @staticmethod
-    def update_visitor_log(visitor_id: UUID, visitor_data: VisitorLogUpdate) -> dict:
+    async def update_visitor_log(visitor_id: UUID, visitor_data: VisitorLogUpdate) -> dict:
         """Update visitor log"""
         update_dict = visitor_data.model_dump(exclude_unset=True)
         if update_dict.get("status"):
@@ -161,7 +166,7 @@ class HostelRepository:
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update(
+        result = await async_supabase_client.update(
             "visitor_logs",
             update_dict,
             filters={"id": str(visitor_id)}
@@ -172,17 +177,17 @@ class HostelRepository:
     
     # Movement Logs
     @staticmethod
-    def create_movement_log(movement_data: MovementLogCreate) -> dict:
+    async def create_movement_log(movement_data: MovementLogCreate) -> dict:
         """Create movement log"""
         movement_dict = movement_data.model_dump()
         movement_dict["student_id"] = str(movement_dict["student_id"])
         movement_dict["college_id"] = str(movement_dict["college_id"])
-        return supabase_client.insert("movement_logs", movement_dict)
+        return await async_supabase_client.insert("movement_logs", movement_dict)
     
     @staticmethod
-    def get_movement_logs_by_student(student_id: UUID) -> List[dict]:
+    async def get_movement_logs_by_student(student_id: UUID) -> List[dict]:
         """Get movement logs for a student"""
-        return supabase_client.select(
+        return await async_supabase_client.select(
             "movement_logs",
             filters={"student_id": str(student_id)},
             order_by="timestamp"
@@ -190,20 +195,20 @@ class HostelRepository:
     
     # Mess Attendance
     @staticmethod
-    def create_mess_attendance(attendance_data: MessAttendanceCreate) -> dict:
+    async def create_mess_attendance(attendance_data: MessAttendanceCreate) -> dict:
         """Create mess attendance"""
         attendance_dict = attendance_data.model_dump()
         attendance_dict["student_id"] = str(attendance_dict["student_id"])
         attendance_dict["college_id"] = str(attendance_dict["college_id"])
-        return supabase_client.insert("mess_attendance", attendance_dict)
+        return await async_supabase_client.insert("mess_attendance", attendance_dict)
     
     @staticmethod
-    def get_mess_attendance_by_student(student_id: UUID, date: str = None) -> List[dict]:
+    async def get_mess_attendance_by_student(student_id: UUID, date: str = None) -> List[dict]:
         """Get mess attendance for a student"""
         filters = {"student_id": str(student_id)}
         if date:
             filters["attendance_date"] = date
-        return supabase_client.select("mess_attendance", filters=filters)
+        return await async_supabase_client.select("mess_attendance", filters=filters)
 
 
 
@@ -1,9 +1,10 @@
 """
 User repository for database operations
 """
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from uuid import UUID
-from app.db.supabase import supabase_client
+from app.db.supabase import async_supabase_client
+from app.db.cache import profile_cache
 from app.models.user import UserCreate, UserUpdate, UserResponse, StudentProfile, FacultyProfile
 from app.core.exceptions import NotFoundError, ConflictError
 from datetime import datetime
@@ -13,10 +14,10 @@ class UserRepository:
     """Repository for user operations"""
     
     @staticmethod
-    def create_user(user_data: UserCreate, user_id: str) -> dict:
+    async def create_user(user_data: UserCreate, user_id: str) -> dict:
         """Create a new user profile (after Supabase Auth user is created)"""
         # Check if email already exists
-        existing = supabase_client.select_one(
+        existing = await async_supabase_client.select_one(
             "users",
             filters={"email": user_data.email, "college_id": str(user_data.college_id)}
         )
@@ -32,49 +33,68 @@ class UserRepository:
         user_dict["college_id"] = str(user_dict["college_id"])
         user_dict["role"] = user_dict["role"].value
         
-        result = supabase_client.insert("users", user_dict)
+        result = await async_supabase_client.insert("users", user_dict)
         return result
     
     @staticmethod
-    def get_user_by_id(user_id: UUID) -> Optional[dict]:
-        """Get user by ID"""
-        return supabase_client.select_one("users", filters={"id": str(user_id)})
+    async def get_user_by_id(user_id: UUID) -> Optional[dict]:
+        """Get user by ID (served from the profile cache when possible)"""
+        cached = await profile_cache.get(str(user_id))
+        if cached is not None:
+            return cached
+        
+        users = await async_supabase_client.select(
+            "users",
+            columns=",".join(profile_cache.FIELDS),
+            filters={"id": str(user_id)},
+            limit=1
+        )
+        if not users:
+            return None
+        await profile_cache.set(str(user_id), users[0])
+        return users[0]
     
     @staticmethod
-    def get_user_by_email(email: str, college_id: UUID) -> Optional[dict]:
+    async def get_user_by_email(email: str, college_id: UUID) -> Optional[dict]:
         """Get user by email and college"""
-        return supabase_client.select_one(
+        return await async_supabase_client.select_one(
             "users",
             filters={"email": email, "college_id": str(college_id)}
         )
     
     @staticmethod
-    def update_user(user_id: UUID, user_data: UserUpdate) -> dict:
+    async def update_user(user_id: UUID, user_data: UserUpdate) -> dict:
         """Update user"""
         update_dict = user_data.model_dump(exclude_unset=True)
         if not update_dict:
             raise ValueError("No fields to update")
         
-        result = supabase_client.update(
+        result = await async_supabase_client.update(
             "users",
             update_dict,
             filters={"id": str(user_id)}
         )
         if not result:
             raise NotFoundError("User not found")
+        await profile_cache.invalidate(str(user_id))
         return result
     
     @staticmethod
-    def get_users_by_college(college_id: UUID, role: Optional[str] = None) -> List[dict]:
-        """Get all users for a college, optionally filtered by role"""
+    async def get_users_by_college(
+        college_id: UUID,
+        role: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get users for a college, optionally filtered by role (one page, newest first)"""
         filters = {"college_id": str(college_id)}
         if role:
             filters["role"] = role
         
-        return supabase_client.select("users", filters=filters)
+        return await async_supabase_client.select_page("users", filters=filters, cursor=cursor, limit=limit)
     
     @staticmethod
-    def create_student_profile(profile_data: StudentProfile) -> dict:
+    async def create_student_profile(profile_data: StudentProfile) -> dict:
         """Create student profile"""
         profile_dict = profile_data.model_dump()
         profile_dict["user_id"] = str(profile_dict["user_id"])
@@ -86,27 +106,27 @@ class UserRepository:
             profile_dict["hostel_id"] = str(profile_dict["hostel_id"])
         profile_dict["college_id"] = str(profile_dict["college_id"])
         
-        return supabase_client.insert("student_profiles", profile_dict)
+        return await async_supabase_client.insert("student_profiles", profile_dict)
     
     @staticmethod
-    def get_student_profile(user_id: UUID) -> Optional[dict]:
+    async def get_student_profile(user_id: UUID) -> Optional[dict]:
         """Get student profile"""
-        return supabase_client.select_one("student_profiles", filters={"user_id": str(user_id)})
+        return await async_supabase_client.select_one("student_profiles", filters={"user_id": str(user_id)})
     
     @staticmethod
-    def create_faculty_profile(profile_data: FacultyProfile) -> dict:
+    async def create_faculty_profile(profile_data: FacultyProfile) -> dict:
         """Create faculty profile"""
         profile_dict = profile_data.model_dump()
         profile_dict["user_id"] = str(profile_dict["user_id"])
         profile_dict["department_id"] = str(profile_dict["department_id"])
         profile_dict["college_id"] = str(profile_dict["college_id"])
         
-        return supabase_client.insert("faculty_profiles", profile_dict)
+        return await async_supabase_client.insert("faculty_profiles", profile_dict)
     
     @staticmethod
-    def get_faculty_profile(user_id: UUID) -> Optional[dict]:
+    async def get_faculty_profile(user_id: UUID) -> Optional[dict]:
         """Get faculty profile"""
-        return supabase_client.select_one("faculty_profiles", filters={"user_id": str(user_id)})
+        return await async_supabase_client.select_one("faculty_profiles", filters={"user_id": str(user_id)})
 
 
 
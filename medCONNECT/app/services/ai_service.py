@@ -3,7 +3,9 @@ AI services for academic and governance assistance
 """
 from typing import Optional, List, Dict, Any
 from app.core.config import settings
-from app.db.supabase import supabase_client
+from app.core.timing import span, AI
+from app.db.supabase import async_supabase_client
+from fastapi.concurrency import run_in_threadpool
 from loguru import logger
 import json
 
@@ -27,10 +29,15 @@ class AIService:
             except Exception as e:
                 logger.error(f"Failed to initialize OpenAI client: {e}")
     
-    def _get_module_context(self, module_id: str) -> str:
+    def _create_completion(self, **kwargs):
+        """Chat completion call, timed as an ``ai`` span"""
+        with span(AI, f"chat.completions {kwargs.get('model')}"):
+            return self.client.chat.completions.create(**kwargs)
+    
+    async def _get_module_context(self, module_id: str) -> str:
         """Get module context for AI queries"""
         try:
-            module = supabase_client.select_one("curriculum_modules", filters={"id": module_id})
+            module = await async_supabase_client.select_one("curriculum_modules", filters={"id": module_id})
             if module:
                 topics = ", ".join(module.get("topics", []))
                 objectives = ", ".join(module.get("learning_objectives", []))
@@ -39,7 +46,7 @@ class AIService:
             logger.error(f"Error fetching module context: {e}")
         return ""
     
-    def academic_query(self, query: str, context: Optional[str] = None, module_id: Optional[str] = None) -> dict:
+    async def academic_query(self, query: str, context: Optional[str] = None, module_id: Optional[str] = None) -> dict:
         """Process academic query using AI with NMC-aligned medical education context"""
         if not self.client:
             return {
@@ -68,7 +75,7 @@ class AIService:
             
             user_context = context or ""
             if module_id:
-                module_context = self._get_module_context(str(module_id))
+                module_context = await self._get_module_context(str(module_id))
                 user_context = f"{user_context}\n\n{module_context}" if user_context else module_context
             
             messages = [
@@ -76,7 +83,8 @@ class AIService:
                 {"role": "user", "content": f"Context: {user_context}\n\nQuestion: {query}\n\nPlease provide a comprehensive answer with explanation, mnemonics if helpful, and study tips."}
             ]
             
-            response = self.client.chat.completions.create(
+            response = await run_in_threadpool(
+                self._create_completion,
                 model="gpt-4o-mini",  # Using cost-effective model
                 messages=messages,
                 temperature=0.7,
@@ -114,7 +122,7 @@ class AIService:
                 "study_tips": []
             }
     
-    def generate_study_plan(self, student_id: str, module_ids: List[str], weak_areas: Optional[List[str]] = None) -> dict:
+    async def generate_study_plan(self, student_id: str, module_ids: List[str], weak_areas: Optional[List[str]] = None) -> dict:
         """Generate personalized study plan using AI"""
         if not self.client:
             return {
@@ -127,7 +135,7 @@ class AIService:
             # Get module information
             modules_info = []
             for module_id in module_ids:
-                module = supabase_client.select_one("curriculum_modules", filters={"id": module_id})
+                module = await async_supabase_client.select_one("curriculum_modules", filters={"id": module_id})
                 if module:
                     modules_info.append(f"- {module.get('title', '')}: {', '.join(module.get('topics', [])[:3])}")
             
@@ -147,7 +155,8 @@ Provide a weekly study plan with:
 
 Format as a structured plan."""
             
-            response = self.client.chat.completions.create(
+            response = await run_in_threadpool(
+                self._create_completion,
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are a study planning assistant for medical students. Create practical, achievable study plans."},
@@ -175,31 +184,37 @@ Format as a structured plan."""
                 "weak_areas": weak_areas or []
             }
     
-    def detect_weak_areas(self, student_id: str) -> List[str]:
+    async def detect_weak_areas(self, student_id: str) -> List[str]:
         """Detect weak areas from student progress data"""
         try:
             # Get student progress
-            progress_records = supabase_client.select(
+            progress_records = await async_supabase_client.select(
                 "student_module_progress",
                 filters={"student_id": student_id}
             )
             
-            weak_areas = []
-            for record in progress_records:
-                completion = record.get("completion_percentage", 0)
-                if completion < 50:  # Threshold for weak area
-                    module_id = record.get("module_id")
-                    module = supabase_client.select_one("curriculum_modules", filters={"id": module_id})
-                    if module:
-                        weak_areas.append(module.get("title", "Unknown Module"))
-            
-            return weak_areas
+            weak_module_ids = [
+                record.get("module_id")
+                for record in progress_records
+                if record.get("completion_percentage", 0) < 50  # Threshold for weak area
+            ]
+            if not weak_module_ids:
+                return []
+            
+            # Fetch every weak module's title in one query
+            modules = await async_supabase_client.select(
+                "curriculum_modules",
+                columns="id,title",
+                filters={"id": {"in": weak_module_ids}}
+            )
+            titles = {m["id"]: m.get("title", "Unknown Module") for m in modules}
+            return [titles[module_id] for module_id in weak_module_ids if module_id in titles]
             
         except Exception as e:
             logger.error(f"Error detecting weak areas: {e}")
             return []
     
-    def compare_concepts(self, concept1: str, concept2: str, subject: Optional[str] = None) -> dict:
+    async def compare_concepts(self, concept1: str, concept2: str, subject: Optional[str] = None) -> dict:
         """Compare two medical concepts using AI"""
         if not self.client:
             return {
@@ -221,7 +236,8 @@ Provide:
 - When to use each concept
 - Clinical applications"""
             
-            response = self.client.chat.completions.create(
+            response = await run_in_threadpool(
+                self._create_completion,
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are a medical education assistant. Provide clear, accurate comparisons."},
@@ -264,7 +280,7 @@ Provide:
                 "summary": f"Error: {str(e)}"
             }
     
-    def governance_query(self, query: str, metrics_type: Optional[str] = None, college_id: Optional[str] = None) -> dict:
+    async def governance_query(self, query: str, metrics_type: Optional[str] = None, college_id: Optional[str] = None) -> dict:
         """Process governance query using AI with institutional data context"""
         if not self.client:
             return {
@@ -293,7 +309,8 @@ Provide:
             
             Be specific, data-driven, and focused on improving medical education outcomes."""
             
-            response = self.client.chat.completions.create(
+            response = await run_in_threadpool(
+                self._create_completion,
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -0,0 +1,96 @@
+"""
+Student attendance engine: per-student rates and NMC minimum-attendance flags
+"""
+import math
+from typing import List, Dict, Any
+from loguru import logger
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.warning("NumPy not installed. Student attendance will use the pure-Python path.")
+
+# NMC minimum attendance requirement (%)
+MIN_ATTENDANCE_RATE = 75.0
+
+# Supported orderings for student attendance lists
+STUDENT_SORTS = ("risk", "rate")
+
+
+def _sessions_needed(present: int, total: int, threshold: float) -> int:
+    """Consecutive present sessions needed to reach ``threshold`` (< 100)"""
+    return max(math.ceil((threshold * total - 100 * present) / (100 - threshold)), 0)
+
+
+def _rank_python(
+    students: List[str],
+    totals: List[int],
+    presents: List[int],
+    threshold: float
+) -> List[Dict[str, Any]]:
+    """Pure-Python equivalent of ``_rank_numpy``"""
+    rows = [
+        {
+            "student_id": student_id,
+            "present": present,
+            "total": total,
+            "attendance_rate": present / total * 100,
+            "below_threshold": present / total * 100 < threshold,
+            "sessions_needed": _sessions_needed(present, total, threshold)
+        }
+        for student_id, total, present in zip(students, totals, presents)
+    ]
+    rows.sort(key=lambda row: row["attendance_rate"])
+    return rows
+
+
+def _rank_numpy(
+    students: List[str],
+    totals: List[int],
+    presents: List[int],
+    threshold: float
+) -> List[Dict[str, Any]]:
+    """Rates, flags and sessions needed for every student at once, lowest rate first"""
+    total = np.asarray(totals, dtype=float)
+    present = np.asarray(presents, dtype=float)
+    rates = present / total * 100
+    flagged = rates < threshold
+    needed = np.maximum(np.ceil((threshold * total - 100 * present) / (100 - threshold)), 0)
+
+    order = np.argsort(rates, kind="stable")
+    return [
+        {
+            "student_id": students[i],
+            "present": int(present[i]),
+            "total": int(total[i]),
+            "attendance_rate": float(rates[i]),
+            "below_threshold": bool(flagged[i]),
+            "sessions_needed": int(needed[i])
+        }
+        for i in order.tolist()
+    ]
+
+
+def rank_student_attendance(
+    totals: Dict[str, int],
+    presents: Dict[str, int],
+    threshold: float = MIN_ATTENDANCE_RATE
+) -> List[Dict[str, Any]]:
+    """Per-student attendance ordered by risk (lowest rate first)
+
+    ``totals`` and ``presents`` map student IDs to record counts in the
+    window, e.g. from grouped server-side counts. Students without records
+    are skipped. ``sessions_needed`` is how many consecutive present
+    sessions would bring the student up to ``threshold``.
+    """
+    students = [student_id for student_id, total in totals.items() if total > 0]
+    if not students:
+        return []
+    student_totals = [totals[s] for s in students]
+    student_presents = [presents.get(s, 0) for s in students]
+
+    if NUMPY_AVAILABLE:
+        return _rank_numpy(students, student_totals, student_presents, threshold)
+    return _rank_python(students, student_totals, student_presents, threshold)
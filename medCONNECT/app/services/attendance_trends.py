@@ -0,0 +1,99 @@
+"""
+Attendance trend engine: buckets attendance rows by day or month in one pass
+"""
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+from calendar import month_abbr
+from loguru import logger
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.warning("NumPy not installed. Attendance trends will use the pure-Python path.")
+
+# Above this many rows the NumPy path is used (when available)
+VECTORIZE_THRESHOLD = 5000
+
+
+def _bucket_python(
+    records: List[Dict[str, Any]],
+    key_length: int,
+    date_key: str = "attendance_date",
+    count_key: Optional[str] = None
+) -> Dict[str, List[int]]:
+    """Count [total, present] per date prefix ("YYYY-MM-DD" or "YYYY-MM")"""
+    buckets: Dict[str, List[int]] = {}
+    for record in records:
+        record_date = record.get(date_key)
+        if not record_date:
+            continue
+        weight = record.get(count_key, 0) if count_key else 1
+        counts = buckets.setdefault(record_date[:key_length], [0, 0])
+        counts[0] += weight
+        if record.get("status") == "present":
+            counts[1] += weight
+    return buckets
+
+
+def _bucket_numpy(
+    records: List[Dict[str, Any]],
+    granularity: str,
+    date_key: str = "attendance_date",
+    count_key: Optional[str] = None
+) -> Dict[str, List[int]]:
+    """Vectorized equivalent of ``_bucket_python`` for large windows"""
+    dated = [r for r in records if r.get(date_key)]
+    if not dated:
+        return {}
+
+    unit = "D" if granularity == "day" else "M"
+    days = np.array([r[date_key][:10] for r in dated], dtype="datetime64[D]")
+    periods = days.astype(f"datetime64[{unit}]")
+    if count_key:
+        weights = np.fromiter((r.get(count_key, 0) for r in dated), dtype=float, count=len(dated))
+    else:
+        weights = np.ones(len(dated))
+    present = np.fromiter((r.get("status") == "present" for r in dated), dtype=bool, count=len(dated))
+
+    keys, index = np.unique(periods, return_inverse=True)
+    totals = np.bincount(index, weights=weights, minlength=len(keys))
+    presents = np.bincount(index, weights=weights * present, minlength=len(keys))
+    return {
+        str(key): [int(total), int(hits)]
+        for key, total, hits in zip(keys, totals, presents)
+    }
+
+
+def compute_attendance_trends(
+    records: List[Dict[str, Any]],
+    granularity: str = "day",
+    date_key: str = "attendance_date",
+    count_key: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Turn attendance rows into an ordered list of per-day or per-month rates
+
+    ``records`` need ``date_key`` (ISO string) and ``status``. Pre-aggregated
+    rows (the daily rollup) pass ``count_key`` to weight each row. Only
+    periods with at least one record are returned, oldest first.
+    """
+    if granularity not in ("day", "month"):
+        raise ValueError(f"Unsupported granularity: {granularity}")
+
+    if NUMPY_AVAILABLE and len(records) >= VECTORIZE_THRESHOLD:
+        buckets = _bucket_numpy(records, granularity, date_key, count_key)
+    else:
+        buckets = _bucket_python(records, 10 if granularity == "day" else 7, date_key, count_key)
+
+    trends = []
+    for key in sorted(buckets):
+        total, present = buckets[key]
+        point = {
+            "date": key,
+            "rate": (present / total * 100) if total > 0 else 0.0
+        }
+        if granularity == "month":
+            point["month"] = month_abbr[datetime.strptime(key, "%Y-%m").month]
+        trends.append(point)
+    return trends
@@ -3,6 +3,7 @@ Authentication service using Supabase Auth
 """
 from typing import Optional
 from uuid import UUID
+from fastapi.concurrency import run_in_threadpool
 from app.core.exceptions import UnauthorizedError, NotFoundError, ConflictError
 from app.repositories.user_repo import UserRepository
 from app.models.user import LoginRequest, TokenResponse, UserResponse, UserCreate
@@ -14,11 +15,11 @@ class AuthService:
     """Service for authentication operations"""
     
     @staticmethod
-    def register_user(user_data: UserCreate) -> dict:
+    async def register_user(user_data: UserCreate) -> dict:
         """Register a new user using Supabase Auth"""
         try:
             # Check if user already exists in our users table
-            existing = UserRepository.get_user_by_email(user_data.email, user_data.college_id)
+            existing = await UserRepository.get_user_by_email(user_data.email, user_data.college_id)
             if existing:
                 raise ConflictError("User with this email already exists")
             
@@ -29,7 +30,7 @@ class AuthService:
             # This bypasses email confirmation requirement
             try:
                 # Create user via admin API (auto-confirms)
-                admin_response = client.auth.admin.create_user({
+                admin_response = await run_in_threadpool(client.auth.admin.create_user, {
                     "email": user_data.email,
                     "password": user_data.password,
                     "email_confirm": True,  # Auto-confirm email
@@ -52,7 +53,7 @@ class AuthService:
             except AttributeError:
                 # Fallback: If admin API not available, use regular sign_up
                 # Note: User will need to confirm email unless disabled in Supabase settings
-                auth_response = client.auth.sign_up({
+                auth_response = await run_in_threadpool(client.auth.sign_up, {
                     "email": user_data.email,
                     "password": user_data.password,
                     "options": {
@@ -70,7 +71,8 @@ class AuthService:
                 
                 # Try to auto-confirm using admin API
                 try:
-                    client.auth.admin.update_user_by_id(
+                    await run_in_threadpool(
+                        client.auth.admin.update_user_by_id,
                         auth_response.user.id,
                         {"email_confirm": True}
                     )
@@ -88,7 +90,7 @@ class AuthService:
                 raise UnauthorizedError("Failed to create user account")
             
             # Create user profile in our users table
-            user = UserRepository.create_user(user_data, str(auth_response.user.id))
+            user = await UserRepository.create_user(user_data, str(auth_response.user.id))
             
             logger.info(f"User registered successfully: {user_data.email}")
             return user
@@ -104,12 +106,12 @@ class AuthService:
             raise UnauthorizedError(f"Registration failed: {str(e)}")
     
     @staticmethod
-    def login(login_data: LoginRequest, college_id: UUID) -> TokenResponse:
+    async def login(login_data: LoginRequest, college_id: UUID) -> TokenResponse:
         """Authenticate user using Supabase Auth and return tokens"""
         try:
             # Authenticate with Supabase Auth
             client = supabase_client.get_client()
-            auth_response = client.auth.sign_in_with_password({
+            auth_response = await run_in_threadpool(client.auth.sign_in_with_password, {
                 "email": login_data.email,
                 "password": login_data.password
             })
@@ -118,7 +120,7 @@ class AuthService:
                 raise UnauthorizedError("Invalid email or password")
             
             # Get user from our users table
-            user = UserRepository.get_user_by_id(UUID(auth_response.user.id))
+            user = await UserRepository.get_user_by_id(UUID(auth_response.user.id))
             
             # If user doesn't exist in our table but exists in Supabase Auth, create profile
             if not user:
@@ -139,7 +141,7 @@ class AuthService:
                         role=UserRole(role_str),
                         college_id=UUID(user_metadata.get("college_id", str(college_id)))
                     )
-                    user = UserRepository.create_user(user_create, str(auth_user.id))
+                    user = await UserRepository.create_user(user_create, str(auth_user.id))
                     logger.info(f"Created user profile for {login_data.email}")
                 except Exception as create_error:
                     logger.error(f"Failed to create user profile: {create_error}")
@@ -183,12 +185,12 @@ class AuthService:
             raise UnauthorizedError(f"Login failed: {str(e)}")
     
     @staticmethod
-    def refresh_access_token(refresh_token: str) -> dict:
+    async def refresh_access_token(refresh_token: str) -> dict:
         """Refresh access token using Supabase Auth"""
         try:
             client = supabase_client.get_client()
             # Set the session with refresh token
-            auth_response = client.auth.refresh_session(refresh_token)
+            auth_response = await run_in_threadpool(client.auth.refresh_session, refresh_token)
             
             if not auth_response.session:
                 raise UnauthorizedError("Invalid or expired refresh token")
@@ -204,12 +206,12 @@ class AuthService:
             raise UnauthorizedError("Failed to refresh token")
     
     @staticmethod
-    def logout(access_token: str):
+    async def logout(access_token: str):
         """Logout user using Supabase Auth"""
         try:
             client = supabase_client.get_client()
             # Sign out the user
-            client.auth.sign_out()
+            await run_in_threadpool(client.auth.sign_out)
             return {"message": "Logged out successfully"}
         except Exception as e:
             logger.error(f"Logout error: {e}")
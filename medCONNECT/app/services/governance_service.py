@@ -1,15 +1,38 @@
 """
 Governance service for analytics and dashboards
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta
+import asyncio
+from app.core.config import settings
+from app.core.concurrency import gather_bounded
 from app.repositories.governance_repo import GovernanceRepository
+from app.repositories.attendance_rollup_repo import AttendanceRollupRepository
+from app.repositories.college_repo import CollegeRepository
+from app.db.cache import governance_cache
+from app.services.attendance_trends import compute_attendance_trends
+from app.services.attendance_flags import rank_student_attendance, STUDENT_SORTS
 from app.models.governance import (
     DashboardMetrics,
     AttendanceAnalytics,
     ClinicalExposureAnalytics,
-    AcademicPerformanceAnalytics
+    AcademicPerformanceAnalytics,
+    StateRollupAnalytics
+)
+from loguru import logger
+
+# Average completion (%) below which a module or student is flagged
+WEAK_AREA_THRESHOLD = 50
+
+# Student average-completion bands reported in the academic summary
+COMPLETION_BUCKETS = ("0-25", "25-50", "50-75", "75-100")
+
+# Additive per-college counts (DashboardMetrics.college_totals), summed across colleges
+PARTIAL_KEYS = (
+    "total_students", "total_faculty", "attendance_total", "attendance_present",
+    "total_cases_logged", "verified_cases", "total_postings", "completed_postings",
+    "progress_records", "completion_sum", "completion_count", "students_with_progress"
 )
 
 
@@ -17,156 +40,180 @@ class GovernanceService:
     """Service for governance operations"""
     
     @staticmethod
-    def get_dashboard_metrics(college_id: UUID) -> DashboardMetrics:
-        """Get dashboard metrics for governance"""
+    async def get_dashboard_metrics(college_id: UUID) -> DashboardMetrics:
+        """Get dashboard metrics for governance, with the counts the state rollup merges"""
         repo = GovernanceRepository
         
-        total_students = repo.get_user_count_by_college(college_id, role="student")
-        total_faculty = repo.get_user_count_by_college(college_id, role="faculty")
-        active_postings = repo.get_active_postings_count(college_id)
-        pending_logbooks = repo.get_pending_logbooks_count(college_id)
-        attendance_rate = repo.get_attendance_rate(college_id)
-        pending_certificates = repo.get_pending_certificates_count(college_id)
-        upcoming_events = repo.get_upcoming_events_count(college_id)
-        department_stats = repo.get_department_stats(college_id)
+        # Independent queries: latency is the slowest one rather than the sum.
+        # Clinical stats are grouped status counts, so they also cover active postings and pending logbooks.
+        # Users are counted per role: aggregation over users is not exposed (see migration_update_governance_aggregates.sql).
+        (
+            total_students,
+            total_faculty,
+            attendance,
+            pending_certificates,
+            upcoming_events,
+            department_stats,
+            clinical,
+            progress
+        ) = await gather_bounded(
+            repo.get_user_count_by_college(college_id, role="student"),
+            repo.get_user_count_by_college(college_id, role="faculty"),
+            repo.get_attendance_status_counts(college_id),
+            repo.get_pending_certificates_count(college_id),
+            repo.get_upcoming_events_count(college_id),
+            repo.get_department_stats(college_id),
+            repo.get_clinical_exposure_stats(college_id),
+            repo.get_progress_totals(college_id),
+            limit=settings.DASHBOARD_QUERY_CONCURRENCY,
+            timeout=settings.DASHBOARD_TIMEOUT,
+            label="dashboard metrics"
+        )
+        attendance_total = sum(attendance.values())
         
         return DashboardMetrics(
             total_students=total_students,
             total_faculty=total_faculty,
-            active_postings=active_postings,
-            pending_logbooks=pending_logbooks,
-            attendance_rate=attendance_rate,
+            active_postings=clinical["active_postings"],
+            pending_logbooks=clinical["submitted_cases"],
+            attendance_rate=_rate(attendance.get("present", 0), attendance_total),
             certificate_requests_pending=pending_certificates,
             upcoming_events=upcoming_events,
-            department_wise_stats=department_stats
+            department_wise_stats=department_stats,
+            college_totals={
+                "total_students": total_students,
+                "total_faculty": total_faculty,
+                "attendance_total": attendance_total,
+                "attendance_present": attendance.get("present", 0),
+                "total_cases_logged": clinical["total_cases_logged"],
+                "verified_cases": clinical["verified_cases"],
+                "total_postings": clinical["total_postings"],
+                "completed_postings": clinical["completed_postings"],
+                **progress
+            }
         )
     
     @staticmethod
-    def get_attendance_analytics(college_id: UUID, days: int = 30) -> AttendanceAnalytics:
+    async def get_attendance_analytics(college_id: UUID, days: int = 30) -> AttendanceAnalytics:
         """Get attendance analytics"""
         repo = GovernanceRepository
         
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
         
-        overall_rate = repo.get_attendance_rate(college_id, start_date, end_date)
-        
-        # Get department-wise attendance
-        from app.db.supabase import supabase_client
-        departments = supabase_client.select("departments", filters={"college_id": str(college_id)})
-        
-        dept_attendance = {}
-        for dept in departments:
-            # Get students in this department
-            students = supabase_client.select(
-                "student_profiles",
-                filters={"department_id": str(dept["id"])}
-            )
-            if students:
-                student_ids = [s["user_id"] for s in students]
-                # Calculate attendance for these students
-                attendance_records = supabase_client.select(
-                    "attendance",
-                    filters={"college_id": str(college_id)}
-                )
-                dept_attendance_records = [
-                    a for a in attendance_records 
-                    if a.get("student_id") in student_ids
-                ]
-                if dept_attendance_records:
-                    total = len(dept_attendance_records)
-                    present = len([a for a in dept_attendance_records if a.get("status") == "present"])
-                    dept_attendance[dept["name"]] = (present / total * 100) if total > 0 else 0.0
-        
-        # Calculate daily attendance trends for the period
-        attendance_trends = []
-        if days <= 30:  # For short periods, calculate daily trends
-            for i in range(days):
-                day_start = end_date - timedelta(days=days - i)
-                day_end = day_start + timedelta(days=1)
-                day_records = supabase_client.select(
-                    "attendance",
-                    filters={"college_id": str(college_id)}
-                )
-                # Filter records for this day
-                day_attendance = [
-                    r for r in day_records
-                    if r.get("attendance_date") and 
-                    day_start.isoformat() <= r["attendance_date"] < day_end.isoformat()
-                ]
-                if day_attendance:
-                    total = len(day_attendance)
-                    present = len([r for r in day_attendance if r.get("status") == "present"])
-                    rate = (present / total * 100) if total > 0 else 0.0
-                    attendance_trends.append({
-                        "date": day_start.strftime("%Y-%m-%d"),
-                        "rate": rate
-                    })
-        else:  # For longer periods, calculate monthly trends
-            from calendar import month_abbr
-            for i in range(6):  # Last 6 months
-                month_date = end_date - timedelta(days=30 * (6 - i))
-                month_start = month_date.replace(day=1)
-                if i < 5:
-                    month_end = (month_start + timedelta(days=32)).replace(day=1)
-                else:
-                    month_end = end_date
-                
-                month_records = supabase_client.select(
-                    "attendance",
-                    filters={"college_id": str(college_id)}
-                )
-                month_attendance = [
-                    r for r in month_records
-                    if r.get("attendance_date") and 
-                    month_start.isoformat() <= r["attendance_date"] < month_end.isoformat()
-                ]
-                if month_attendance:
-                    total = len(month_attendance)
-                    present = len([r for r in month_attendance if r.get("status") == "present"])
-                    rate = (present / total * 100) if total > 0 else 0.0
-                    attendance_trends.append({
-                        "date": month_start.strftime("%Y-%m"),
-                        "rate": rate,
-                        "month": month_abbr[month_start.month]
-                    })
+        departments = await repo.get_departments(college_id)
+        department_names = {d["id"]: d["name"] for d in departments}
+        granularity = "day" if days <= 30 else "month"
+        
+        # Prefer the daily rollup: rows scale with days x departments, not attendance volume.
+        # Per-student counts come from grouped server-side counts in parallel.
+        rollup, (student_totals, student_presents) = await gather_bounded(
+            AttendanceRollupRepository.get_daily_rollup(college_id, start_date, end_date),
+            repo.get_student_attendance_counts(college_id, start_date, end_date),
+            limit=2,
+            label="attendance analytics"
+        )
+        student_departments = None
+        if rollup is not None:
+            records = rollup
+            date_key, count_key = "rollup_date", "record_count"
+        else:
+            # Fetch the window and the student -> department map once
+            student_departments = await repo.get_student_department_map(college_id)
+            records = await repo.get_attendance_records(college_id, start_date, end_date)
+            date_key, count_key = "attendance_date", None
+        
+        total = 0
+        present = 0
+        dept_counts: Dict[str, List[int]] = {}  # department_id -> [total, present]
+        for record in records:
+            weight = record.get(count_key, 0) if count_key else 1
+            hits = weight if record.get("status") == "present" else 0
+            total += weight
+            present += hits
+            if student_departments is None:
+                dept_id = record.get("department_id")
+            else:
+                dept_id = student_departments.get(record.get("student_id"))
+            if dept_id in department_names:
+                counts = dept_counts.setdefault(dept_id, [0, 0])
+                counts[0] += weight
+                counts[1] += hits
+        
+        overall_rate = (present / total * 100) if total > 0 else 0.0
+        dept_attendance = {
+            department_names[dept_id]: (dept_present / dept_total * 100)
+            for dept_id, (dept_total, dept_present) in dept_counts.items()
+            if dept_total > 0
+        }
+        
+        # Daily trends for short periods, monthly for longer ones, from the same rows
+        attendance_trends = compute_attendance_trends(records, granularity, date_key, count_key)
+        
+        # Per-student rates ranked lowest first, with NMC minimum-attendance flags
+        ranked = rank_student_attendance(student_totals, student_presents)
+        flags = [row for row in ranked if row["below_threshold"]]
         
         return AttendanceAnalytics(
             overall_attendance_rate=overall_rate,
             department_wise_attendance=dept_attendance,
-            student_wise_attendance={},
+            student_wise_attendance={row["student_id"]: row["attendance_rate"] for row in ranked},
             attendance_trends=attendance_trends,
-            low_attendance_flags=[]
+            low_attendance_flags=flags,
+            students_tracked=len(ranked),
+            students_flagged=len(flags)
         )
     
     @staticmethod
-    def get_clinical_analytics(college_id: UUID) -> ClinicalExposureAnalytics:
+    def page_student_attendance(
+        analytics: AttendanceAnalytics,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        sort: str = "risk"
+    ) -> AttendanceAnalytics:
+        """Sort the per-student lists explicitly and slice one page
+        
+        ``sort="risk"`` puts the lowest rates first; ``"rate"`` the highest. Ties
+        break on student ID. Stored order is not relied on: JSONB snapshots do
+        not keep object key order.
+        """
+        if sort not in STUDENT_SORTS:
+            raise ValueError(f"Unsupported sort: {sort}")
+        end = offset + limit if limit is not None else None
+        descending = sort == "rate"
+        students = sorted(
+            analytics.student_wise_attendance.items(),
+            key=lambda item: (item[1], item[0]),
+            reverse=descending
+        )
+        flags = sorted(
+            analytics.low_attendance_flags,
+            key=lambda flag: (flag["attendance_rate"], flag["student_id"]),
+            reverse=descending
+        )
+        return analytics.model_copy(update={
+            "student_wise_attendance": dict(students[offset:end]),
+            "low_attendance_flags": flags[offset:end]
+        })
+    
+    @staticmethod
+    async def get_clinical_analytics(college_id: UUID) -> ClinicalExposureAnalytics:
         """Get clinical exposure analytics"""
         repo = GovernanceRepository
-        stats = repo.get_clinical_exposure_stats(college_id)
+        stats, exposure, departments = await gather_bounded(
+            repo.get_clinical_exposure_stats(college_id),
+            repo.get_clinical_exposure_by_department(college_id),
+            repo.get_departments(college_id),
+            limit=settings.DASHBOARD_QUERY_CONCURRENCY,
+            timeout=settings.DASHBOARD_TIMEOUT,
+            label="clinical analytics"
+        )
         
         # Get department-wise exposure
-        from app.db.supabase import supabase_client
-        departments = supabase_client.select("departments", filters={"college_id": str(college_id)})
-        
-        dept_exposure = {}
-        for dept in departments:
-            logbooks = supabase_client.select(
-                "clinical_logbooks",
-                filters={"college_id": str(college_id)}
-            )
-            # Filter by posting department
-            postings = supabase_client.select(
-                "postings",
-                filters={"department_id": str(dept["id"])}
-            )
-            posting_ids = [p["id"] for p in postings]
-            dept_logbooks = [l for l in logbooks if l.get("posting_id") in posting_ids]
-            
-            dept_exposure[dept["name"]] = {
-                "total_cases": len(dept_logbooks),
-                "verified_cases": len([l for l in dept_logbooks if l.get("status") == "verified"])
-            }
+        dept_exposure = {
+            dept["name"]: exposure.get(dept["id"], {"total_cases": 0, "verified_cases": 0})
+            for dept in departments
+        }
         
         return ClinicalExposureAnalytics(
             total_cases_logged=stats["total_cases_logged"],
@@ -177,30 +224,164 @@ class GovernanceService:
         )
     
     @staticmethod
-    def get_academic_analytics(college_id: UUID) -> AcademicPerformanceAnalytics:
+    async def get_academic_analytics(college_id: UUID) -> AcademicPerformanceAnalytics:
         """Get academic performance analytics"""
         repo = GovernanceRepository
-        stats = repo.get_academic_performance_stats(college_id)
+        modules, progress_records = await gather_bounded(
+            repo.get_modules(college_id),
+            repo.get_module_progress_records(college_id),
+            limit=2,
+            timeout=settings.DASHBOARD_TIMEOUT,
+            label="academic analytics"
+        )
+        module_titles = {m["id"]: m["title"] for m in modules}
         
-        # Get module completion rates
-        from app.db.supabase import supabase_client
-        modules = supabase_client.select("curriculum_modules", filters={"college_id": str(college_id)})
+        # Single pass: per-module and per-student completion totals. NULL completions
+        # are skipped, as AVG does, so averages match the dashboard and state rollup.
+        module_totals: Dict[str, List[float]] = {}  # module_id -> [sum, count, below threshold]
+        student_totals: Dict[str, List[float]] = {}  # student_id -> [sum, count]
+        completion_sum = 0.0
+        completion_count = 0
+        total_time_spent = 0
+        for record in progress_records:
+            total_time_spent += record.get("time_spent_minutes") or 0
+            student = student_totals.setdefault(record["student_id"], [0.0, 0])
+            completion = record.get("completion_percentage")
+            if completion is None:
+                continue
+            module = module_totals.setdefault(record["module_id"], [0.0, 0, 0])
+            module[0] += completion
+            module[1] += 1
+            module[2] += completion < WEAK_AREA_THRESHOLD
+            student[0] += completion
+            student[1] += 1
+            completion_sum += completion
+            completion_count += 1
         
         module_rates = {}
-        for module in modules:
-            progress_records = supabase_client.select(
-                "student_module_progress",
-                filters={"module_id": str(module["id"])}
-            )
-            if progress_records:
-                avg_completion = sum(p.get("completion_percentage", 0) for p in progress_records) / len(progress_records)
-                module_rates[module["title"]] = avg_completion
+        weak_areas = []
+        for module_id, (total, count, below) in module_totals.items():
+            title = module_titles.get(module_id)
+            if title is None:
+                continue
+            avg_completion = total / count
+            module_rates[module_id] = {"module": title, "average_completion": avg_completion}
+            if avg_completion < WEAK_AREA_THRESHOLD:
+                weak_areas.append({
+                    "module_id": module_id,
+                    "module": title,
+                    "average_completion": avg_completion,
+                    "students_below_threshold": below
+                })
+        weak_areas.sort(key=lambda area: area["average_completion"])
+        
+        student_averages = [total / count for total, count in student_totals.values() if count]
+        distribution = dict.fromkeys(COMPLETION_BUCKETS, 0)
+        for avg_completion in student_averages:
+            distribution[COMPLETION_BUCKETS[min(int(avg_completion // 25), 3)]] += 1
+        
+        student_progress_summary = {
+            "total_students_with_progress": len(student_totals),
+            # Same figure as the dashboard's completion_sum / completion_count
+            "average_completion": _ratio(completion_sum, completion_count),
+            "students_below_threshold": sum(1 for a in student_averages if a < WEAK_AREA_THRESHOLD),
+            "completion_distribution": distribution,
+            "total_time_spent_minutes": total_time_spent
+        }
         
         return AcademicPerformanceAnalytics(
             module_completion_rates=module_rates,
-            student_progress_summary={},
+            student_progress_summary=student_progress_summary,
             resource_engagement={},
-            weak_areas_identified=[]
+            weak_areas_identified=weak_areas
         )
+    
+    @staticmethod
+    async def get_college_totals(college_id: UUID) -> Dict[str, Any]:
+        """A college's additive counts, read from its cached dashboard entry
+        
+        The state rollup shares the per-college dashboard cache, so a college
+        viewed on its own dashboard is not computed again for the state view.
+        """
+        async def compute() -> Dict[str, Any]:
+            return (await GovernanceService.get_dashboard_metrics(college_id)).model_dump(mode="json")
+        
+        key = governance_cache.make_key("metrics", college_id)
+        data, _ = await governance_cache.get_or_compute(key, compute)
+        totals = data.get("college_totals") or {}
+        if not all(k in totals for k in PARTIAL_KEYS):
+            # Entry cached before dashboards carried the totals
+            totals = (await compute())["college_totals"]
+        return totals
+    
+    @staticmethod
+    async def get_state_rollup() -> StateRollupAnalytics:
+        """State-wide attendance, clinical and academic metrics across all active colleges
+        
+        Each college gets STATE_ROLLUP_COLLEGE_TIMEOUT seconds; colleges that fail
+        or time out are left out and listed in ``colleges_failed``.
+        """
+        colleges = [c for c in await CollegeRepository.get_all_colleges() if c.get("is_active", True)]
+        
+        async def college_totals(college: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            try:
+                return await asyncio.wait_for(
+                    GovernanceService.get_college_totals(college["id"]),
+                    settings.STATE_ROLLUP_COLLEGE_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.error(
+                    f"State rollup: college {college['id']} timed out after {settings.STATE_ROLLUP_COLLEGE_TIMEOUT}s"
+                )
+            except Exception as e:
+                logger.error(f"State rollup: failed to compute college {college['id']}: {e}")
+            return None
+        
+        results = await gather_bounded(
+            *(college_totals(c) for c in colleges),
+            limit=settings.STATE_ROLLUP_CONCURRENCY,
+            label="state rollup"
+        )
+        
+        totals: Dict[str, float] = dict.fromkeys(PARTIAL_KEYS, 0)
+        college_wise = {}
+        failed = []
+        for college, counts in zip(colleges, results):
+            if counts is None:
+                failed.append(college["name"])
+                continue
+            for key in PARTIAL_KEYS:
+                totals[key] += counts.get(key, 0)
+            college_wise[college["name"]] = {
+                "total_students": counts["total_students"],
+                "total_faculty": counts["total_faculty"],
+                "attendance_rate": _rate(counts["attendance_present"], counts["attendance_total"]),
+                "total_cases_logged": counts["total_cases_logged"],
+                "posting_completion_rate": _rate(counts["completed_postings"], counts["total_postings"]),
+                "average_module_completion": _ratio(counts["completion_sum"], counts["completion_count"])
+            }
+        
+        return StateRollupAnalytics(
+            total_colleges=len(colleges),
+            colleges_included=len(college_wise),
+            total_students=int(totals["total_students"]),
+            total_faculty=int(totals["total_faculty"]),
+            overall_attendance_rate=_rate(totals["attendance_present"], totals["attendance_total"]),
+            total_cases_logged=int(totals["total_cases_logged"]),
+            verified_cases=int(totals["verified_cases"]),
+            posting_completion_rate=_rate(totals["completed_postings"], totals["total_postings"]),
+            average_module_completion=_ratio(totals["completion_sum"], totals["completion_count"]),
+            students_with_progress=int(totals["students_with_progress"]),
+            college_wise=college_wise,
+            colleges_failed=failed
+        )
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    """Safe division, 0.0 for an empty denominator"""
+    return numerator / denominator if denominator else 0.0
 
 
+def _rate(part: float, whole: float) -> float:
+    """Percentage of ``part`` in ``whole``"""
+    return _ratio(part, whole) * 100
@@ -1,9 +1,9 @@
 """
 Notification service for in-app, email, and push notifications
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
-from app.db.supabase import supabase_client
+from app.db.supabase import async_supabase_client
 from app.core.config import settings
 from loguru import logger
 from datetime import datetime
@@ -13,7 +13,7 @@ class NotificationService:
     """Service for notification operations"""
     
     @staticmethod
-    def create_notification(
+    async def create_notification(
         user_id: UUID,
         title: str,
         message: str,
@@ -35,26 +35,39 @@ class NotificationService:
         if college_id:
             notification_data["college_id"] = str(college_id)
         
-        return supabase_client.insert("notifications", notification_data)
+        return await async_supabase_client.insert("notifications", notification_data)
     
     @staticmethod
-    def get_user_notifications(user_id: UUID, unread_only: bool = False) -> List[dict]:
-        """Get notifications for a user"""
+    async def get_user_notifications(
+        user_id: UUID,
+        unread_only: bool = False,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get notifications for a user (one page, newest first)"""
         filters = {"user_id": str(user_id)}
         if unread_only:
             filters["is_read"] = False
         
-        return supabase_client.select(
+        return await async_supabase_client.select_page(
             "notifications",
             filters=filters,
-            order_by="created_at",
-            limit=50
+            cursor=cursor,
+            limit=limit
+        )
+    
+    @staticmethod
+    async def get_user_notification(notification_id: UUID, user_id: UUID) -> Optional[dict]:
+        """Get a single notification if it belongs to the user"""
+        return await async_supabase_client.select_one(
+            "notifications",
+            filters={"id": str(notification_id), "user_id": str(user_id)}
         )
     
     @staticmethod
-    def mark_as_read(notification_id: UUID) -> dict:
+    async def mark_as_read(notification_id: UUID) -> dict:
         """Mark notification as read"""
-        return supabase_client.update(
+        return await async_supabase_client.update(
             "notifications",
             {"is_read": True},
             filters={"id": str(notification_id)}
@@ -0,0 +1,166 @@
+"""
+Governance snapshot service: precomputes dashboards into governance_snapshots
+"""
+from typing import Optional, Dict, Any, Tuple
+from uuid import UUID
+from datetime import datetime, timezone
+import asyncio
+from dateutil.parser import isoparse
+from app.core.config import settings
+from app.core.concurrency import gather_bounded
+from app.db.cache import acquire_lock
+from app.db.redis_client import async_redis_client
+from app.repositories.governance_repo import GovernanceRepository
+from app.repositories.college_repo import CollegeRepository
+from app.services.governance_service import GovernanceService
+from app.services.attendance_flags import MIN_ATTENDANCE_RATE
+from app.models.governance import GovernanceSnapshotCreate
+from loguru import logger
+
+# Redis lease that lets one worker per interval run the scheduled snapshot
+SCHEDULER_LEASE_KEY = "governance:snapshot:lease"
+
+
+class SnapshotService:
+    """Service for governance snapshot operations"""
+    
+    @staticmethod
+    async def generate_snapshot(college_id: UUID, snapshot_type: str = "daily") -> dict:
+        """Compute dashboard and analytics for a college and store them as a snapshot"""
+        days = settings.GOVERNANCE_SNAPSHOT_ATTENDANCE_DAYS
+        dashboard, attendance, clinical, academic = await gather_bounded(
+            GovernanceService.get_dashboard_metrics(college_id),
+            GovernanceService.get_attendance_analytics(college_id, days),
+            GovernanceService.get_clinical_analytics(college_id),
+            GovernanceService.get_academic_analytics(college_id),
+            limit=4,
+            label="governance snapshot"
+        )
+        
+        alerts = []
+        if dashboard.attendance_rate and dashboard.attendance_rate < MIN_ATTENDANCE_RATE:
+            alerts.append({
+                "type": "low_attendance",
+                "message": f"Overall attendance {dashboard.attendance_rate:.1f}% is below {MIN_ATTENDANCE_RATE:.0f}%"
+            })
+        if attendance.students_flagged:
+            alerts.append({
+                "type": "students_below_minimum_attendance",
+                "message": f"{attendance.students_flagged} students are below {MIN_ATTENDANCE_RATE:.0f}% attendance"
+            })
+        
+        snapshot = GovernanceSnapshotCreate(
+            college_id=college_id,
+            snapshot_type=snapshot_type,
+            snapshot_date=datetime.now(timezone.utc),
+            metrics=dashboard.model_dump(mode="json"),
+            attendance_summary={**attendance.model_dump(mode="json"), "days": days},
+            academic_summary=academic.model_dump(mode="json"),
+            clinical_summary=clinical.model_dump(mode="json"),
+            department_summary=dashboard.department_wise_stats,
+            alerts=alerts
+        )
+        return await GovernanceRepository.create_snapshot(snapshot)
+    
+    @staticmethod
+    async def generate_all(snapshot_type: str = "daily", college_id: Optional[UUID] = None) -> int:
+        """Generate snapshots for every active college (or one); returns the number written"""
+        if college_id:
+            college_ids = [college_id]
+        else:
+            colleges = await CollegeRepository.get_all_colleges()
+            college_ids = [c["id"] for c in colleges if c.get("is_active", True)]
+        
+        async def generate(cid) -> bool:
+            try:
+                await SnapshotService.generate_snapshot(cid, snapshot_type)
+                return True
+            except Exception as e:
+                logger.error(f"Failed to generate governance snapshot for college {cid}: {e}")
+                return False
+        
+        results = await gather_bounded(
+            *(generate(cid) for cid in college_ids),
+            limit=settings.GOVERNANCE_SNAPSHOT_CONCURRENCY,
+            label="college snapshots"
+        )
+        written = sum(results)
+        logger.info(f"Generated {written}/{len(college_ids)} {snapshot_type} governance snapshots")
+        return written
+    
+    @staticmethod
+    async def get_fresh_snapshot(college_id: UUID) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Latest snapshot and its age in seconds, if younger than GOVERNANCE_SNAPSHOT_MAX_AGE"""
+        try:
+            snapshot = await GovernanceRepository.get_latest_snapshot(college_id)
+        except Exception as e:
+            logger.warning(f"Could not load governance snapshot: {e}")
+            return None
+        if not snapshot or not snapshot.get("snapshot_date"):
+            return None
+        
+        try:
+            # isoparse accepts any fractional-second precision (Postgres trims trailing zeros)
+            generated_at = isoparse(str(snapshot["snapshot_date"]))
+        except ValueError as e:
+            logger.warning(f"Ignoring governance snapshot with unreadable snapshot_date: {e}")
+            return None
+        if generated_at.tzinfo is None:
+            generated_at = generated_at.replace(tzinfo=timezone.utc)
+        age = int((datetime.now(timezone.utc) - generated_at).total_seconds())
+        if age > settings.GOVERNANCE_SNAPSHOT_MAX_AGE:
+            return None
+        return snapshot, max(age, 0)
+
+
+class SnapshotScheduler:
+    """In-process loop that regenerates snapshots every GOVERNANCE_SNAPSHOT_INTERVAL seconds
+    
+    With Redis, each run first takes a ``SET NX`` lease that lasts one interval
+    and is not released, so when several workers run the scheduler only one of
+    them generates snapshots per interval. Without Redis every enabled worker
+    runs, so enable it on a single worker.
+    """
+    
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start the loop (no-op unless GOVERNANCE_SNAPSHOT_SCHEDULER_ENABLED)"""
+        if not settings.GOVERNANCE_SNAPSHOT_SCHEDULER_ENABLED or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Governance snapshot scheduler started (every {settings.GOVERNANCE_SNAPSHOT_INTERVAL}s)")
+    
+    async def _take_lease(self) -> bool:
+        """True if this worker should run now (always, when Redis is not configured)"""
+        if async_redis_client.client is None:
+            return True
+        return await acquire_lock(SCHEDULER_LEASE_KEY, settings.GOVERNANCE_SNAPSHOT_INTERVAL) is not None
+    
+    async def _run(self) -> None:
+        """Generate, then sleep, until cancelled"""
+        while True:
+            try:
+                if await self._take_lease():
+                    await SnapshotService.generate_all()
+                else:
+                    logger.debug("Governance snapshots for this interval are run by another worker")
+            except Exception as e:
+                logger.error(f"Scheduled governance snapshot run failed: {e}")
+            await asyncio.sleep(settings.GOVERNANCE_SNAPSHOT_INTERVAL)
+    
+    async def stop(self) -> None:
+        """Cancel the loop"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# Global instance
+snapshot_scheduler = SnapshotScheduler()
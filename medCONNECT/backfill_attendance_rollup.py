@@ -0,0 +1,46 @@
+"""
+Rebuild attendance_daily_rollup from raw attendance history
+Run after applying migration_add_attendance_rollup.sql, and any time the
+rollup needs repairing (e.g. after bulk attendance imports)
+
+Usage:
+    python backfill_attendance_rollup.py                # all colleges
+    python backfill_attendance_rollup.py <college_id>   # one college
+"""
+import sys
+from app.db.supabase import supabase_client
+from loguru import logger
+
+
+def backfill(college_id: str = None) -> bool:
+    """Recompute the rollup server-side via medconnect_rebuild_attendance_rollup()"""
+    try:
+        scope = f"college {college_id}" if college_id else "all colleges"
+        logger.info(f"Rebuilding attendance rollup for {scope}...")
+
+        rows = supabase_client.rpc(
+            "medconnect_rebuild_attendance_rollup",
+            {"p_college_id": college_id}
+        )
+
+        logger.success(f"Attendance rollup rebuilt: {rows} rollup rows written")
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to rebuild attendance rollup: {e}")
+        logger.warning("Make sure migration_add_attendance_rollup.sql has been applied in the Supabase SQL Editor,")
+        logger.warning("or run this SQL there directly:")
+        logger.warning("")
+        logger.warning("SELECT medconnect_rebuild_attendance_rollup(NULL);")
+        return False
+
+
+if __name__ == "__main__":
+    print("Backfilling attendance_daily_rollup...")
+    print("=" * 60)
+    success = backfill(sys.argv[1] if len(sys.argv) > 1 else None)
+    if success:
+        print("\n✅ Backfill completed successfully!")
+    else:
+        print("\n⚠️  Backfill failed - see the log above")
+        sys.exit(1)
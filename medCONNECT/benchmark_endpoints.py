@@ -0,0 +1,268 @@
+"""
+Endpoint benchmark: latency percentiles, throughput and queries per request
+Drives the FastAPI app in-process (httpx.AsyncClient over ASGI) against a
+synthetic college (generate_college_data.py) in the memory or SQLite backend,
+so numbers reflect application and query work, not the network
+
+Access tokens are signed locally with a throwaway SUPABASE_JWT_SECRET.
+/auth/login calls Supabase Auth, so it only runs when --login-email and
+--login-password are given and SUPABASE_URL points at a project with that user.
+
+Usage:
+    python benchmark_endpoints.py                                  # report only
+    python benchmark_endpoints.py --baseline benchmark_baseline.json   # fail on regressions
+    python benchmark_endpoints.py --save-baseline benchmark_baseline.json
+    python benchmark_endpoints.py --backend sqlite --scale 1 --requests 500 --concurrency 8
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import secrets
+import statistics
+import sys
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+# (name, method, path, caller) — caller picks which synthetic user's token is sent
+SCENARIOS = [
+    ("academic_progress_me", "GET", "/academic/progress/me", "student"),
+    ("governance_dashboard", "GET", "/governance/dashboard", "principal"),
+    ("notifications_unread", "GET", "/notifications/unread", "student"),
+    ("clinical_logbooks", "GET", "/clinical/logbooks", "faculty"),
+    ("auth_login", "POST", "/auth/login", None),
+]
+
+# Dataset seed and college code, fixed so runs compare like with like
+DATASET_SEED = 42
+DATASET_CODE = "SYN-BENCH"
+
+
+def _percentile(samples: List[float], percent: int) -> float:
+    """Inclusive percentile of ``samples`` (milliseconds)"""
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[percent - 1]
+
+
+def summarize(latencies: List[float], queries: List[int], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Result row for one scenario"""
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "queries_per_request": round(statistics.mean(queries), 2),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta_ms: float) -> List[str]:
+    """Regressions against ``baseline``: more queries or errors per request, or a p95
+    increase beyond ``tolerance`` that is also larger than ``min_delta_ms`` (timer noise)
+    """
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or current.get("skipped") or previous.get("skipped"):
+            continue
+        limit = max(previous["p95_ms"] * (1 + tolerance), previous["p95_ms"] + min_delta_ms)
+        if current["p95_ms"] > limit:
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']}ms exceeds baseline {previous['p95_ms']}ms +{tolerance:.0%}"
+            )
+        if current["queries_per_request"] > previous["queries_per_request"]:
+            regressions.append(
+                f"{name}: {current['queries_per_request']} queries/request, baseline {previous['queries_per_request']}"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: {current['errors']} errors, baseline {previous['errors']}")
+    return regressions
+
+
+async def _seed_dataset(db, args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    """Generate the synthetic college unless it exists; returns one user per caller role"""
+    from generate_college_data import generate_college
+
+    college = await db.select_one("colleges", filters={"code": DATASET_CODE})
+    if college is None:
+        print(f"Generating synthetic college (scale {args.scale})...")
+        await generate_college(
+            db,
+            seed=DATASET_SEED,
+            until=date.today(),
+            code=DATASET_CODE,
+            students=max(1, round(1000 * args.scale)),
+            faculty=max(1, round(100 * args.scale)),
+        )
+        college = await db.select_one("colleges", filters={"code": DATASET_CODE})
+
+    college_filter = {"college_id": college["id"], "is_active": True}
+    students = await db.select("student_profiles", columns="user_id", filters={
+        "college_id": college["id"], "current_year": 4
+    }, limit=1)
+    users = {
+        "student": await db.select_one("users", filters={"id": students[0]["user_id"]}),
+        "principal": await db.select_one("users", filters={**college_filter, "role": "principal"}),
+        "faculty": await db.select_one("users", filters={**college_filter, "role": "faculty"}),
+    }
+    return {"college": college, **users}
+
+
+def _token(secret: str, user_id: str) -> str:
+    """Supabase-style access token signed with the local secret"""
+    from jose import jwt
+
+    now = int(time.time())
+    claims = {"sub": user_id, "aud": "authenticated", "role": "authenticated", "iat": now, "exp": now + 3600}
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+
+async def _run_scenario(client, method: str, path: str, headers: Dict[str, str], body: Optional[Dict[str, Any]],
+                        args: argparse.Namespace) -> Dict[str, Any]:
+    """Warm up, then issue ``args.requests`` requests from ``args.concurrency`` workers"""
+    from app.core.query_recorder import record_queries
+
+    for _ in range(args.warmup):
+        await client.request(method, path, headers=headers, json=body)
+
+    latencies: List[float] = []
+    queries: List[int] = []
+    errors = 0
+    remaining = args.requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            with record_queries() as recorder:
+                start = time.perf_counter()
+                response = await client.request(method, path, headers=headers, json=body)
+                latencies.append((time.perf_counter() - start) * 1000)
+            queries.append(recorder.total)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return summarize(latencies, queries, errors, time.perf_counter() - started)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Seed the backend, run every scenario and return the results document"""
+    import httpx
+    from loguru import logger
+    from app.core.config import settings
+    from app.db.supabase import async_supabase_client
+    from app.main import app
+
+    # The app logs every slow request at INFO; keep the benchmark output readable
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    try:
+        dataset = await _seed_dataset(async_supabase_client, args)
+        # Keep collector pauses over the seeded rows out of the measurements
+        gc.collect()
+        gc.freeze()
+        tokens = {
+            role: _token(settings.SUPABASE_JWT_SECRET, dataset[role]["id"])
+            for role in ("student", "principal", "faculty")
+        }
+
+        results: Dict[str, Any] = {
+            "backend": settings.DATABASE_BACKEND,
+            "scale": args.scale,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "scenarios": {},
+        }
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for name, method, path, caller in SCENARIOS:
+                if args.only and name not in args.only:
+                    continue
+                body = None
+                if caller is None:
+                    if not (args.login_email and args.login_password and settings.SUPABASE_URL):
+                        results["scenarios"][name] = {"skipped": "needs --login-email/--login-password and SUPABASE_URL"}
+                        continue
+                    body = {
+                        "email": args.login_email,
+                        "password": args.login_password,
+                        "college_id": args.login_college_id or dataset["college"]["id"],
+                    }
+                    headers = {}
+                else:
+                    headers = {"Authorization": f"Bearer {tokens[caller]}"}
+                url = f"{settings.API_V1_PREFIX}{path}"
+                results["scenarios"][name] = await _run_scenario(client, method, url, headers, body, args)
+        return results
+    finally:
+        await async_supabase_client.close()
+
+
+def _print_results(results: Dict[str, Any]) -> None:
+    """Results table"""
+    print(f"{'scenario':<24} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'queries':>8} {'errors':>7}")
+    for name, row in results["scenarios"].items():
+        if row.get("skipped"):
+            print(f"{name:<24} skipped: {row['skipped']}")
+            continue
+        print(
+            f"{name:<24} {row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} "
+            f"{row['throughput_rps']:>8} {row['queries_per_request']:>8} {row['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark hot API endpoints in-process")
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--sqlite-path", default="benchmark.sqlite3", help="Reused between runs (sqlite backend)")
+    parser.add_argument("--scale", type=float, default=0.1, help="Dataset scale (1.0 = 1000 students)")
+    parser.add_argument("--requests", type=int, default=100, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--only", nargs="*", help="Run only these scenarios")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Compare with this results JSON and exit 1 on regressions")
+    parser.add_argument("--save-baseline", help="Write results JSON as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p95 increase over baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="p95 increases below this are never regressions")
+    parser.add_argument("--login-email")
+    parser.add_argument("--login-password")
+    parser.add_argument("--login-college-id")
+    args = parser.parse_args()
+
+    # Settings are read when app modules are imported, so configure them first
+    os.environ["DATABASE_BACKEND"] = args.backend
+    os.environ["SQLITE_DATABASE_PATH"] = args.sqlite_path
+    os.environ.setdefault("SUPABASE_JWT_SECRET", secrets.token_urlsafe(32))
+    os.environ["SUPABASE_TOKEN_REVOCATION_CHECK"] = "false"
+
+    print(f"Benchmarking endpoints ({args.backend} backend)...")
+    print("=" * 60)
+    results = asyncio.run(run(args))
+    _print_results(results)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("\n⚠️  Regressions against baseline:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
@@ -0,0 +1,639 @@
+"""
+Generate a synthetic medical college for load testing
+Fills the configured DATABASE_BACKEND with one college of realistic shape
+and volume: departments, users, profiles, subjects, modules, resources,
+module progress, attendance history, postings, clinical logbooks, hostels,
+movement logs and notifications. Rows are written with insert_many in batches.
+
+The same --seed, --until and options always produce the same rows, IDs included.
+Point it at SQLite or a scratch Supabase project, never at production.
+
+Usage:
+    DATABASE_BACKEND=sqlite python generate_college_data.py                  # 1000 students, 1 year
+    DATABASE_BACKEND=sqlite python generate_college_data.py --students 5000 --years 2
+    python generate_college_data.py --scale 0.1 --seed 7 --code SYN-SMALL
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from app.core.config import settings
+from app.db.backends.base import DatabaseBackend
+from app.db.supabase import async_supabase_client
+from loguru import logger
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+# (name, code, department_type, MBBS year its subject is taught in)
+DEPARTMENTS = [
+    ("Anatomy", "ANAT", "academic", 1),
+    ("Physiology", "PHYS", "academic", 1),
+    ("Biochemistry", "BIOC", "academic", 1),
+    ("Pathology", "PATH", "academic", 2),
+    ("Pharmacology", "PHAR", "academic", 2),
+    ("Microbiology", "MICR", "academic", 2),
+    ("Forensic Medicine and Toxicology", "FMT", "both", 2),
+    ("Community Medicine", "CMED", "both", 3),
+    ("Ophthalmology", "OPTH", "clinical", 3),
+    ("Otorhinolaryngology", "ENT", "clinical", 3),
+    ("General Medicine", "MED", "clinical", 4),
+    ("General Surgery", "SURG", "clinical", 4),
+    ("Obstetrics and Gynaecology", "OBG", "clinical", 4),
+    ("Paediatrics", "PAED", "clinical", 4),
+    ("Orthopaedics", "ORTH", "clinical", 4),
+    ("Dermatology", "DERM", "clinical", 4),
+    ("Psychiatry", "PSY", "clinical", 4),
+    ("Anaesthesiology", "ANES", "clinical", 4),
+    ("Radiodiagnosis", "RAD", "clinical", 4),
+]
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Akhil", "Ananya", "Arjun", "Bhavana", "Charan", "Deepika", "Divya", "Farhan",
+    "Harika", "Ishaan", "Kavya", "Keerthi", "Krishna", "Lakshmi", "Mahesh", "Meghana", "Naveen", "Nikhil",
+    "Pooja", "Pranav", "Rahul", "Ramya", "Sai", "Sandeep", "Sneha", "Srinivas", "Swathi", "Tejaswini",
+    "Varun", "Vennela", "Vikram", "Yamini", "Zoya",
+]
+LAST_NAMES = [
+    "Reddy", "Rao", "Naidu", "Sharma", "Goud", "Yadav", "Chary", "Kumar", "Varma", "Patel",
+    "Khan", "Iyer", "Nair", "Gupta", "Choudhary", "Shetty", "Mudiraj", "Pillai",
+]
+DESIGNATIONS = ["Professor", "Associate Professor", "Assistant Professor", "Senior Resident", "Tutor"]
+RESOURCE_TYPES = ["video", "pdf", "image", "diagram", "pyq", "3d", "audio", "document"]
+CASES = [
+    ("Fever with chills", "Malaria"),
+    ("Cough for three weeks", "Pulmonary tuberculosis"),
+    ("Chest pain on exertion", "Stable angina"),
+    ("Pain abdomen, right iliac fossa", "Acute appendicitis"),
+    ("Breathlessness", "Bronchial asthma"),
+    ("Headache and blurred vision", "Hypertensive urgency"),
+    ("Polyuria and polydipsia", "Type 2 diabetes mellitus"),
+    ("Swelling of both legs", "Nephrotic syndrome"),
+    ("Yellowish discolouration of eyes", "Acute viral hepatitis"),
+    ("Pain and swelling of knee after fall", "Tibial plateau fracture"),
+    ("Reduced fetal movements", "Oligohydramnios"),
+    ("Loose stools in a child", "Acute gastroenteritis with some dehydration"),
+]
+PROCEDURES = ["IV cannulation", "Catheterisation", "Suturing", "Dressing", "Nasogastric tube insertion", "ECG recording"]
+SKILLS = ["History taking", "General examination", "Systemic examination", "Counselling", "Case presentation"]
+NOTIFICATION_TEMPLATES = [
+    ("Attendance below requirement", "Your attendance this month is below 75%.", "warning"),
+    ("Logbook entry verified", "A clinical logbook entry was verified by your supervisor.", "success"),
+    ("New learning resource", "New resources were added to your current module.", "info"),
+    ("Posting schedule updated", "Your next clinical posting has been scheduled.", "info"),
+    ("Fee reminder", "Hostel fee for this term is due next week.", "warning"),
+]
+
+# Default row volumes; --scale multiplies the student and faculty counts
+DEFAULTS = {
+    "students": 1000,
+    "faculty": 100,
+    "years": 1,
+    "sessions_per_day": 1,
+    "modules_per_subject": 8,
+    "resources_per_module": 4,
+    "posting_weeks": 4,
+    "cases_per_posting": 6,
+    "hostel_fraction": 0.6,
+    "movements_per_week": 2,
+    "notifications_per_user": 12,
+    "batch_size": 500,
+}
+
+
+class CollegeGenerator:
+    """Deterministic row generator for one synthetic college"""
+    
+    def __init__(self, seed: int, until: date, options: Dict[str, Any]):
+        self.rng = random.Random(seed)
+        self.until = until
+        self.since = until - timedelta(days=365 * options["years"])
+        self.options = options
+        self.college_id = self._id()
+    
+    def _id(self) -> str:
+        """UUID drawn from the seeded generator, so reruns reproduce IDs"""
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+    
+    def _at(self, day: date, hour: int, minute: int = 0) -> str:
+        """ISO timestamp (IST) on ``day``"""
+        return datetime(day.year, day.month, day.day, hour, minute, tzinfo=IST).isoformat()
+    
+    def _days(self) -> Iterator[date]:
+        """Working days (Monday to Saturday) in the history window"""
+        day = self.since
+        while day <= self.until:
+            if day.weekday() < 6:
+                yield day
+            day += timedelta(days=1)
+    
+    def _name(self) -> str:
+        """Random full name"""
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+    
+    # Structure
+    
+    def college(self, code: str) -> Dict[str, Any]:
+        """The college row"""
+        return {
+            "id": self.college_id,
+            "name": f"Synthetic Government Medical College {code}",
+            "code": code,
+            "city": "Hyderabad",
+            "state": "Telangana",
+            "is_active": True,
+        }
+    
+    def departments(self) -> List[Dict[str, Any]]:
+        """One department per MBBS subject"""
+        self.department_rows = [
+            {
+                "id": self._id(),
+                "college_id": self.college_id,
+                "name": name,
+                "code": code,
+                "department_type": department_type,
+                "is_active": True,
+            }
+            for name, code, department_type, _ in DEPARTMENTS
+        ]
+        self.clinical_departments = [
+            d["id"] for d in self.department_rows if d["department_type"] in ("clinical", "both")
+        ]
+        return self.department_rows
+    
+    def users(self) -> List[Dict[str, Any]]:
+        """Staff, faculty and students (profiles are built from these)"""
+        code = self.options["code"].lower()
+        rows = []
+        
+        def user(role: str, index: int) -> Dict[str, Any]:
+            full_name = self._name()
+            row = {
+                "id": self._id(),
+                "email": f"{role}.{index}@{code}.example.edu",
+                "full_name": full_name,
+                "phone": f"9{self.rng.randrange(10 ** 9):09d}",
+                "role": role,
+                "college_id": self.college_id,
+                "is_active": self.rng.random() > 0.02,
+            }
+            rows.append(row)
+            return row
+        
+        for role in ("principal", "superintendent", "admin", "hostel_warden", "clinical_coordinator"):
+            user(role, 1)
+        self.faculty = [user("faculty", i) for i in range(self.options["faculty"])]
+        self.hods = [user("hod", i) for i in range(len(self.department_rows))]
+        self.students = [user("student", i) for i in range(self.options["students"])]
+        return rows
+    
+    def faculty_profiles(self) -> List[Dict[str, Any]]:
+        """Faculty and HODs assigned round-robin to departments"""
+        profiles = []
+        self.faculty_department: Dict[str, str] = {}
+        for index, member in enumerate(self.hods + self.faculty):
+            department = self.department_rows[index % len(self.department_rows)]
+            self.faculty_department[member["id"]] = department["id"]
+            profiles.append({
+                "id": self._id(),
+                "user_id": member["id"],
+                "employee_id": f"EMP{index:05d}",
+                "department_id": department["id"],
+                "designation": "Professor" if member["role"] == "hod" else self.rng.choice(DESIGNATIONS),
+                "specialization": department["name"],
+                "qualification": "MD" if department["department_type"] != "academic" else "MD / PhD",
+                "college_id": self.college_id,
+            })
+        return profiles
+    
+    def student_profiles(self) -> List[Dict[str, Any]]:
+        """Students spread over MBBS years 1-4 and internship (year 5)"""
+        self.student_year: Dict[str, int] = {}
+        self.attendance_propensity: Dict[str, float] = {}
+        profiles = []
+        for index, student in enumerate(self.students):
+            year = index % 5 + 1
+            self.student_year[student["id"]] = year
+            # Mean ~82%; roughly a fifth of students fall below the 75% requirement
+            self.attendance_propensity[student["id"]] = self.rng.betavariate(9, 2)
+            profiles.append({
+                "id": self._id(),
+                "user_id": student["id"],
+                "enrollment_number": f"{self.options['code']}-{self.until.year - year + 1}-{index:05d}",
+                "admission_year": self.until.year - year + 1,
+                "current_year": year,
+                "department_id": self.rng.choice(self.department_rows)["id"],
+                "college_id": self.college_id,
+            })
+        self.student_profile_rows = profiles
+        return profiles
+    
+    # Academics
+    
+    def subjects(self) -> List[Dict[str, Any]]:
+        """One subject per department, in the year it is taught"""
+        self.subject_year: Dict[str, int] = {}
+        rows = []
+        for name, code, _, year in DEPARTMENTS:
+            subject_id = self._id()
+            self.subject_year[subject_id] = year
+            rows.append({
+                "id": subject_id,
+                "name": name,
+                "code": code,
+                "year": year,
+                "semester": 1,
+                "college_id": self.college_id,
+            })
+        return rows
+    
+    def modules(self) -> List[Dict[str, Any]]:
+        """Curriculum modules for every subject"""
+        self.modules_by_year: Dict[int, List[str]] = {}
+        rows = []
+        for subject_id, year in self.subject_year.items():
+            for number in range(1, self.options["modules_per_subject"] + 1):
+                module_id = self._id()
+                self.modules_by_year.setdefault(year, []).append(module_id)
+                rows.append({
+                    "id": module_id,
+                    "subject_id": subject_id,
+                    "title": f"Module {number}",
+                    "module_number": number,
+                    "topics": [f"Topic {number}.{t}" for t in range(1, 4)],
+                    "learning_objectives": [f"Objective {number}.{o}" for o in range(1, 3)],
+                    "nmc_competency_codes": [f"C{year}.{number}"],
+                    "college_id": self.college_id,
+                })
+        return rows
+    
+    def resources(self) -> Iterator[Dict[str, Any]]:
+        """Learning resources for every module"""
+        for modules in self.modules_by_year.values():
+            for module_id in modules:
+                for index in range(self.options["resources_per_module"]):
+                    yield {
+                        "id": self._id(),
+                        "module_id": module_id,
+                        "title": f"Resource {index + 1}",
+                        "resource_type": self.rng.choice(RESOURCE_TYPES),
+                        "external_url": f"https://resources.example.edu/{module_id}/{index}",
+                        "order_index": index,
+                        "college_id": self.college_id,
+                    }
+    
+    def module_progress(self) -> Iterator[Dict[str, Any]]:
+        """Progress on the modules of each student's current year"""
+        for student in self.students:
+            year = min(self.student_year[student["id"]], 4)
+            for module_id in self.modules_by_year.get(year, []):
+                if self.rng.random() < 0.2:
+                    continue  # not started
+                day = self.since + timedelta(days=self.rng.randrange((self.until - self.since).days + 1))
+                yield {
+                    "id": self._id(),
+                    "student_id": student["id"],
+                    "module_id": module_id,
+                    "completion_percentage": round(min(100.0, self.rng.betavariate(2, 1.5) * 110), 1),
+                    "time_spent_minutes": self.rng.randrange(10, 600),
+                    "last_accessed_at": self._at(day, self.rng.randrange(8, 23)),
+                    "college_id": self.college_id,
+                }
+    
+    # Attendance
+    
+    def attendance(self) -> Iterator[Dict[str, Any]]:
+        """Attendance sessions (key "session") and their per-student rows (key "row")
+        
+        One session per cohort (years 1-4) per working day per --sessions-per-day;
+        every student of the cohort gets a row.
+        """
+        cohorts: Dict[int, List[str]] = {}
+        for student_id, year in self.student_year.items():
+            if year <= 4:
+                cohorts.setdefault(year, []).append(student_id)
+        for day in self._days():
+            for year, students in sorted(cohorts.items()):
+                for slot in range(self.options["sessions_per_day"]):
+                    session_id = self._id()
+                    start = self._at(day, 9 + 2 * slot)
+                    yield {"session": {
+                        "id": session_id,
+                        "name": f"Year {year} lecture {slot + 1}",
+                        "qr_code": f"{self.options['code']}-{session_id}",
+                        "location_latitude": 17.3850,
+                        "location_longitude": 78.4867,
+                        "start_time": start,
+                        "end_time": self._at(day, 10 + 2 * slot),
+                        "created_by": self.rng.choice(self.faculty or self.hods)["id"],
+                        "college_id": self.college_id,
+                        "created_at": start,
+                    }}
+                    for student_id in students:
+                        roll = self.rng.random()
+                        if roll < self.attendance_propensity[student_id]:
+                            status = "late" if roll < 0.05 else "present"
+                        else:
+                            status = "excused" if self.rng.random() < 0.1 else "absent"
+                        yield {"row": {
+                            "id": self._id(),
+                            "student_id": student_id,
+                            "session_id": session_id,
+                            "attendance_date": start,
+                            "status": status,
+                            "college_id": self.college_id,
+                            "created_at": start,
+                        }}
+    
+    # Clinical
+    
+    def postings(self) -> List[Dict[str, Any]]:
+        """Rotations through clinical departments for years 3-5"""
+        weeks = timedelta(weeks=self.options["posting_weeks"])
+        rows = []
+        for student in self.students:
+            if self.student_year[student["id"]] < 3:
+                continue
+            offset = self.rng.randrange(len(self.clinical_departments))
+            start = self.since
+            rotation = 0
+            while start <= self.until:
+                end = start + weeks - timedelta(days=1)
+                department_id = self.clinical_departments[(offset + rotation) % len(self.clinical_departments)]
+                rows.append({
+                    "id": self._id(),
+                    "student_id": student["id"],
+                    "department_id": department_id,
+                    "start_date": self._at(start, 8),
+                    "end_date": self._at(end, 17),
+                    "status": "active" if end >= self.until else "completed",
+                    "supervisor_id": self._supervisor(department_id),
+                    "college_id": self.college_id,
+                })
+                start += weeks
+                rotation += 1
+        self.posting_rows = rows
+        return rows
+    
+    def _supervisor(self, department_id: str) -> str:
+        """A faculty member of the department (its HOD if it has none)"""
+        candidates = [user_id for user_id, dept in self.faculty_department.items() if dept == department_id]
+        return self.rng.choice(candidates) if candidates else self.hods[0]["id"]
+    
+    def logbooks(self) -> Iterator[Dict[str, Any]]:
+        """Clinical cases logged during each posting (0 to 2x --cases-per-posting)"""
+        mean = self.options["cases_per_posting"]
+        for posting in self.posting_rows:
+            start = datetime.fromisoformat(posting["start_date"]).date()
+            end = min(datetime.fromisoformat(posting["end_date"]).date(), self.until)
+            span_days = max((end - start).days, 0) + 1
+            for _ in range(self.rng.randint(0, 2 * mean)):
+                day = start + timedelta(days=self.rng.randrange(span_days))
+                created = self._at(day, self.rng.randrange(9, 18), self.rng.randrange(60))
+                complaint, diagnosis = self.rng.choice(CASES)
+                status = self.rng.choices(["verified", "submitted", "draft", "rejected"], [60, 25, 10, 5])[0]
+                yield {
+                    "id": self._id(),
+                    "student_id": posting["student_id"],
+                    "posting_id": posting["id"],
+                    "case_type": self.rng.choice(["OPD", "IPD", "Emergency"]),
+                    "patient_age": self.rng.randrange(1, 90),
+                    "patient_gender": self.rng.choice(["male", "female"]),
+                    "chief_complaint": complaint,
+                    "diagnosis": diagnosis,
+                    "procedures_performed": self.rng.sample(PROCEDURES, self.rng.randint(0, 2)),
+                    "skills_demonstrated": self.rng.sample(SKILLS, self.rng.randint(1, 3)),
+                    "status": status,
+                    "verified_by": posting["supervisor_id"] if status == "verified" else None,
+                    "verified_at": created if status == "verified" else None,
+                    "college_id": self.college_id,
+                    "created_at": created,
+                }
+    
+    # Hostel
+    
+    def hostels(self) -> List[Dict[str, Any]]:
+        """Male and female hostels; picks the hostel residents"""
+        hostelers = [s for s in self.students if self.rng.random() < self.options["hostel_fraction"]]
+        self.hostelers = hostelers
+        capacity = max(len(hostelers), 3)
+        self.hostel_rows = [
+            {
+                "id": self._id(),
+                "name": f"{gender.title()} Hostel",
+                "capacity": capacity,
+                "gender": gender,
+                "college_id": self.college_id,
+            }
+            for gender in ("male", "female")
+        ]
+        return self.hostel_rows
+    
+    def rooms_and_allocations(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Three-bed rooms filled in order; also sets hostel fields on student profiles"""
+        rooms: List[Dict[str, Any]] = []
+        allocations: List[Dict[str, Any]] = []
+        profiles = {p["user_id"]: p for p in self.student_profile_rows}
+        for index, student in enumerate(self.hostelers):
+            hostel = self.hostel_rows[index % 2]
+            slot = index // 2
+            if slot % 3 == 0:
+                number = slot // 3
+                rooms.append({
+                    "id": self._id(),
+                    "hostel_id": hostel["id"],
+                    "room_number": f"{number // 40 + 1}{number % 40:02d}",
+                    "floor": number // 40 + 1,
+                    "capacity": 3,
+                    "current_occupancy": 0,
+                    "status": "occupied",
+                    "college_id": self.college_id,
+                })
+            room = next(r for r in reversed(rooms) if r["hostel_id"] == hostel["id"])
+            room["current_occupancy"] += 1
+            profiles[student["id"]].update({"hostel_id": hostel["id"], "room_number": room["room_number"]})
+            allocations.append({
+                "id": self._id(),
+                "student_id": student["id"],
+                "room_id": room["id"],
+                "hostel_id": hostel["id"],
+                "allocation_date": self._at(self.since, 10),
+                "is_active": True,
+                "college_id": self.college_id,
+            })
+        return {"rooms": rooms, "hostel_allocations": allocations}
+    
+    def movement_logs(self) -> Iterator[Dict[str, Any]]:
+        """Exit/entry pairs for hostel residents"""
+        weeks = max((self.until - self.since).days // 7, 1)
+        for student in self.hostelers:
+            for week in range(weeks):
+                for _ in range(self.options["movements_per_week"]):
+                    day = self.since + timedelta(days=7 * week + self.rng.randrange(7))
+                    hour = self.rng.randrange(16, 20)
+                    for movement_type, at in (("exit", hour), ("entry", hour + self.rng.randint(1, 3))):
+                        timestamp = self._at(day, at, self.rng.randrange(60))
+                        yield {
+                            "id": self._id(),
+                            "student_id": student["id"],
+                            "movement_type": movement_type,
+                            "timestamp": timestamp,
+                            "location": "Main gate",
+                            "reason": "Outing" if movement_type == "exit" else None,
+                            "college_id": self.college_id,
+                            "created_at": timestamp,
+                        }
+    
+    def notifications(self) -> Iterator[Dict[str, Any]]:
+        """Notifications for students and faculty, older ones mostly read"""
+        days = (self.until - self.since).days + 1
+        for user in self.students + self.faculty:
+            for _ in range(self.options["notifications_per_user"]):
+                title, message, kind = self.rng.choice(NOTIFICATION_TEMPLATES)
+                day = self.since + timedelta(days=self.rng.randrange(days))
+                yield {
+                    "id": self._id(),
+                    "user_id": user["id"],
+                    "title": title,
+                    "message": message,
+                    "type": kind,
+                    "is_read": (self.until - day).days > 7 and self.rng.random() < 0.85,
+                    "college_id": self.college_id,
+                    "created_at": self._at(day, self.rng.randrange(8, 22)),
+                }
+
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Split ``rows`` into lists of at most ``size``"""
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _insert(db: DatabaseBackend, table: str, rows: Iterable[Dict[str, Any]], batch_size: int) -> int:
+    """insert_many in batches; returns the number of rows written"""
+    start = time.perf_counter()
+    written = 0
+    for batch in _batches(rows, batch_size):
+        await db.insert_many(table, batch)
+        written += len(batch)
+    logger.info(f"{table}: {written} rows in {time.perf_counter() - start:.1f}s")
+    return written
+
+
+async def _flush(db: DatabaseBackend, table: str, rows: List[Dict[str, Any]]) -> int:
+    """insert_many and clear ``rows``; returns the number written"""
+    if not rows:
+        return 0
+    await db.insert_many(table, rows)
+    written = len(rows)
+    rows.clear()
+    return written
+
+
+async def generate_college(
+    db: DatabaseBackend,
+    seed: int = 42,
+    until: Optional[date] = None,
+    **options: Any
+) -> Dict[str, int]:
+    """Write one synthetic college to ``db``; returns rows written per table
+    
+    ``options`` override DEFAULTS (plus ``code``, the college code).
+    """
+    options = {**DEFAULTS, "code": f"SYN-{seed}", **options}
+    generator = CollegeGenerator(seed, until or date.today(), options)
+    size = options["batch_size"]
+    counts: Dict[str, int] = {}
+    
+    counts["colleges"] = await _insert(db, "colleges", [generator.college(options["code"])], size)
+    counts["departments"] = await _insert(db, "departments", generator.departments(), size)
+    counts["users"] = await _insert(db, "users", generator.users(), size)
+    counts["faculty_profiles"] = await _insert(db, "faculty_profiles", generator.faculty_profiles(), size)
+    student_profiles = generator.student_profiles()
+    hostels = generator.hostels()
+    housing = generator.rooms_and_allocations()  # also fills hostel fields on the profiles
+    counts["hostels"] = await _insert(db, "hostels", hostels, size)
+    counts["rooms"] = await _insert(db, "rooms", housing["rooms"], size)
+    counts["student_profiles"] = await _insert(db, "student_profiles", student_profiles, size)
+    counts["hostel_allocations"] = await _insert(db, "hostel_allocations", housing["hostel_allocations"], size)
+    
+    counts["subjects"] = await _insert(db, "subjects", generator.subjects(), size)
+    counts["curriculum_modules"] = await _insert(db, "curriculum_modules", generator.modules(), size)
+    counts["learning_resources"] = await _insert(db, "learning_resources", generator.resources(), size)
+    counts["student_module_progress"] = await _insert(db, "student_module_progress", generator.module_progress(), size)
+    
+    # Sessions must exist before their attendance rows; flush them together
+    sessions: List[Dict[str, Any]] = []
+    rows: List[Dict[str, Any]] = []
+    counts["attendance_sessions"] = counts["attendance"] = 0
+    start = time.perf_counter()
+    for item in generator.attendance():
+        if "session" in item:
+            sessions.append(item["session"])
+        else:
+            rows.append(item["row"])
+        if len(rows) >= size:
+            counts["attendance_sessions"] += await _flush(db, "attendance_sessions", sessions)
+            counts["attendance"] += await _flush(db, "attendance", rows)
+    counts["attendance_sessions"] += await _flush(db, "attendance_sessions", sessions)
+    counts["attendance"] += await _flush(db, "attendance", rows)
+    logger.info(
+        f"attendance: {counts['attendance']} rows in {counts['attendance_sessions']} sessions "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    
+    counts["postings"] = await _insert(db, "postings", generator.postings(), size)
+    counts["clinical_logbooks"] = await _insert(db, "clinical_logbooks", generator.logbooks(), size)
+    counts["movement_logs"] = await _insert(db, "movement_logs", generator.movement_logs(), size)
+    counts["notifications"] = await _insert(db, "notifications", generator.notifications(), size)
+    return counts
+
+
+async def main(args: argparse.Namespace) -> Dict[str, int]:
+    """Generate into the configured backend and close pooled connections"""
+    options = {key: getattr(args, key) for key in DEFAULTS}
+    options["students"] = max(1, round(args.students * args.scale))
+    options["faculty"] = max(1, round(args.faculty * args.scale))
+    code = args.code or f"SYN-{args.seed}"
+    try:
+        if await async_supabase_client.select_one("colleges", filters={"code": code}):
+            raise ValueError(f"College {code} already exists; pass a different --code or --seed")
+        return await generate_college(async_supabase_client, args.seed, args.until, code=code, **options)
+    finally:
+        await async_supabase_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic college for load testing")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed and --until give identical data)")
+    parser.add_argument("--until", type=date.fromisoformat, default=date.today(), help="Last day of history (YYYY-MM-DD)")
+    parser.add_argument("--code", help="College code (default: SYN-<seed>)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for --students and --faculty")
+    for key, default in DEFAULTS.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", dest=key, type=type(default), default=default)
+    args = parser.parse_args()
+    
+    if settings.DATABASE_BACKEND == "memory":
+        logger.warning("DATABASE_BACKEND=memory: generated rows are discarded when this script exits")
+    
+    print(f"Generating synthetic college into the {settings.DATABASE_BACKEND} backend...")
+    print("=" * 60)
+    started = time.perf_counter()
+    try:
+        counts = asyncio.run(main(args))
+    except Exception as e:
+        logger.error(f"Generation failed: {e}")
+        sys.exit(1)
+    for table, count in counts.items():
+        print(f"  {table:<26} {count:>10,}")
+    print(f"\n✅ {sum(counts.values()):,} rows written in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,44 @@
+"""
+Precompute governance dashboards into governance_snapshots
+Schedule this (e.g. cron, every hour) when the in-process scheduler
+(GOVERNANCE_SNAPSHOT_SCHEDULER_ENABLED) is not used
+
+Usage:
+    python generate_governance_snapshots.py                         # all active colleges
+    python generate_governance_snapshots.py <college_id>            # one college
+    python generate_governance_snapshots.py --type weekly [college_id]
+"""
+import argparse
+import asyncio
+import sys
+from app.db.supabase import async_supabase_client
+from app.services.snapshot_service import SnapshotService
+from loguru import logger
+
+
+async def generate(snapshot_type: str, college_id: str = None) -> int:
+    """Generate snapshots and close pooled connections"""
+    try:
+        return await SnapshotService.generate_all(snapshot_type, college_id)
+    finally:
+        await async_supabase_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate governance snapshots")
+    parser.add_argument("college_id", nargs="?", help="Only this college (default: all active colleges)")
+    parser.add_argument("--type", dest="snapshot_type", default="daily", choices=["daily", "weekly", "monthly"])
+    args = parser.parse_args()
+
+    print("Generating governance snapshots...")
+    print("=" * 60)
+    try:
+        written = asyncio.run(generate(args.snapshot_type, args.college_id))
+    except Exception as e:
+        logger.error(f"Snapshot generation failed: {e}")
+        written = 0
+    if written:
+        print(f"\n✅ {written} snapshot(s) written")
+    else:
+        print("\n⚠️  No snapshots written - see the log above")
+        sys.exit(1)
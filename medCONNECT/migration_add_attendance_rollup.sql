@@ -0,0 +1,91 @@
+-- Migration: Daily attendance rollup
+-- Run this in your Supabase SQL Editor (PostgreSQL 15+), then populate it with:
+--     python backfill_attendance_rollup.py
+--
+-- attendance_daily_rollup holds one row per (college, department, day, status)
+-- with the number of attendance records. AdminRepository keeps it current on
+-- every attendance insert/update; governance analytics read from it instead of
+-- scanning raw attendance rows.
+
+CREATE TABLE IF NOT EXISTS attendance_daily_rollup (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    college_id UUID NOT NULL REFERENCES colleges(id) ON DELETE CASCADE,
+    department_id UUID REFERENCES departments(id) ON DELETE CASCADE,
+    rollup_date DATE NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('present', 'absent', 'late', 'excused')),
+    record_count INTEGER NOT NULL DEFAULT 0 CHECK (record_count >= 0),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    -- Students without a department roll up under department_id NULL
+    UNIQUE NULLS NOT DISTINCT (college_id, department_id, rollup_date, status)
+);
+
+CREATE INDEX IF NOT EXISTS idx_attendance_rollup_college_date ON attendance_daily_rollup(college_id, rollup_date);
+
+ALTER TABLE attendance_daily_rollup ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Staff can view attendance rollup"
+    ON attendance_daily_rollup FOR SELECT
+    USING (
+        EXISTS (
+            SELECT 1 FROM users
+            WHERE users.id = auth.uid()
+            AND users.role IN ('admin', 'hod', 'principal', 'dme')
+            AND users.college_id = attendance_daily_rollup.college_id
+        )
+    );
+
+-- Apply a batch of count deltas atomically
+--
+-- p_deltas: [{"college_id", "department_id", "rollup_date", "status", "delta"}, ...]
+CREATE OR REPLACE FUNCTION medconnect_apply_attendance_rollup(p_deltas JSONB)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_delta JSONB;
+BEGIN
+    FOR v_delta IN SELECT value FROM jsonb_array_elements(p_deltas) LOOP
+        INSERT INTO attendance_daily_rollup (college_id, department_id, rollup_date, status, record_count)
+        VALUES (
+            (v_delta->>'college_id')::UUID,
+            NULLIF(v_delta->>'department_id', '')::UUID,
+            (v_delta->>'rollup_date')::DATE,
+            v_delta->>'status',
+            GREATEST((v_delta->>'delta')::INTEGER, 0)
+        )
+        ON CONFLICT (college_id, department_id, rollup_date, status) DO UPDATE
+        SET record_count = GREATEST(attendance_daily_rollup.record_count + (v_delta->>'delta')::INTEGER, 0),
+            updated_at = NOW();
+    END LOOP;
+END;
+$$;
+
+-- Rebuild the rollup from raw attendance (all colleges when p_college_id is NULL)
+CREATE OR REPLACE FUNCTION medconnect_rebuild_attendance_rollup(p_college_id UUID DEFAULT NULL)
+RETURNS BIGINT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rows BIGINT;
+BEGIN
+    DELETE FROM attendance_daily_rollup
+    WHERE p_college_id IS NULL OR college_id = p_college_id;
+
+    INSERT INTO attendance_daily_rollup (college_id, department_id, rollup_date, status, record_count)
+    SELECT a.college_id,
+           sp.department_id,
+           (a.attendance_date AT TIME ZONE 'UTC')::DATE,
+           a.status,
+           COUNT(*)
+    FROM attendance a
+    LEFT JOIN student_profiles sp ON sp.user_id = a.student_id
+    WHERE p_college_id IS NULL OR a.college_id = p_college_id
+    GROUP BY 1, 2, 3, 4;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION medconnect_apply_attendance_rollup(JSONB) TO service_role;
+GRANT EXECUTE ON FUNCTION medconnect_rebuild_attendance_rollup(UUID) TO service_role;
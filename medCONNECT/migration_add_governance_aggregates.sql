@@ -0,0 +1,110 @@
+-- Migration: Server-side aggregates for governance dashboards
+-- Run this in your Supabase SQL Editor
+--
+-- Exposes medconnect_aggregate() over PostgREST (POST /rest/v1/rpc/medconnect_aggregate)
+-- so counts and averages are computed in Postgres instead of shipping every row
+-- to the API. Used by AsyncSupabaseClient.aggregate(); the API falls back to
+-- client-side aggregation when this function is not installed.
+
+-- Indexes backing the common aggregate filters
+CREATE INDEX IF NOT EXISTS idx_attendance_college_date ON attendance(college_id, attendance_date);
+CREATE INDEX IF NOT EXISTS idx_logbooks_college_status ON clinical_logbooks(college_id, status);
+CREATE INDEX IF NOT EXISTS idx_postings_college_status ON postings(college_id, status);
+CREATE INDEX IF NOT EXISTS idx_progress_college_module ON student_module_progress(college_id, module_id);
+CREATE INDEX IF NOT EXISTS idx_student_profiles_college_department ON student_profiles(college_id, department_id);
+CREATE INDEX IF NOT EXISTS idx_faculty_profiles_college_department ON faculty_profiles(college_id, department_id);
+CREATE INDEX IF NOT EXISTS idx_postings_college_department_status ON postings(college_id, department_id, status);
+
+-- Grouped COUNT / AVG / COUNT(DISTINCT) over an allow-listed table
+--
+-- p_filters is a JSON object of column -> value (equality), column -> null (IS NULL)
+-- or column -> {"gt"|"gte"|"lt"|"lte"|"eq"|"neq": value}. Identifiers and
+-- literals are quoted with format(%I / %L); RLS still applies (SECURITY INVOKER).
+CREATE OR REPLACE FUNCTION medconnect_aggregate(
+    p_table TEXT,
+    p_group_by TEXT DEFAULT NULL,
+    p_filters JSONB DEFAULT '{}'::JSONB,
+    p_avg_column TEXT DEFAULT NULL,
+    p_distinct_column TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    group_key TEXT,
+    row_count BIGINT,
+    avg_value DOUBLE PRECISION,
+    distinct_count BIGINT
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+AS $$
+DECLARE
+    v_where TEXT := 'TRUE';
+    v_filter RECORD;
+    v_condition RECORD;
+    v_operator TEXT;
+BEGIN
+    IF p_table NOT IN (
+        'attendance', 'faculty_attendance', 'clinical_logbooks', 'postings',
+        'student_module_progress', 'student_profiles', 'faculty_profiles',
+        'users', 'certificates', 'events', 'fees'
+    ) THEN
+        RAISE EXCEPTION 'Aggregation is not allowed on table %', p_table;
+    END IF;
+
+    FOR v_filter IN SELECT key, value FROM jsonb_each(COALESCE(p_filters, '{}'::JSONB)) LOOP
+        IF jsonb_typeof(v_filter.value) = 'object' THEN
+            FOR v_condition IN SELECT key, value FROM jsonb_each_text(v_filter.value) LOOP
+                v_operator := CASE v_condition.key
+                    WHEN 'eq' THEN '='
+                    WHEN 'neq' THEN '<>'
+                    WHEN 'gt' THEN '>'
+                    WHEN 'gte' THEN '>='
+                    WHEN 'lt' THEN '<'
+                    WHEN 'lte' THEN '<='
+                END;
+                IF v_operator IS NULL THEN
+                    RAISE EXCEPTION 'Unsupported filter operator: %', v_condition.key;
+                END IF;
+                v_where := v_where || format(' AND %I %s %L', v_filter.key, v_operator, v_condition.value);
+            END LOOP;
+        ELSIF jsonb_typeof(v_filter.value) = 'null' THEN
+            v_where := v_where || format(' AND %I IS NULL', v_filter.key);
+        ELSE
+            v_where := v_where || format(' AND %I = %L', v_filter.key, v_filter.value #>> '{}');
+        END IF;
+    END LOOP;
+
+    RETURN QUERY EXECUTE format(
+        'SELECT %s, COUNT(*)::BIGINT, %s, %s FROM %I WHERE %s GROUP BY 1',
+        CASE WHEN p_group_by IS NULL THEN 'NULL::TEXT' ELSE format('%I::TEXT', p_group_by) END,
+        CASE WHEN p_avg_column IS NULL THEN 'NULL::DOUBLE PRECISION' ELSE format('AVG(%I)::DOUBLE PRECISION', p_avg_column) END,
+        CASE WHEN p_distinct_column IS NULL THEN 'NULL::BIGINT' ELSE format('COUNT(DISTINCT %I)::BIGINT', p_distinct_column) END,
+        p_table,
+        v_where
+    );
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION medconnect_aggregate(TEXT, TEXT, JSONB, TEXT, TEXT) TO authenticated, service_role;
+
+-- Logbook totals per posting department (clinical exposure dashboard)
+CREATE OR REPLACE FUNCTION medconnect_clinical_exposure_by_department(p_college_id UUID)
+RETURNS TABLE (
+    department_id UUID,
+    total_cases BIGINT,
+    verified_cases BIGINT
+)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    SELECT p.department_id,
+           COUNT(*)::BIGINT,
+           COUNT(*) FILTER (WHERE l.status = 'verified')::BIGINT
+    FROM clinical_logbooks l
+    JOIN postings p ON p.id = l.posting_id
+    WHERE l.college_id = p_college_id
+    GROUP BY p.department_id;
+$$;
+
+GRANT EXECUTE ON FUNCTION medconnect_clinical_exposure_by_department(UUID) TO authenticated, service_role;
@@ -0,0 +1,25 @@
+-- Migration: Indexes for keyset-paginated list endpoints
+-- Run this in your Supabase SQL Editor
+--
+-- List endpoints return one page at a time ordered by (created_at DESC, id DESC)
+-- and continue from the X-Next-Cursor of the previous page. These indexes let
+-- Postgres seek straight to the cursor position for each list's filter instead
+-- of sorting every matching row on each page.
+
+CREATE INDEX IF NOT EXISTS idx_attendance_student_page ON attendance(student_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_certificates_student_page ON certificates(student_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_certificates_college_page ON certificates(college_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_notices_college_page ON notices(college_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_events_college_page ON events(college_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_fees_student_page ON fees(student_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_postings_student_page ON postings(student_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_logbooks_student_page ON clinical_logbooks(student_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_logbooks_college_page ON clinical_logbooks(college_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_visitor_logs_student_page ON visitor_logs(student_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_progress_student_page ON student_module_progress(student_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_allocations_batch_page ON topic_allocations(batch_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_allocations_module_page ON topic_allocations(module_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_allocations_college_page ON topic_allocations(college_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_faculty_attendance_faculty_page ON faculty_attendance(faculty_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_users_college_page ON users(college_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_notifications_user_page ON notifications(user_id, created_at DESC, id DESC);
@@ -0,0 +1,94 @@
+-- Migration: SUM support for medconnect_aggregate(), restricted to the service role
+-- Run this in your Supabase SQL Editor after migration_add_governance_aggregates.sql
+--
+-- Adds p_sum_column, returning SUM and COUNT of its non-null values (sum_value,
+-- value_count) so averages can be combined exactly across groups, and allows
+-- aggregating attendance_daily_rollup (daily record counts). Postgres treats a different argument list
+-- as a new overload, so the 5-argument version is dropped first; otherwise both
+-- would exist and PostgREST could not choose between them.
+--
+-- The aggregate builds SQL from caller-chosen columns, so only the API (service
+-- role) may execute it; logged-in users calling /rest/v1/rpc directly are refused.
+
+DROP FUNCTION IF EXISTS medconnect_aggregate(TEXT, TEXT, JSONB, TEXT, TEXT);
+
+-- Grouped COUNT / SUM / AVG / COUNT(DISTINCT) over an allow-listed table
+--
+-- p_filters is a JSON object of column -> value (equality), column -> null (IS NULL)
+-- or column -> {"gt"|"gte"|"lt"|"lte"|"eq"|"neq": value}. Identifiers and
+-- literals are quoted with format(%I / %L); RLS still applies (SECURITY INVOKER).
+CREATE OR REPLACE FUNCTION medconnect_aggregate(
+    p_table TEXT,
+    p_group_by TEXT DEFAULT NULL,
+    p_filters JSONB DEFAULT '{}'::JSONB,
+    p_avg_column TEXT DEFAULT NULL,
+    p_distinct_column TEXT DEFAULT NULL,
+    p_sum_column TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    group_key TEXT,
+    row_count BIGINT,
+    avg_value DOUBLE PRECISION,
+    distinct_count BIGINT,
+    sum_value DOUBLE PRECISION,
+    value_count BIGINT
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+AS $$
+DECLARE
+    v_where TEXT := 'TRUE';
+    v_filter RECORD;
+    v_condition RECORD;
+    v_operator TEXT;
+BEGIN
+    IF p_table NOT IN (
+        'attendance', 'faculty_attendance', 'clinical_logbooks', 'postings',
+        'student_module_progress', 'student_profiles', 'faculty_profiles',
+        'certificates', 'events', 'fees', 'attendance_daily_rollup'
+    ) THEN
+        RAISE EXCEPTION 'Aggregation is not allowed on table %', p_table;
+    END IF;
+
+    FOR v_filter IN SELECT key, value FROM jsonb_each(COALESCE(p_filters, '{}'::JSONB)) LOOP
+        IF jsonb_typeof(v_filter.value) = 'object' THEN
+            FOR v_condition IN SELECT key, value FROM jsonb_each_text(v_filter.value) LOOP
+                v_operator := CASE v_condition.key
+                    WHEN 'eq' THEN '='
+                    WHEN 'neq' THEN '<>'
+                    WHEN 'gt' THEN '>'
+                    WHEN 'gte' THEN '>='
+                    WHEN 'lt' THEN '<'
+                    WHEN 'lte' THEN '<='
+                END;
+                IF v_operator IS NULL THEN
+                    RAISE EXCEPTION 'Unsupported filter operator: %', v_condition.key;
+                END IF;
+                v_where := v_where || format(' AND %I %s %L', v_filter.key, v_operator, v_condition.value);
+            END LOOP;
+        ELSIF jsonb_typeof(v_filter.value) = 'null' THEN
+            v_where := v_where || format(' AND %I IS NULL', v_filter.key);
+        ELSE
+            v_where := v_where || format(' AND %I = %L', v_filter.key, v_filter.value #>> '{}');
+        END IF;
+    END LOOP;
+
+    RETURN QUERY EXECUTE format(
+        'SELECT %s, COUNT(*)::BIGINT, %s, %s, %s, %s FROM %I WHERE %s GROUP BY 1',
+        CASE WHEN p_group_by IS NULL THEN 'NULL::TEXT' ELSE format('%I::TEXT', p_group_by) END,
+        CASE WHEN p_avg_column IS NULL THEN 'NULL::DOUBLE PRECISION' ELSE format('AVG(%I)::DOUBLE PRECISION', p_avg_column) END,
+        CASE WHEN p_distinct_column IS NULL THEN 'NULL::BIGINT' ELSE format('COUNT(DISTINCT %I)::BIGINT', p_distinct_column) END,
+        CASE WHEN p_sum_column IS NULL THEN 'NULL::DOUBLE PRECISION' ELSE format('SUM(%I)::DOUBLE PRECISION', p_sum_column) END,
+        CASE WHEN p_sum_column IS NULL THEN 'NULL::BIGINT' ELSE format('COUNT(%I)::BIGINT', p_sum_column) END,
+        p_table,
+        v_where
+    );
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION medconnect_aggregate(TEXT, TEXT, JSONB, TEXT, TEXT, TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION medconnect_aggregate(TEXT, TEXT, JSONB, TEXT, TEXT, TEXT) TO service_role;
+
+REVOKE EXECUTE ON FUNCTION medconnect_clinical_exposure_by_department(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION medconnect_clinical_exposure_by_department(UUID) TO service_role;
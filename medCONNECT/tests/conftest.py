@@ -0,0 +1,10 @@
+"""
+Shared test configuration: local database backend, no network
+"""
+import os
+
+# Settings are read when app modules are imported, so configure them first
+os.environ["DATABASE_BACKEND"] = "memory"
+os.environ["SUPABASE_URL"] = ""
+os.environ["SUPABASE_JWT_SECRET"] = "test-jwt-secret"
+os.environ["SUPABASE_TOKEN_REVOCATION_CHECK"] = "false"
@@ -0,0 +1,37 @@
+"""
+AI service (app.services.ai_service): OpenAI calls run off the event loop
+"""
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.ai_service import AIService
+
+
+@pytest.fixture
+def service():
+    """AIService with a fake OpenAI client recording the thread each call ran on"""
+    threads = []
+
+    def create(**kwargs):
+        threads.append(threading.current_thread())
+        message = SimpleNamespace(content="Similarities:\n- both\nDifferences:\n- one\nRecommendations:\n- act")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    service = AIService()
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    service.threads = threads
+    return service
+
+
+async def test_compare_concepts_runs_the_completion_in_a_worker_thread(service):
+    result = await service.compare_concepts("Asthma", "COPD")
+    assert result["similarities"] == ["- both"]
+    assert service.threads and threading.main_thread() not in service.threads
+
+
+async def test_governance_query_runs_the_completion_in_a_worker_thread(service):
+    result = await service.governance_query("How is attendance?", metrics_type="attendance")
+    assert result["recommendations"] == ["act"]
+    assert service.threads and threading.main_thread() not in service.threads
@@ -0,0 +1,52 @@
+"""
+Student attendance ranking (app.services.attendance_flags) and page ordering
+"""
+import random
+
+import pytest
+
+from app.models.governance import AttendanceAnalytics
+from app.services import attendance_flags
+from app.services.attendance_flags import rank_student_attendance
+from app.services.governance_service import GovernanceService
+
+TOTALS = {"s1": 10, "s2": 10, "s3": 8, "s4": 0, "s5": 20}
+PRESENTS = {"s1": 9, "s2": 5, "s3": 8, "s5": 14}
+
+
+@pytest.mark.parametrize("numpy_available", [True, False])
+def test_rank_orders_lowest_rate_first_and_flags_below_threshold(monkeypatch, numpy_available):
+    monkeypatch.setattr(attendance_flags, "NUMPY_AVAILABLE", numpy_available and attendance_flags.NUMPY_AVAILABLE)
+    ranked = rank_student_attendance(TOTALS, PRESENTS)
+
+    assert [row["student_id"] for row in ranked] == ["s2", "s5", "s1", "s3"]
+    assert [row["below_threshold"] for row in ranked] == [True, True, False, False]
+    # 5/10 needs 10 more sessions in a row to reach 75%; 14/20 needs 4
+    assert [row["sessions_needed"] for row in ranked] == [10, 4, 0, 0]
+
+
+def _analytics_in_storage_order(seed):
+    """Analytics whose per-student lists come back in arbitrary order, as from JSONB"""
+    ranked = rank_student_attendance(TOTALS, PRESENTS)
+    random.Random(seed).shuffle(ranked)
+    flags = [row for row in ranked if row["below_threshold"]]
+    return AttendanceAnalytics(
+        overall_attendance_rate=0.0,
+        student_wise_attendance={row["student_id"]: row["attendance_rate"] for row in ranked},
+        low_attendance_flags=flags
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("sort, expected", [("risk", ["s2", "s5", "s1"]), ("rate", ["s3", "s1", "s5"])])
+def test_page_sorts_regardless_of_stored_order(seed, sort, expected):
+    page = GovernanceService.page_student_attendance(_analytics_in_storage_order(seed), 0, 3, sort)
+    assert list(page.student_wise_attendance) == expected
+    flag_order = [flag["student_id"] for flag in page.low_attendance_flags]
+    assert flag_order == (["s2", "s5"] if sort == "risk" else ["s5", "s2"])
+
+
+def test_page_offset_and_limit():
+    page = GovernanceService.page_student_attendance(_analytics_in_storage_order(0), 1, 2, "risk")
+    assert list(page.student_wise_attendance) == ["s5", "s1"]
+    assert [flag["student_id"] for flag in page.low_attendance_flags] == ["s5"]
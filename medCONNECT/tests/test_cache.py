@@ -0,0 +1,113 @@
+"""
+Profile and response caches (app.db.cache)
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.db import cache as cache_module
+from app.db.cache import StaleWhileRevalidateCache, UserProfileCache, acquire_lock, release_lock
+
+
+async def test_profile_cache_drops_fields_outside_the_profile():
+    cache = UserProfileCache()
+    await cache.set("user-1", {"id": "user-1", "role": "student", "password_hash": "secret"})
+
+    profile = await cache.get("user-1")
+    assert profile == {"id": "user-1", "role": "student"}
+
+
+async def test_profile_cache_returns_copies_and_invalidates():
+    cache = UserProfileCache()
+    await cache.set("user-1", {"id": "user-1", "full_name": "A"})
+    (await cache.get("user-1"))["full_name"] = "B"
+    assert (await cache.get("user-1"))["full_name"] == "A"
+
+    await cache.invalidate("user-1")
+    assert await cache.get("user-1") is None
+
+
+class FakeAsyncRedis:
+    """Dict-backed stand-in for AsyncRedisClient (expiry is not modelled)"""
+    
+    def __init__(self):
+        self.client = object()
+        self.data = {}
+    
+    async def get(self, key):
+        return self.data.get(key)
+    
+    async def set(self, key, value, expire=None):
+        self.data[key] = value
+        return True
+    
+    async def set_nx(self, key, value, expire):
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+    
+    async def delete_if_equals(self, key, value):
+        if self.data.get(key) != value:
+            return False
+        del self.data[key]
+        return True
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeAsyncRedis()
+    monkeypatch.setattr(cache_module, "async_redis_client", fake)
+    return fake
+
+
+def _swr(**overrides):
+    options = {"ttl": 60, "stale_ttl": 600, "lock_timeout": 30, "wait": 1.0, **overrides}
+    return StaleWhileRevalidateCache("test", **options)
+
+
+async def test_concurrent_cold_misses_compute_once(fake_redis):
+    cache = _swr()
+    calls = 0
+    
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.2)
+        return {"value": calls}
+    
+    results = await asyncio.gather(*(cache.get_or_compute("test:key", compute) for _ in range(5)))
+    assert calls == 1
+    assert [value for value, _ in results] == [{"value": 1}] * 5
+    assert "test:key:lock" not in fake_redis.data
+
+
+async def test_stale_entry_is_served_while_one_refresh_runs(fake_redis):
+    cache = _swr()
+    fake_redis.data["test:key"] = {"value": "old", "stored_at": time.time() - 120}
+    calls = 0
+    
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return "new"
+    
+    for _ in range(3):
+        value, age = await cache.get_or_compute("test:key", compute)
+        assert value == "old" and age >= 120
+    await asyncio.sleep(0.05)
+    
+    assert calls == 1
+    assert fake_redis.data["test:key"]["value"] == "new"
+
+
+async def test_lock_is_released_only_by_its_holder(fake_redis):
+    token = await acquire_lock("job:lock", 30)
+    assert token is not None
+    assert await acquire_lock("job:lock", 30) is None
+    
+    await release_lock("job:lock", "someone-else")
+    assert "job:lock" in fake_redis.data
+    await release_lock("job:lock", token)
+    assert "job:lock" not in fake_redis.data
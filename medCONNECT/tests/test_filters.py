@@ -0,0 +1,158 @@
+"""
+Filter syntax and keyset pagination, checked against both local backends
+"""
+import pytest
+
+# app.db.supabase first: it constructs the configured backend on import
+from app.db.supabase import _build_filter_params
+from app.db.backends.base import decode_cursor, encode_cursor
+from app.db.backends.memory import MemoryBackend
+from app.db.backends.sqlite import SQLiteBackend
+
+COLUMNS = ("id", "name", "status", "score", "remarks", "active", "created_at")
+
+ROWS = [
+    {"id": "a", "name": "Alpha", "status": "open", "score": 10, "remarks": None, "active": True},
+    {"id": "b", "name": "beta", "status": "closed", "score": 20, "remarks": "late", "active": False},
+    {"id": "c", "name": "Gamma", "status": "open", "score": None, "remarks": "ok", "active": None},
+    {"id": "d", "name": "delta", "status": None, "score": 30, "remarks": None, "active": True},
+]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request):
+    if request.param == "memory":
+        backend = MemoryBackend(schema_files=[])
+    else:
+        backend = SQLiteBackend(":memory:", schema_files=[])
+    backend.create_table("items", COLUMNS)
+    return backend
+
+
+@pytest.fixture
+async def items(backend):
+    await backend.insert_many("items", ROWS)
+    return backend
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"or": [{"status": "late"}, {"status": "absent", "remarks": None}]},
+     [("or", "(status.eq.late,and(status.eq.absent,remarks.is.null))")]),
+    ({"and": [{"or": [{"a": 1}, {"b": 2}]}, {"c": 3}]}, [("and", "(or(a.eq.1,b.eq.2),c.eq.3)")]),
+    ({"or": [{"name": "a,b"}, {"name": {"ilike": "x(y)%"}}]}, [("or", '(name.eq."a,b",name.ilike."x(y)%")')]),
+    ({"or": [{"remarks": {"not": {"is": None}}}, {"active": True}]},
+     [("or", "(remarks.not.is.null,active.eq.true)")]),
+])
+def test_logical_groups_render_as_postgrest_logic_trees(filters, expected):
+    assert _build_filter_params(filters) == expected
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"status": "open"}, [("status", "eq.open")]),
+    ({"status": ["open", "closed"]}, [("status", "in.(open,closed)")]),
+    ({"remarks": None}, [("remarks", "is.null")]),
+    ({"active": False}, [("active", "eq.false")]),
+    ({"score": {"gte": 10, "lt": 20}}, [("score", "gte.10"), ("score", "lt.20")]),
+    ({"status": {"not": {"in": ["a", "b"]}}}, [("status", "not.in.(a,b)")]),
+    ({"remarks": {"not": {"is": None}}}, [("remarks", "not.is.null")]),
+    ({"name": {"ilike": "%ta"}}, [("name", "ilike.%ta")]),
+    (None, []),
+])
+def test_column_filters_render_as_query_params(filters, expected):
+    assert _build_filter_params(filters) == expected
+
+
+def test_unsupported_operator_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported filter operator"):
+        _build_filter_params({"score": {"between": [1, 2]}})
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"status": "open"}, ["a", "c"]),
+    ({"status": ["open", "closed"]}, ["a", "b", "c"]),
+    ({"status": None}, ["d"]),
+    ({"status": {"not": {"is": None}}}, ["a", "b", "c"]),
+    ({"score": {"gte": 20}}, ["b", "d"]),
+    ({"score": {"gt": 5, "lt": 25}}, ["a", "b"]),
+    ({"active": True}, ["a", "d"]),
+    ({"active": {"is": False}}, ["b"]),
+    ({"name": {"like": "%lta"}}, ["d"]),
+    ({"name": {"like": "a%"}}, []),
+    ({"name": {"ilike": "a%"}}, ["a"]),
+    ({"or": [{"status": "closed"}, {"score": {"gt": 25}}]}, ["b", "d"]),
+    ({"or": [{"status": "open", "remarks": None}, {"remarks": "late"}]}, ["a", "b"]),
+    ({"and": [{"or": [{"status": "open"}, {"status": "closed"}]}, {"score": {"lt": 15}}]}, ["a"]),
+])
+async def test_filters_select_the_same_rows_on_both_backends(items, filters, expected):
+    rows = await items.select("items", columns="id", filters=filters, order_by="id")
+    assert [row["id"] for row in rows] == expected
+
+
+@pytest.mark.parametrize("filters, expected", [
+    # NULL compared to anything is unknown, and unknown rows never match, even negated
+    ({"status": {"neq": "open"}}, ["b"]),
+    ({"status": {"not": {"in": ["closed"]}}}, ["a", "c"]),
+    ({"score": {"not": {"gt": 15}}}, ["a"]),
+    ({"remarks": {"not": {"eq": "late"}}}, ["c"]),
+    # OR is true if any branch is true; unknown or false is unknown
+    ({"or": [{"score": {"gt": 100}}, {"remarks": {"neq": "late"}}]}, ["c"]),
+    ({"or": [{"score": {"gt": 15}}, {"score": None}]}, ["b", "c", "d"]),
+])
+async def test_null_comparisons_follow_three_valued_logic(items, filters, expected):
+    rows = await items.select("items", columns="id", filters=filters, order_by="id")
+    assert [row["id"] for row in rows] == expected
+
+
+async def test_count_and_delete_use_the_same_filters(items):
+    assert await items.count("items", filters={"or": [{"status": None}, {"score": {"lt": 15}}]}) == 2
+    assert await items.delete("items", filters={"status": {"not": {"is": None}}, "score": {"gte": 20}})
+    assert [row["id"] for row in await items.select("items", columns="id", order_by="id")] == ["a", "c", "d"]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor({"created_at": "2026-01-01T00:00:00+00:00", "id": "row-1", "other": 1})
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("2026-01-01T00:00:00+00:00", "row-1")
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "e30", "WyJhIl0", "WzEsMl0"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid pagination cursor"):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+async def timeline(backend):
+    # Ties on created_at are broken by id, so the order is total
+    await backend.insert_many("items", [
+        {"id": f"r{n}", "status": "open" if n % 3 else "closed", "created_at": f"2026-01-0{1 + n // 2}T00:00:00+00:00"}
+        for n in range(9)
+    ])
+    return backend
+
+
+async def _all_pages(backend, limit, filters=None):
+    pages, cursor = [], None
+    while True:
+        rows, cursor = await backend.select_page("items", columns="id", filters=filters, cursor=cursor, limit=limit)
+        pages.append([row["id"] for row in rows])
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4, 9, 20])
+async def test_pages_cover_every_row_once_newest_first(timeline, limit):
+    pages = await _all_pages(timeline, limit)
+    assert [row_id for page in pages for row_id in page] == ["r8", "r7", "r6", "r5", "r4", "r3", "r2", "r1", "r0"]
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+async def test_pages_keep_caller_filters(timeline):
+    pages = await _all_pages(timeline, 2, filters={"status": "open", "and": [{"id": {"neq": "r7"}}]})
+    assert pages == [["r8", "r5"], ["r4", "r2"], ["r1"]]
+
+
+async def test_page_adds_the_cursor_columns(timeline):
+    rows, cursor = await timeline.select_page("items", columns="status", limit=2)
+    assert set(rows[0]) == {"status", "created_at", "id"}
+    assert decode_cursor(cursor) == (rows[-1]["created_at"], rows[-1]["id"])
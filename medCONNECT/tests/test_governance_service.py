@@ -0,0 +1,81 @@
+"""
+Governance analytics (app.services.governance_service) on the memory backend
+"""
+import uuid
+
+import pytest
+
+from app.db.backends.base import AGGREGATE_FUNCTION, _aggregate_rows
+from app.db.backends.local import api_error
+from app.db.supabase import async_supabase_client as db
+from app.services.governance_service import GovernanceService
+
+# Tables medconnect_aggregate accepts once migration_update_governance_aggregates.sql is applied
+AGGREGATE_TABLES = (
+    "attendance", "faculty_attendance", "clinical_logbooks", "postings",
+    "student_module_progress", "student_profiles", "faculty_profiles",
+    "certificates", "events", "fees", "attendance_daily_rollup"
+)
+
+
+async def _migrated_aggregate(backend, p_table, p_group_by, p_filters, p_avg_column, p_distinct_column, p_sum_column):
+    """medconnect_aggregate as installed by the migration, allow-list included"""
+    if p_table not in AGGREGATE_TABLES:
+        raise api_error("P0001", f"Aggregation is not allowed on table {p_table}")
+    columns = ",".join(dict.fromkeys(
+        c for c in (p_group_by, p_avg_column, p_distinct_column, p_sum_column) if c
+    )) or "id"
+    rows = await backend.select(p_table, columns=columns, filters=p_filters)
+    return _aggregate_rows(rows, p_group_by, p_avg_column, p_distinct_column, p_sum_column)
+
+
+@pytest.fixture
+def migrated_aggregate(monkeypatch):
+    monkeypatch.setitem(db.functions, AGGREGATE_FUNCTION, _migrated_aggregate)
+    monkeypatch.setattr(db, "missing_functions", {})
+
+
+@pytest.fixture
+async def college():
+    college_id = str(uuid.uuid4())
+    await db.insert_many("users", [
+        {"id": str(uuid.uuid4()), "email": f"{role}{n}-{college_id}@example.com", "full_name": "User",
+         "role": role, "college_id": college_id, "is_active": active}
+        for n, (role, active) in enumerate([
+            ("student", True), ("student", True), ("student", False), ("faculty", True), ("principal", True)
+        ])
+    ])
+    return college_id
+
+
+async def test_dashboard_does_not_aggregate_over_users(migrated_aggregate, college):
+    metrics = await GovernanceService.get_dashboard_metrics(college)
+    assert metrics.total_students == 2
+    assert metrics.total_faculty == 1
+    assert metrics.college_totals["total_students"] == 2
+
+
+async def test_academic_average_skips_null_completions_like_the_dashboard(college):
+    student_ids = [str(uuid.uuid4()) for _ in range(3)]
+    modules = [{"id": str(uuid.uuid4()), "title": title, "college_id": college} for title in ("Anatomy 1", "Anatomy 2")]
+    await db.insert_many("curriculum_modules", modules)
+    await db.insert_many("student_module_progress", [
+        {"student_id": student_ids[0], "module_id": modules[0]["id"], "college_id": college, "completion_percentage": 80},
+        {"student_id": student_ids[0], "module_id": modules[1]["id"], "college_id": college, "completion_percentage": None},
+        {"student_id": student_ids[1], "module_id": modules[0]["id"], "college_id": college, "completion_percentage": 40},
+        {"student_id": student_ids[2], "module_id": modules[1]["id"], "college_id": college, "completion_percentage": None},
+    ])
+
+    academic = await GovernanceService.get_academic_analytics(college)
+    dashboard = await GovernanceService.get_dashboard_metrics(college)
+    totals = dashboard.college_totals
+
+    summary = academic.student_progress_summary
+    assert summary["average_completion"] == pytest.approx(60.0)
+    assert summary["average_completion"] == pytest.approx(totals["completion_sum"] / totals["completion_count"])
+    assert summary["total_students_with_progress"] == totals["students_with_progress"] == 3
+    assert summary["students_below_threshold"] == 1
+    assert academic.module_completion_rates == {
+        modules[0]["id"]: {"module": "Anatomy 1", "average_completion": 60.0}
+    }
+    assert academic.weak_areas_identified == []
@@ -0,0 +1,98 @@
+"""
+Query budgets (app.core.query_recorder) on the memory backend
+"""
+import uuid
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.middleware import QueryBudgetMiddleware
+from app.core.query_recorder import QueryBudgetExceeded, record_queries
+from app.db.supabase import async_supabase_client as db
+from app.repositories.academic_repo import AcademicRepository
+from app.services.ai_service import ai_service
+
+
+def _id():
+    return str(uuid.uuid4())
+
+
+async def test_attendance_by_department_is_two_queries_for_any_faculty_size():
+    department_id = _id()
+    faculty_ids = [_id() for _ in range(6)]
+    await db.insert_many("faculty_profiles", [{"user_id": f, "department_id": department_id} for f in faculty_ids])
+    await db.insert_many("faculty_attendance", [
+        {"faculty_id": f, "attendance_date": f"2026-01-0{day}", "status": "present"}
+        for f in faculty_ids for day in (1, 2)
+    ])
+
+    with record_queries() as recorder:
+        rows = await AcademicRepository.get_attendance_by_department(department_id, start_date="2026-01-02")
+
+    assert len(rows) == 6
+    assert recorder.total == 2
+    assert recorder.problems(budget=2, repeat_threshold=2) == []
+
+
+async def test_detect_weak_areas_is_two_queries_for_any_module_count():
+    student_id = _id()
+    modules = [{"id": _id(), "title": f"Module {n}"} for n in range(5)]
+    await db.insert_many("curriculum_modules", modules)
+    await db.insert_many("student_module_progress", [
+        {"student_id": student_id, "module_id": m["id"], "completion_percentage": 10 * n + (0 if n < 4 else 60)}
+        for n, m in enumerate(modules)
+    ])
+
+    with record_queries() as recorder:
+        weak = await ai_service.detect_weak_areas(student_id)
+
+    assert weak == ["Module 0", "Module 1", "Module 2", "Module 3"]
+    assert recorder.total == 2
+    assert recorder.problems(budget=2, repeat_threshold=2) == []
+
+
+def _budget_app():
+    app = FastAPI()
+
+    @app.get("/items/{count}")
+    async def items(count: int):
+        for _ in range(count):
+            await db.select("faculty_profiles", filters={"user_id": _id()})
+        return {"ok": True}
+
+    app.add_middleware(QueryBudgetMiddleware)
+    return app
+
+
+async def _get(path):
+    transport = httpx.ASGITransport(app=_budget_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path)
+
+
+@pytest.fixture
+def budgets(monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGETS", {"/items/{count}": 2})
+    monkeypatch.setattr(settings, "QUERY_BUDGET_DEFAULT", 0)
+    monkeypatch.setattr(settings, "QUERY_REPEAT_THRESHOLD", 5)
+
+
+async def test_strict_mode_raises_when_the_budget_is_exceeded(budgets, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", True)
+    assert (await _get("/items/2")).status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match="3 queries exceeds the budget of 2"):
+        await _get("/items/3")
+
+
+async def test_strict_mode_raises_on_repeated_query_shapes(budgets, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", True)
+    monkeypatch.setattr(settings, "QUERY_BUDGETS", {})
+    with pytest.raises(QueryBudgetExceeded, match="possible N\\+1: select faculty_profiles"):
+        await _get("/items/5")
+
+
+async def test_budget_overrun_only_logs_outside_strict_mode(budgets, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", False)
+    assert (await _get("/items/3")).status_code == 200
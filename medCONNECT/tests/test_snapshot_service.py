@@ -0,0 +1,53 @@
+"""
+Governance snapshot freshness (app.services.snapshot_service)
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.repositories.governance_repo import GovernanceRepository
+from app.services.snapshot_service import SnapshotService
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    """Set ``stored.snapshot_date`` to control the latest snapshot's timestamp"""
+    class Stored:
+        snapshot_date = None
+
+    async def get_latest_snapshot(college_id):
+        return {"college_id": str(college_id), "snapshot_date": Stored.snapshot_date, "metrics": {}}
+
+    monkeypatch.setattr(GovernanceRepository, "get_latest_snapshot", staticmethod(get_latest_snapshot))
+    monkeypatch.setattr(settings, "GOVERNANCE_SNAPSHOT_MAX_AGE", 7200)
+    return Stored
+
+
+def _postgrest_timestamp(moment, digits):
+    """timestamptz as PostgREST returns it, with ``digits`` fractional-second digits"""
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%f")[:20 + digits] + "+00:00"
+
+
+@pytest.mark.parametrize("digits", [1, 2, 3, 4, 5, 6])
+async def test_fractional_seconds_of_any_precision_are_parsed(stored, digits):
+    stored.snapshot_date = _postgrest_timestamp(datetime.now(timezone.utc) - timedelta(minutes=5), digits)
+    snapshot, age = await SnapshotService.get_fresh_snapshot("college-1")
+    assert snapshot["snapshot_date"] == stored.snapshot_date
+    assert 295 <= age <= 305
+
+
+async def test_five_digit_fraction_from_postgres(stored):
+    stored.snapshot_date = (datetime.now(timezone.utc) - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S") + ".12345+00:00"
+    _, age = await SnapshotService.get_fresh_snapshot("college-1")
+    assert 3595 <= age <= 3605
+
+
+async def test_stale_snapshot_is_ignored(stored):
+    stored.snapshot_date = _postgrest_timestamp(datetime.now(timezone.utc) - timedelta(hours=3), 5)
+    assert await SnapshotService.get_fresh_snapshot("college-1") is None
+
+
+async def test_unreadable_snapshot_date_is_a_miss(stored):
+    stored.snapshot_date = "yesterday-ish"
+    assert await SnapshotService.get_fresh_snapshot("college-1") is None
@@ -0,0 +1,197 @@
+"""
+Local verification of Supabase access tokens (app.core.token_verifier)
+"""
+import base64
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwk, jwt
+
+from app.core import token_verifier as token_verifier_module
+from app.core.config import settings
+from app.core.exceptions import UnauthorizedError
+from app.core.token_verifier import SupabaseTokenVerifier
+
+SECRET = "test-jwt-secret"
+
+
+def _claims(**overrides):
+    now = int(time.time())
+    claims = {"sub": "user-1", "aud": "authenticated", "role": "authenticated", "iat": now, "exp": now + 3600}
+    claims.update(overrides)
+    return {key: value for key, value in claims.items() if value is not None}
+
+
+def _ec_key(kid):
+    """(private PEM, public JWK) for a fresh P-256 key"""
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private_pem, {**jwk.construct(public_pem, "ES256").to_dict(), "kid": kid}
+
+
+@pytest.fixture(autouse=True)
+def token_settings(monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_URL", "https://project.supabase.co")
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", SECRET)
+    monkeypatch.setattr(settings, "SUPABASE_JWT_AUDIENCE", "authenticated")
+    monkeypatch.setattr(settings, "SUPABASE_JWT_LEEWAY", 10)
+    monkeypatch.setattr(settings, "SUPABASE_JWKS_MIN_REFRESH_INTERVAL", 30)
+    monkeypatch.setattr(settings, "SUPABASE_TOKEN_REVOCATION_CHECK", False)
+
+
+@pytest.fixture
+def verifier():
+    return SupabaseTokenVerifier()
+
+
+@pytest.fixture
+def jwks(monkeypatch):
+    """Served JWKS (mutable ``keys`` list) and the number of fetches"""
+    served = SimpleNamespace(keys=[], fetches=0)
+
+    def handler(request):
+        assert request.url.path == "/auth/v1/.well-known/jwks.json"
+        served.fetches += 1
+        return httpx.Response(200, json={"keys": served.keys})
+
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        token_verifier_module.httpx, "AsyncClient",
+        lambda **kwargs: async_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    return served
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    """Fake Supabase Auth; set ``user`` to None to reject tokens"""
+    auth = SimpleNamespace(user=SimpleNamespace(id="remote-user"), calls=0)
+
+    def get_user(token):
+        auth.calls += 1
+        return SimpleNamespace(user=auth.user)
+
+    client = SimpleNamespace(auth=SimpleNamespace(get_user=get_user))
+    monkeypatch.setattr(token_verifier_module, "supabase_client", SimpleNamespace(get_client=lambda: client))
+    return auth
+
+
+async def test_hs256_token_is_verified_with_the_jwt_secret(verifier, jwks):
+    token = jwt.encode(_claims(), SECRET, algorithm="HS256")
+    claims = await verifier.verify(token)
+    assert claims["sub"] == "user-1"
+    assert jwks.fetches == 0
+
+
+async def test_hs256_token_signed_with_another_secret_is_rejected(verifier, jwks):
+    token = jwt.encode(_claims(), "some-other-secret", algorithm="HS256")
+    with pytest.raises(UnauthorizedError):
+        await verifier.verify(token)
+
+
+async def test_wrong_audience_is_rejected(verifier):
+    token = jwt.encode(_claims(aud="anon"), SECRET, algorithm="HS256")
+    with pytest.raises(UnauthorizedError):
+        await verifier.verify(token)
+
+
+async def test_expiry_honours_leeway(verifier):
+    now = int(time.time())
+    within_leeway = jwt.encode(_claims(exp=now - 5), SECRET, algorithm="HS256")
+    assert (await verifier.verify(within_leeway))["sub"] == "user-1"
+
+    expired = jwt.encode(_claims(exp=now - 60), SECRET, algorithm="HS256")
+    with pytest.raises(UnauthorizedError):
+        await verifier.verify(expired)
+
+
+@pytest.mark.parametrize("missing", ["exp", "sub"])
+async def test_required_claims(verifier, missing):
+    token = jwt.encode(_claims(**{missing: None}), SECRET, algorithm="HS256")
+    with pytest.raises(UnauthorizedError):
+        await verifier.verify(token)
+
+
+async def test_malformed_token_is_rejected(verifier):
+    with pytest.raises(UnauthorizedError):
+        await verifier.verify("not-a-jwt")
+
+
+async def test_unsupported_algorithm_is_rejected(verifier):
+    segment = lambda data: base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+    token = f"{segment({'alg': 'none', 'typ': 'JWT'})}.{segment(_claims())}."
+    with pytest.raises(UnauthorizedError, match="Unsupported token algorithm"):
+        await verifier.verify(token)
+
+
+async def test_es256_token_is_verified_against_cached_jwks(verifier, jwks):
+    private_pem, public_jwk = _ec_key("key-1")
+    jwks.keys = [public_jwk]
+    token = jwt.encode(_claims(), private_pem, algorithm="ES256", headers={"kid": "key-1"})
+
+    assert (await verifier.verify(token))["sub"] == "user-1"
+    assert (await verifier.verify(token))["sub"] == "user-1"
+    assert jwks.fetches == 1
+
+
+async def test_es256_token_signed_by_another_key_is_rejected(verifier, jwks):
+    _, public_jwk = _ec_key("key-1")
+    other_pem, _ = _ec_key("key-1")
+    jwks.keys = [public_jwk]
+    token = jwt.encode(_claims(), other_pem, algorithm="ES256", headers={"kid": "key-1"})
+    with pytest.raises(UnauthorizedError):
+        await verifier.verify(token)
+
+
+async def test_unknown_kid_refetches_jwks_at_most_once_per_interval(verifier, jwks, remote):
+    old_pem, old_jwk = _ec_key("key-1")
+    new_pem, new_jwk = _ec_key("key-2")
+    jwks.keys = [old_jwk]
+    await verifier.verify(jwt.encode(_claims(), old_pem, algorithm="ES256", headers={"kid": "key-1"}))
+    assert jwks.fetches == 1
+
+    # Key rotated, but the JWKS was fetched moments ago: no refetch, ask Supabase Auth instead
+    jwks.keys = [old_jwk, new_jwk]
+    rotated = jwt.encode(_claims(), new_pem, algorithm="ES256", headers={"kid": "key-2"})
+    assert await verifier.verify(rotated) == {"sub": "remote-user"}
+    assert jwks.fetches == 1
+    assert remote.calls == 1
+
+    # Once the interval has passed, the unknown kid triggers a refetch
+    verifier._jwks_fetched_at -= settings.SUPABASE_JWKS_MIN_REFRESH_INTERVAL + 1
+    assert (await verifier.verify(rotated))["sub"] == "user-1"
+    assert jwks.fetches == 2
+    assert remote.calls == 1
+
+
+async def test_missing_secret_falls_back_to_supabase_auth(verifier, remote, monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", "")
+    token = jwt.encode(_claims(), "whatever", algorithm="HS256")
+    assert await verifier.verify(token) == {"sub": "remote-user"}
+
+    remote.user = None
+    with pytest.raises(UnauthorizedError):
+        await verifier.verify(token)
+
+
+async def test_revocation_check_is_rate_limited(verifier, remote, monkeypatch):
+    monkeypatch.setattr(settings, "SUPABASE_TOKEN_REVOCATION_CHECK", True)
+    token = jwt.encode(_claims(), SECRET, algorithm="HS256")
+    await verifier.verify(token)
+    await verifier.verify(token)
+    assert remote.calls == 1
+
+    remote.user = None
+    other = jwt.encode(_claims(sub="user-2"), SECRET, algorithm="HS256")
+    with pytest.raises(UnauthorizedError):
+        await verifier.verify(other)